@@ -0,0 +1,53 @@
+"""add task rank
+
+Revision ID: 2ea3a3733ddd
+Revises: 2ff9b6bc40ff
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from core.ranking import keys_between
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2ea3a3733ddd'
+down_revision: Union[str, Sequence[str], None] = '2ff9b6bc40ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('rank', sa.String(collation='C'), nullable=True))
+
+    # Проставляем ключи существующим задачам в порядке создания
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, column_id FROM tasks ORDER BY column_id, created_at, id"
+    )).all()
+    updates = []
+    for _, column_rows in groupby(rows, key=lambda row: row.column_id):
+        task_ids = [row.id for row in column_rows]
+        updates.extend(
+            {"task_id": task_id, "rank": rank}
+            for task_id, rank in zip(task_ids, keys_between(None, None, len(task_ids)))
+        )
+    if updates:
+        bind.execute(sa.text("UPDATE tasks SET rank = :rank WHERE id = :task_id"), updates)
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_column_id_rank', 'tasks', ['column_id', 'rank'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_column_id_rank', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_column('tasks', 'rank')
@@ -0,0 +1,108 @@
+"""add fk and lookup indexes
+
+Revision ID: 2ff9b6bc40ff
+Revises: 488f63808762
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2ff9b6bc40ff'
+down_revision: Union[str, Sequence[str], None] = '488f63808762'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (имя индекса, таблица, колонки)
+INDEXES = [
+    ('ix_tasks_column_id', 'tasks', ['column_id']),
+    ('ix_tasks_due_date', 'tasks', ['due_date']),
+    ('ix_tasks_assigned_to', 'tasks', ['assigned_to']),
+    ('ix_columns_board_id', 'columns', ['board_id']),
+    ('ix_boards_projects_id', 'boards', ['projects_id']),
+    ('ix_projects_workspaces_id', 'projects', ['workspaces_id']),
+    ('ix_comments_task_id', 'comments', ['task_id']),
+    ('ix_labels_workspace_id', 'labels', ['workspace_id']),
+    ('ix_user_workspaces_workspace_id', 'user_workspaces', ['workspace_id']),
+    ('ix_user_project_accesses_project_id', 'user_project_accesses', ['project_id']),
+    ('ix_task_assignees_user_id', 'task_assignees', ['user_id']),
+    ('ix_task_labels_label_id', 'task_labels', ['label_id']),
+]
+
+# Уникальность, которой требует предметная область: одна связь на пару
+UNIQUE_INDEXES = [
+    ('ix_users_email', 'users', ['email']),
+    ('uq_user_workspaces_user_id_workspace_id', 'user_workspaces', ['user_id', 'workspace_id']),
+    ('uq_user_project_accesses_user_id_project_id', 'user_project_accesses', ['user_id', 'project_id']),
+    ('uq_task_assignees_task_id_user_id', 'task_assignees', ['task_id', 'user_id']),
+    ('uq_task_labels_task_id_label_id', 'task_labels', ['task_id', 'label_id']),
+]
+
+# Таблицы связей, в которых перед созданием уникального индекса удаляются дубликаты
+DEDUPLICATE = [
+    ('user_workspaces', ['user_id', 'workspace_id']),
+    ('user_project_accesses', ['user_id', 'project_id']),
+    ('task_assignees', ['task_id', 'user_id']),
+    ('task_labels', ['task_id', 'label_id']),
+]
+
+
+def drop_invalid_indexes(names: list[str]) -> None:
+    """
+    Удаляет индексы, оставшиеся INVALID после прерванного CREATE INDEX CONCURRENTLY:
+    с if_not_exists повторный запуск миграции иначе пропустил бы их и не перестроил.
+    """
+    bind = op.get_bind()
+    invalid = bind.execute(sa.text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+    ), {"names": names}).scalars().all()
+    for name in invalid:
+        op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дубликаты email — разные пользователи, удалять их автоматически нельзя.
+    # Без этой проверки уникальный индекс упал бы посреди сборки и остался INVALID
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT email, count(*) FROM users WHERE email IS NOT NULL "
+        "GROUP BY email HAVING count(*) > 1 ORDER BY email LIMIT 20"
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"{email} ({count})" for email, count in duplicates)
+        raise RuntimeError(
+            "В users есть повторяющиеся email, уникальный индекс ix_users_email не создать. "
+            f"Объедините или переименуйте учётные записи и запустите миграцию снова: {listed}"
+        )
+
+    # Оставляем самую раннюю запись для каждой пары, остальные удаляем
+    for table, columns in DEDUPLICATE:
+        same_pair = " AND ".join(f"a.{c} = b.{c}" for c in columns)
+        op.execute(sa.text(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE {same_pair} AND a.id > b.id"
+        ))
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes([name for name, _, _ in INDEXES + UNIQUE_INDEXES])
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+        for name, table, columns in UNIQUE_INDEXES:
+            op.create_index(name, table, columns, unique=True,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(UNIQUE_INDEXES + INDEXES):
+            op.drop_index(name, table_name=table,
+                          postgresql_concurrently=True, if_exists=True)
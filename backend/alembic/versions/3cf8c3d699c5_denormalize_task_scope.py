@@ -0,0 +1,81 @@
+"""denormalize task board, project and workspace
+
+Revision ID: 3cf8c3d699c5
+Revises: b034fe323dd0
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3cf8c3d699c5'
+down_revision: Union[str, Sequence[str], None] = 'b034fe323dd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Индексы по денормализованным колонкам: выборки календаря и задач пользователя
+INDEXES = [
+    ('ix_tasks_board_id_due_date_id', 'tasks', ['board_id', 'due_date', 'id']),
+    ('ix_tasks_project_id', 'tasks', ['project_id']),
+    ('ix_tasks_workspace_id', 'tasks', ['workspace_id']),
+]
+
+
+def drop_invalid_indexes(names: list[str]) -> None:
+    """
+    Удаляет индексы, оставшиеся INVALID после прерванного CREATE INDEX CONCURRENTLY,
+    чтобы повторный запуск миграции их перестроил.
+    """
+    bind = op.get_bind()
+    invalid = bind.execute(sa.text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+    ), {"names": names}).scalars().all()
+    for name in invalid:
+        op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('board_id', sa.Integer(), nullable=True))
+    op.add_column('tasks', sa.Column('project_id', sa.Integer(), nullable=True))
+    op.add_column('tasks', sa.Column('workspace_id', sa.Integer(), nullable=True))
+
+    # Заполняем путь column -> board -> project -> workspace одним UPDATE
+    op.execute("""
+        UPDATE tasks AS t
+        SET board_id = c.board_id, project_id = b.projects_id, workspace_id = p.workspaces_id
+        FROM columns AS c
+        JOIN boards AS b ON b.id = c.board_id
+        JOIN projects AS p ON p.id = b.projects_id
+        WHERE c.id = t.column_id
+    """)
+
+    op.alter_column('tasks', 'board_id', nullable=False)
+    op.alter_column('tasks', 'project_id', nullable=False)
+    op.alter_column('tasks', 'workspace_id', nullable=False)
+
+    op.create_foreign_key('tasks_board_id_fkey', 'tasks', 'boards', ['board_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('tasks_project_id_fkey', 'tasks', 'projects', ['project_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('tasks_workspace_id_fkey', 'tasks', 'workspaces', ['workspace_id'], ['id'])
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции: блок фиксирует
+    # изменения выше и строит индексы без блокировки записи в tasks
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes([name for name, _, _ in INDEXES])
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    op.drop_column('tasks', 'workspace_id')
+    op.drop_column('tasks', 'project_id')
+    op.drop_column('tasks', 'board_id')
@@ -0,0 +1,44 @@
+"""add trigram index for user autocomplete and username index
+
+Revision ID: 5b1c7e2f9a40
+Revises: 97efdb97bd9f
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1c7e2f9a40'
+down_revision: Union[str, Sequence[str], None] = '97efdb97bd9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Должно совпадать с db.dbstruct.USER_SEARCH_TEXT, иначе запросы не используют индекс
+USER_SEARCH_TEXT = (
+    "lower(coalesce(username, '') || ' ' || coalesce(first_name, '') || ' ' "
+    "|| coalesce(last_name, '') || ' ' || coalesce(email, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_search_trgm', 'users', [sa.text(f"{USER_SEARCH_TEXT} gin_trgm_ops")],
+                        postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_users_username', 'users', ['username'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_username', table_name='users',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_search_trgm', table_name='users',
+                      postgresql_concurrently=True, if_exists=True)
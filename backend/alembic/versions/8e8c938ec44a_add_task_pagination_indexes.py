@@ -0,0 +1,41 @@
+"""add task pagination indexes
+
+Revision ID: 8e8c938ec44a
+Revises: d0d1115ef4d6
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e8c938ec44a'
+down_revision: Union[str, Sequence[str], None] = 'd0d1115ef4d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_due_date_id', 'tasks', ['due_date', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        # (due_date, id) покрывает все запросы одиночного индекса по due_date
+        op.drop_index('ix_tasks_due_date', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_due_date', 'tasks', ['due_date'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_tasks_due_date_id', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tasks_created_at_id', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,52 @@
+"""add full-text search vectors for tasks and comments
+
+Revision ID: 97efdb97bd9f
+Revises: 9e5847a78dbf
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '97efdb97bd9f'
+down_revision: Union[str, Sequence[str], None] = '9e5847a78dbf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TASK_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', left(coalesce(description, ''), 100000)), 'B')"
+)
+COMMENT_VECTOR = "to_tsvector('russian', left(coalesce(content, ''), 100000))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Добавление STORED-колонки переписывает таблицу: вектор считается для всех строк
+    op.add_column('tasks', sa.Column('search_vector', postgresql.TSVECTOR(),
+                                     sa.Computed(TASK_VECTOR, persisted=True), nullable=True))
+    op.add_column('comments', sa.Column('search_vector', postgresql.TSVECTOR(),
+                                        sa.Computed(COMMENT_VECTOR, persisted=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], postgresql_using='gin',
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_comments_search_vector', 'comments', ['search_vector'], postgresql_using='gin',
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_comments_search_vector', table_name='comments',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tasks_search_vector', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_column('comments', 'search_vector')
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,48 @@
+"""add task counters
+
+Revision ID: 9e5847a78dbf
+Revises: 3cf8c3d699c5
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e5847a78dbf'
+down_revision: Union[str, Sequence[str], None] = '3cf8c3d699c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_counters',
+        sa.Column('board_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('key_id', sa.Integer(), nullable=False),
+        sa.Column('value', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['board_id'], ['boards.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('board_id', 'kind', 'key_id'),
+    )
+
+    # Начальные значения — то же, что OrmQuery.repair_task_counters
+    op.execute("""
+        INSERT INTO task_counters (board_id, kind, key_id, value)
+        SELECT board_id, 'board', board_id, count(*) FROM tasks GROUP BY board_id
+        UNION ALL
+        SELECT board_id, 'column', column_id, count(*) FROM tasks GROUP BY board_id, column_id
+        UNION ALL
+        SELECT t.board_id, 'assignee', a.user_id, count(*)
+        FROM tasks AS t JOIN task_assignees AS a ON a.task_id = t.id
+        GROUP BY t.board_id, a.user_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_counters')
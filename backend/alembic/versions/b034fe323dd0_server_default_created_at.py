@@ -0,0 +1,36 @@
+"""server default for created_at
+
+Revision ID: b034fe323dd0
+Revises: 8e8c938ec44a
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b034fe323dd0'
+down_revision: Union[str, Sequence[str], None] = '8e8c938ec44a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = [
+    'users', 'workspaces', 'projects', 'boards', 'tasks',
+    'user_workspaces', 'user_project_accesses', 'comments', 'workspace_invites',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, 'created_at', server_default=sa.text("timezone('utc', now())"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, 'created_at', server_default=None)
@@ -0,0 +1,68 @@
+"""add task archival and board archive policy
+
+Revision ID: c7d2a91e4b36
+Revises: 5b1c7e2f9a40
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2a91e4b36'
+down_revision: Union[str, Sequence[str], None] = '5b1c7e2f9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Значение по умолчанию вычисляется один раз и не переписывает таблицу:
+    # у существующих задач срок в колонке отсчитывается от миграции
+    op.add_column('tasks', sa.Column('column_entered_at', sa.DateTime(), nullable=False,
+                                     server_default=sa.text("timezone('utc', now())")))
+    op.add_column('tasks', sa.Column('archived_at', sa.DateTime(), nullable=True))
+    op.add_column('boards', sa.Column('archive_column_id', sa.Integer(), nullable=True))
+    op.add_column('boards', sa.Column('archive_after_days', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_boards_archive_column_id', 'boards', 'columns',
+                          ['archive_column_id'], ['id'], ondelete='SET NULL')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_column_id_rank_active', 'tasks', ['column_id', 'rank'],
+                        postgresql_where=sa.text('archived_at IS NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_tasks_column_id_rank', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+    # Переименование мгновенное; имя индекса остаётся прежним, как в dbstruct
+    op.execute('ALTER INDEX ix_tasks_column_id_rank_active RENAME TO ix_tasks_column_id_rank')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_archive_candidates', 'tasks', ['column_id', 'column_entered_at'],
+                        postgresql_where=sa.text('archived_at IS NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_board_id_archived_at_id', 'tasks', ['board_id', 'archived_at', 'id'],
+                        postgresql_where=sa.text('archived_at IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_board_id_archived_at_id', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tasks_archive_candidates', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+        op.create_index('ix_tasks_column_id_rank_all', 'tasks', ['column_id', 'rank'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_tasks_column_id_rank', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+    op.execute('ALTER INDEX ix_tasks_column_id_rank_all RENAME TO ix_tasks_column_id_rank')
+
+    op.drop_constraint('fk_boards_archive_column_id', 'boards', type_='foreignkey')
+    op.drop_column('boards', 'archive_after_days')
+    op.drop_column('boards', 'archive_column_id')
+    op.drop_column('tasks', 'archived_at')
+    op.drop_column('tasks', 'column_entered_at')
@@ -0,0 +1,52 @@
+"""cascade deletes for projects and boards
+
+Revision ID: d0d1115ef4d6
+Revises: 2ea3a3733ddd
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0d1115ef4d6'
+down_revision: Union[str, Sequence[str], None] = '2ea3a3733ddd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (таблица, колонка, родительская таблица) — цепочка project -> board -> column -> task -> ...
+CASCADE_FKS = [
+    ('boards', 'projects_id', 'projects'),
+    ('columns', 'board_id', 'boards'),
+    ('tasks', 'column_id', 'columns'),
+    ('comments', 'task_id', 'tasks'),
+    ('task_labels', 'task_id', 'tasks'),
+    ('task_assignees', 'task_id', 'tasks'),
+    ('user_project_accesses', 'project_id', 'projects'),
+]
+
+
+def _recreate_foreign_keys(ondelete: str | None) -> None:
+    # Ограничения создавались без имён, поэтому ищем фактическое имя в каталоге
+    inspector = sa.inspect(op.get_bind())
+    for table, column, parent in CASCADE_FKS:
+        for fk in inspector.get_foreign_keys(table):
+            if fk['constrained_columns'] == [column] and fk['referred_table'] == parent:
+                op.drop_constraint(fk['name'], table, type_='foreignkey')
+        op.create_foreign_key(
+            f'{table}_{column}_fkey', table, parent, [column], ['id'], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_foreign_keys(None)
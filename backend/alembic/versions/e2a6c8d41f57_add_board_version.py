@@ -0,0 +1,29 @@
+"""add board version for ETag
+
+Revision ID: e2a6c8d41f57
+Revises: c7d2a91e4b36
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c8d41f57'
+down_revision: Union[str, Sequence[str], None] = 'c7d2a91e4b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Постоянное значение по умолчанию не переписывает таблицу (только метаданные)
+    op.add_column('boards', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('boards', 'version')
@@ -12,32 +12,32 @@ from db.dbstruct import User
 router = APIRouter(tags=["🔐 Аутентификация"])
 
 @router.post("/api/auth/register", response_model=UserRead)
-def create_user_endpoint(user: UserCreate):
+def create_user_endpoint(user: UserCreate, db: Session = Depends(get_db)):
 
     '''
     Регистрация нового пользователя
     '''
 
-    db_user = OrmQuery.get_user_by_email(email=user.email)
+    db_user = OrmQuery.get_user_by_email(email=user.email, session=db)
     if db_user:
         raise HTTPException(status_code=400, detail="Имя пользователя или email уже заняты")
     
     avatar_path = generate_avatar(user.first_name, user.last_name)
     avatar_url = f"http://localhost:8000/{avatar_path}"
 
-    new_user = OrmQuery.create_user(user=user, avatar_url=avatar_url)
+    new_user = OrmQuery.create_user(user=user, avatar_url=avatar_url, session=db)
     return UserRead.model_validate(new_user)
 
 @router.post("/api/auth/login")
-def login(user: UserLogin):
+def login(user: UserLogin, db: Session = Depends(get_db)):
 
     '''
     Аутентификация пользователя и получение токена
     '''
 
-    db_user = OrmQuery.get_user_by_email(email=user.email)
+    db_user = OrmQuery.get_user_by_email(email=user.email, session=db)
     if not db_user or not verify_password(user.password, db_user.password):
         raise HTTPException(status_code=400, detail="Неверные учетные данные")
     
-    access_token = create_access_token(data={"sub": db_user.email})
+    access_token = create_access_token(data={"sub": str(db_user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
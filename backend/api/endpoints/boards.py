@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from typing import List
+from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.OrmQuery import OrmQuery
-from api.models.boards import BoardCreate, BoardOut, BoardUpdateTitle
-from core.security import get_current_user
-from api.utils.permissions import can_view_project, can_edit_project
-from db.database import get_db
+from db.AsyncOrmQuery import AsyncOrmQuery
+from api.models.boards import BoardCreate, BoardOut, BoardUpdateTitle, BoardStatsOut, BoardArchivePolicy, ArchivedTaskOut
+from core.security import get_current_user, get_current_user_async
+from core.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from api.utils.permissions import can_view_project, can_edit_project, resolve_access, resolve_access_async
+from db.database import get_db, get_async_db, prefer_replica_async
 
 router = APIRouter(tags=["📋 Доски"])
 
@@ -19,7 +24,7 @@ def create_board_endpoint(
     Создает доску и автоматически добавляет стандартные колонки.
     Только владелец может создавать доски.
     """
-    project = OrmQuery.get_project_by_id(board.projects_id)
+    project = OrmQuery.get_project_by_id(board.projects_id, session=db)
     if not project:
         raise HTTPException(status_code=404, detail="Проект не найден")
     
@@ -31,9 +36,85 @@ def create_board_endpoint(
     if not can_edit_project(current_user.id, board.projects_id, db):
         raise HTTPException(status_code=403, detail="Только владелец может создавать доски")
 
-    new_board = OrmQuery.create_board(board)
+    new_board = OrmQuery.create_board(board, session=db)
     return new_board
 
+@router.get("/api/boards/{board_id}/stats", response_model=BoardStatsOut, dependencies=[Depends(prefer_replica_async)])
+async def get_board_stats(
+    board_id: int,
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Количество задач на доске, в колонках и у исполнителей, плюс просроченные.
+    Читается из поддерживаемых счётчиков, задачи не загружаются.
+    """
+    access = await resolve_access_async(current_user.id, db, board_id=board_id)
+    if not access:
+        raise HTTPException(status_code=404, detail="Доска не найдена")
+
+    if not access.can_view:
+        raise HTTPException(status_code=403, detail="Нет доступа к проекту")
+
+    return await AsyncOrmQuery.get_board_stats(board_id, session=db)
+
+@router.get("/api/boards/{board_id}/archive", response_model=List[ArchivedTaskOut], dependencies=[Depends(prefer_replica_async)])
+async def get_board_archive(
+    board_id: int,
+    response: Response,
+    cursor: str | None = Query(default=None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы"),
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Архивные задачи доски, от недавно архивированных к старым.
+    Постраничная выдача: курсор следующей страницы приходит в заголовке X-Next-Cursor.
+    """
+    after = None
+    if cursor is not None:
+        try:
+            after = tuple(decode_cursor(cursor, (datetime, int)))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+    access = await resolve_access_async(current_user.id, db, board_id=board_id)
+    if not access:
+        raise HTTPException(status_code=404, detail="Доска не найдена")
+
+    if not access.can_view:
+        raise HTTPException(status_code=403, detail="Нет доступа к проекту")
+
+    tasks = await AsyncOrmQuery.get_board_archive(board_id, after=after, limit=limit + 1, session=db)
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([tasks[-1].archived_at, tasks[-1].id])
+    return [task._asdict() for task in tasks]
+
+@router.put("/api/boards/{board_id}/archive-policy", response_model=BoardOut)
+def update_board_archive_policy(
+    board_id: int,
+    policy: BoardArchivePolicy,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Задаёт политику архивации доски: задачи, пролежавшие в колонке column_id
+    дольше after_days дней, уходят в архив. column_id=null отключает архивацию.
+    Только владелец может менять политику.
+    """
+    access = resolve_access(current_user.id, db, board_id=board_id)
+    if not access:
+        raise HTTPException(status_code=404, detail="Доска не найдена")
+
+    if not access.is_owner:
+        raise HTTPException(status_code=403, detail="Только владелец может менять политику архивации")
+
+    updated_board = OrmQuery.update_board_archive_policy(board_id, policy.column_id, policy.after_days, session=db)
+    if not updated_board:
+        raise HTTPException(status_code=400, detail="Колонка не найдена на этой доске")
+    return updated_board
+
 @router.put("/api/boards/{board_id}/title", response_model=BoardOut)
 def update_board_title(
     board_id: int, 
@@ -45,46 +126,51 @@ def update_board_title(
     Обновляет название доски по её ID.
     Только владелец может редактировать доски.
     """
-    board = OrmQuery.get_board_by_id(board_id)
-    if not board:
+    access = resolve_access(current_user.id, db, board_id=board_id)
+    if not access:
         raise HTTPException(status_code=404, detail="Доска не найдена")
     
     # Проверяем доступ к проекту
-    if not can_view_project(current_user.id, board.projects_id, db):
+    if not access.can_view:
         raise HTTPException(status_code=403, detail="Нет доступа к проекту")
     
     # Только владелец может редактировать доски
-    if not can_edit_project(current_user.id, board.projects_id, db):
+    if not access.is_owner:
         raise HTTPException(status_code=403, detail="Только владелец может редактировать доски")
 
-    updated_board = OrmQuery.update_board_title(board_id, board_update.title)
+    updated_board = OrmQuery.update_board_title(board_id, board_update.title, session=db)
     return updated_board
 
 @router.delete("/api/boards/{board_id}")
-def delete_board(board_id: int, current_user=Depends(get_current_user)):
+def delete_board(
+    board_id: int,
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Удалить большую доску в фоне пачками"),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
     Удаляет доску вместе со всеми связанными сущностями (колонками и задачами).
+    С background=true удаление выполняется в фоне, а ответ 202 возвращается сразу.
     Только владелец workspace может удалить доску.
     """
-    board = OrmQuery.get_board_by_id(board_id)
-    if not board:
+    access = resolve_access(current_user.id, db, board_id=board_id)
+    if not access:
         raise HTTPException(status_code=404, detail="Доска не найдена")
 
-    # Получаем проект доски
-    project = OrmQuery.get_project_by_id(board.projects_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Проект не найден")
-
     # Проверяем, что пользователь является владельцем workspace
-    user_role = OrmQuery.get_user_workspace_role(current_user.id, project.workspaces_id)
-    if user_role != "owner":
+    if not access.is_owner:
         raise HTTPException(
             status_code=403, 
             detail="Только владелец рабочего пространства может удалять доски"
         )
 
+    if background:
+        background_tasks.add_task(OrmQuery.delete_board_in_chunks, board_id)
+        return JSONResponse(status_code=202, content={"status": "accepted", "message": "Доска будет удалена в фоне"})
+
     # Удаляем доску со всеми связанными сущностями
-    success = OrmQuery.delete_board(board_id)
+    success = OrmQuery.delete_board(board_id, session=db)
     if not success:
         raise HTTPException(status_code=500, detail="Не удалось удалить доску")
 
@@ -1,15 +1,17 @@
 # api/endpoints/colors.py
 from fastapi import APIRouter, Depends, HTTPException, Body
 from typing import List, Dict, Any
+from sqlalchemy.orm import Session
 from db.OrmQuery import OrmQuery
+from db.database import get_db
 from core.security import get_current_user
 
 router = APIRouter(tags=["🎨 Цвета колонок"])
 
 @router.get("/api/colors")
-def get_available_colors(current_user=Depends(get_current_user)) -> List[Dict[str, Any]]:
+def get_available_colors(current_user=Depends(get_current_user), db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
     """Получить доступные цвета для колонок"""
-    colors = OrmQuery.get_available_colors()
+    colors = OrmQuery.get_available_colors(session=db)
     return [
         {
             "id": color.id,
@@ -23,7 +25,8 @@ def get_available_colors(current_user=Depends(get_current_user)) -> List[Dict[st
 def update_color_column(
         column_id: int,
         column_data: Dict[str, Any] = Body(...),
-        current_user=Depends(get_current_user)
+        current_user=Depends(get_current_user),
+        db: Session = Depends(get_db)
     ) -> Dict[str, Any]:
     """Обновить цвет колонки"""
     try:
@@ -31,7 +34,7 @@ def update_color_column(
         if not isinstance(color_id, int):
             raise HTTPException(status_code=400, detail=f"Некорректный color_id: {color_id}")
 
-        updated_column = OrmQuery.update_column_color(column_id, color_id)
+        updated_column = OrmQuery.update_column_color(column_id, color_id, session=db)
         
         if not updated_column:
             raise HTTPException(status_code=404, detail="Колонка не найдена")
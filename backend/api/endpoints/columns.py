@@ -1,32 +1,54 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.OrmQuery import OrmQuery
-from api.models.columns import ColumnTitleUpdate, ColumnCreate
-from core.security import get_current_user
+from db.AsyncOrmQuery import AsyncOrmQuery
+from api.models.columns import ColumnTitleUpdate, ColumnCreate, ColumnPosition
+from core.security import get_current_user, get_current_user_async
 from core.logger import logger
-from api.utils.permissions import can_view_project, can_edit_project
-from db.database import get_db
+from api.utils.permissions import resolve_access
+from db.database import get_db, get_async_db
 from typing import List
 
 router = APIRouter(tags=["📊 Колонки"])
 
 @router.put("/api/columns/update_positions")
-def update_positions(payload: list[dict]):
+def update_positions(
+    payload: List[ColumnPosition],
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
 
     """
-    Обновление позиций колонок
+    Обновление позиций колонок одной доски одним запросом.
+    Только владелец может менять порядок колонок.
     """
-    
-    OrmQuery.update_column_positions(payload)
+    if not payload:
+        return {"status": "ok"}
+
+    positions = {item.id: item.position for item in payload}
+    if len(positions) != len(payload):
+        raise HTTPException(status_code=400, detail="Колонки в списке повторяются")
+
+    board_id = OrmQuery.get_board_id_for_columns(list(positions), session=db)
+    if board_id is None:
+        raise HTTPException(status_code=400, detail="Колонки не найдены или принадлежат разным доскам")
+
+    access = resolve_access(current_user.id, db, board_id=board_id)
+    if not access or not access.is_owner:
+        raise HTTPException(status_code=403, detail="Только владелец может менять порядок колонок")
+
+    if not OrmQuery.update_column_positions(board_id, positions, session=db):
+        raise HTTPException(status_code=409, detail="Колонки доски изменились, обновите страницу")
     return {"status": "ok"}
 
 @router.put("/api/columns/{column_id}/title")
-def update_column_title(column_id: int, data: ColumnTitleUpdate):
+def update_column_title(column_id: int, data: ColumnTitleUpdate, db: Session = Depends(get_db)):
     """
     Обновление названия колонки
     """
-    updated_column = OrmQuery.update_column_title(column_id, data.title)
+    updated_column = OrmQuery.update_column_title(column_id, data.title, session=db)
     return {"id": updated_column.id, "title": updated_column.title}
 
 @router.post("/api/columns")
@@ -43,22 +65,17 @@ def create_column(
     if not current_user:
         raise HTTPException(status_code=401, detail="Не авторизован")
     
-    # Проверяем существование доски
-    board = OrmQuery.get_board_by_id(data.board_id)
-    if not board:
+    # Проверяем существование доски и права в её проекте
+    access = resolve_access(current_user.id, db, board_id=data.board_id)
+    if not access:
         raise HTTPException(status_code=404, detail="Доска не найдена")
     
-    # Получаем проект доски
-    project = OrmQuery.get_project_by_id(board.projects_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Проект не найден")
-    
     # Проверяем доступ к проекту
-    if not can_view_project(current_user.id, project.id, db):
+    if not access.can_view:
         raise HTTPException(status_code=403, detail="Нет доступа к проекту")
     
     # Только владелец может создавать колонки
-    if not can_edit_project(current_user.id, project.id, db):
+    if not access.is_owner:
         raise HTTPException(status_code=403, detail="Только владелец может создавать колонки")
     
     # Валидация данных
@@ -76,7 +93,8 @@ def create_column(
             board_id=data.board_id,
             title=data.title.strip(),
             position=data.position,
-            user_id=current_user.id
+            user_id=current_user.id,
+            session=db
         )
         
         if not new_column:
@@ -112,11 +130,15 @@ def create_column(
         )
 
 @router.get("/api/boards/{board_id}/columns/list")
-def get_board_columns(board_id: int, current_user=Depends(get_current_user)):
+async def get_board_columns(
+    board_id: int,
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Возвращает список всех колонок доски (без задач) для использования в фильтрах и создании задач.
     """
-    columns = OrmQuery.get_columns_by_board_id(board_id)
+    columns = await AsyncOrmQuery.get_columns_by_board_id(board_id, session=db)
     
     result = []
     for col in columns:
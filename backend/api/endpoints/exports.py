@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Literal
+from datetime import datetime
+import csv
+import io
+import json
+
+from db.AsyncOrmQuery import AsyncOrmQuery
+from db.database import get_async_db
+from core.security import get_current_user_async
+from api.utils.permissions import resolve_access_async
+
+router = APIRouter(tags=["📤 Экспорт"])
+
+EXPORT_FIELDS = [
+    "task_id", "title", "description", "priority", "due_date", "created_at",
+    "assigned_to", "created_by", "assignees", "labels",
+    "column_id", "column_title", "board_id", "board_title", "project_id", "project_title",
+]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Не сериализуется в JSON: {type(value)!r}")
+
+
+async def _serialize(batches: AsyncIterator[List[dict]], fmt: str) -> AsyncIterator[str]:
+    """
+    Превращает пачки строк в куски NDJSON или CSV; каждая пачка — один кусок ответа.
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        yield buffer.getvalue()
+        async for rows in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            for row in rows:
+                writer.writerow({
+                    **row,
+                    "labels": ", ".join(name or "" for name in row["labels"]),
+                    "assignees": ", ".join(name or "" for name in row["assignees"]),
+                    "due_date": row["due_date"].isoformat() if row["due_date"] else "",
+                    "created_at": row["created_at"].isoformat() if row["created_at"] else "",
+                })
+            yield buffer.getvalue()
+        return
+
+    async for rows in batches:
+        yield "".join(
+            json.dumps({field: row[field] for field in EXPORT_FIELDS}, ensure_ascii=False, default=_json_default) + "\n"
+            for row in rows
+        )
+
+
+def _export_response(batches: AsyncIterator[List[dict]], fmt: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        _serialize(batches, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+@router.get("/api/boards/{board_id}/export")
+async def export_board(
+    board_id: int,
+    format: Literal["ndjson", "csv"] = Query(default="ndjson", description="Формат выгрузки: ndjson или csv"),
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Потоковая выгрузка всех задач доски в NDJSON или CSV.
+    Память не зависит от размера доски: строки читаются серверным курсором.
+    """
+    access = await resolve_access_async(current_user.id, db, board_id=board_id)
+    if not access:
+        raise HTTPException(status_code=404, detail="Доска не найдена")
+
+    if not access.can_view:
+        raise HTTPException(status_code=403, detail="Нет доступа к проекту")
+
+    return _export_response(AsyncOrmQuery.iter_export_tasks(board_id=board_id), format, f"board_{board_id}")
+
+
+@router.get("/api/workspaces/{workspace_id}/export")
+async def export_workspace(
+    workspace_id: int,
+    format: Literal["ndjson", "csv"] = Query(default="ndjson", description="Формат выгрузки: ndjson или csv"),
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Потоковая выгрузка задач всех досок workspace, доступных пользователю.
+    Владелец получает все проекты, остальные участники — проекты с правом просмотра.
+    """
+    project_ids = await AsyncOrmQuery.get_viewable_project_ids(current_user.id, workspace_id, session=db)
+    if project_ids is None:
+        raise HTTPException(status_code=403, detail="Нет доступа к рабочему пространству")
+
+    return _export_response(
+        AsyncOrmQuery.iter_export_tasks(project_ids=project_ids), format, f"workspace_{workspace_id}"
+    )
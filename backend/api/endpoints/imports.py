@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+
+from db.OrmQuery import OrmQuery
+from db.database import get_db
+from core.security import get_current_user
+from core.task_import import parse_import_file
+from api.models.tasks import TaskImportOut
+from api.utils.permissions import resolve_access
+
+router = APIRouter(tags=["📥 Импорт"])
+
+
+@router.post("/api/boards/{board_id}/import", response_model=TaskImportOut)
+def import_board_tasks(
+    board_id: int,
+    file: UploadFile = File(..., description="CSV или JSON со списком задач"),
+    format: Optional[Literal["csv", "json"]] = Query(default=None, description="Формат файла; по умолчанию — по расширению"),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Массовый импорт задач в доску из CSV или JSON (поля — см. core/task_import.py).
+    Строки с ошибками пропускаются и перечисляются в ответе, остальные
+    загружаются одной транзакцией через COPY.
+    Права: как на создание задач — участник (participant) или владелец (owner).
+    """
+    access = resolve_access(current_user.id, db, board_id=board_id)
+    if not access:
+        raise HTTPException(status_code=404, detail="Доска не найдена")
+
+    if not access.can_edit:
+        raise HTTPException(status_code=403, detail="Недостаточно прав для импорта задач в эту доску")
+
+    fmt = format or ("json" if (file.filename or "").lower().endswith(".json") else "csv")
+    try:
+        rows, errors = parse_import_file(file.file.read(), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = OrmQuery.import_tasks(board_id, rows, created_by=current_user.id, session=db)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Доска не найдена")
+
+    result["errors"] = sorted(errors + result["errors"], key=lambda error: error["row"])
+    return result
@@ -13,6 +13,7 @@ from api.utils.workspaces import (
     get_membership,
     resolve_membership,
 )
+from core import acl_cache
 from core.config import settings
 from core.security import get_current_user
 from db.database import get_db
@@ -112,7 +113,6 @@ def create_invite_link(
     )
     db.add(invite)
     db.commit()
-    db.refresh(invite)
     return _serialize_invite(invite)
 
 
@@ -244,6 +244,7 @@ def accept_invite(
     db.add(new_link)
     db.add(invite)
     db.commit()
+    acl_cache.invalidate_membership(current_user.id, invite.workspace_id)
     return InviteAcceptResponse(
         status="joined",
         message="Вы успешно присоединились к рабочему пространству",
@@ -285,6 +286,7 @@ def send_workspace_invite(
     )
     db.add(new_link)
     db.commit()
+    acl_cache.invalidate_membership(payload.user_id, payload.workspace_id)
     return {
         "status": "added",
         "workspace_id": payload.workspace_id,
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends
+from typing import Dict, Any
+
+from db.database import engine, async_engine
+from db.pool_metrics import pool_snapshot
+from db.routing import RoutingSession, AsyncRoutingSession
+from core.config import settings
+from core.security import require_metrics_token, user_cache
+from core import acl_cache, board_cache
+
+# Метрики раскрывают устройство деплоя (пулы, реплики, кэши), поэтому они
+# доступны только мониторингу по токену, а не любому пользователю
+router = APIRouter(tags=["📈 Метрики"], dependencies=[Depends(require_metrics_token)])
+
+@router.get("/api/metrics/db-pool")
+def get_db_pool_metrics() -> Dict[str, Any]:
+    """
+    Состояние пулов соединений текущего процесса: занятые соединения,
+    переполнение и гистограмма ожидания соединения; для реплик — последнее
+    измеренное отставание (None — реплика недоступна или ещё не проверялась).
+    """
+    replicas = RoutingSession.replicas + AsyncRoutingSession.replicas
+    return {
+        "config": settings.DB_POOL_OPTIONS,
+        "pools": [
+            pool_snapshot(engine.pool),
+            pool_snapshot(async_engine.sync_engine.pool),
+            *({**pool_snapshot(replica.engine.pool), "lag_seconds": replica.lag} for replica in replicas),
+        ],
+    }
+
+
+@router.get("/api/metrics/caches")
+def get_cache_metrics() -> Dict[str, Any]:
+    """
+    Кэши в памяти текущего процесса: число записей, попадания и промахи,
+    для кэша досок — занятый объём в байтах.
+    """
+    return {
+        "users": user_cache.stats(),
+        "workspace_roles": acl_cache.workspace_roles.stats(),
+        "project_view_access": acl_cache.project_view_access.stats(),
+        "project_workspaces": acl_cache.project_workspaces.stats(),
+        "board_payloads": board_cache.board_payloads.stats(),
+    }
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query
+from fastapi.responses import JSONResponse
 from typing import List
 from sqlalchemy.orm import Session
 
@@ -15,11 +16,11 @@ from api.models.projects import (
 )
 from api.utils.workspaces import resolve_membership
 from api.utils.permissions import get_user_accessible_projects, can_view_project, can_edit_project
-from db.database import get_db
+from db.database import get_db, prefer_replica
 
 router = APIRouter(tags=["📁 Проекты"])
 
-@router.get("/api/workspace/projects", response_model=List[ProjectWithBoardsOut])
+@router.get("/api/workspace/projects", response_model=List[ProjectWithBoardsOut], dependencies=[Depends(prefer_replica)])
 def get_workspace_projects(
         workspace_id: int | None = Query(
             default=None,
@@ -55,7 +56,7 @@ def create_project_endpoint(
             detail="Только владелец рабочего пространства может создавать проекты"
         )
 
-    new_project = OrmQuery.create_project(project)
+    new_project = OrmQuery.create_project(project, session=db)
     return new_project
 
 @router.put("/api/projects/{project_id}/title", response_model=ProjectOut)
@@ -65,7 +66,7 @@ def update_project_title(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    project = OrmQuery.get_project_by_id(project_id)
+    project = OrmQuery.get_project_by_id(project_id, session=db)
     if not project:
         raise HTTPException(status_code=404, detail="Проект не найден")
 
@@ -77,19 +78,20 @@ def update_project_title(
     if not can_edit_project(current_user.id, project_id, db):
         raise HTTPException(status_code=403, detail="Только владелец может редактировать проекты")
 
-    updated_project = OrmQuery.update_project_title(project_id, project_update.title)
+    updated_project = OrmQuery.update_project_title(project_id, project_update.title, session=db)
     return updated_project
 
 @router.post("/api/projects/access/create", response_model=ProjectUserAccessOut)
 def create_project_user_access(
     access: ProjectUserAccessCreate,
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
-    project = OrmQuery.get_project_by_id(access.project_id)
+    project = OrmQuery.get_project_by_id(access.project_id, session=db)
     if not project:
         raise HTTPException(status_code=404, detail="Проект не найден")
 
-    workspace = OrmQuery.get_workspace_by_user_id(current_user.id)
+    workspace = OrmQuery.get_workspace_by_user_id(current_user.id, session=db)
     if not workspace or workspace.id != project.workspaces_id:
         raise HTTPException(status_code=403, detail="Нет доступа к проекту")
 
@@ -97,7 +99,8 @@ def create_project_user_access(
         project_id=access.project_id,
         user_id=access.user_id,
         can_edit=access.can_edit,
-        can_view=access.can_view
+        can_view=access.can_view,
+        session=db
     )
     if not new_access:
         raise HTTPException(status_code=400, detail="Не удалось создать доступ (проект или пользователь не найдены)")
@@ -107,17 +110,18 @@ def create_project_user_access(
 @router.get("/api/projects/{project_id}/access", response_model=List[ProjectGetUsersAccess])
 def get_project_users_access(
     project_id: int,
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
-    project = OrmQuery.get_project_by_id(project_id)
+    project = OrmQuery.get_project_by_id(project_id, session=db)
     if not project:
         raise HTTPException(status_code=404, detail="Проект не найден")
 
-    workspace = OrmQuery.get_workspace_by_user_id(current_user.id)
+    workspace = OrmQuery.get_workspace_by_user_id(current_user.id, session=db)
     if not workspace or workspace.id != project.workspaces_id:
         raise HTTPException(status_code=403, detail="Нет доступа к проекту")
 
-    access_list = OrmQuery.get_users_project_access(project_id) or []
+    access_list = OrmQuery.get_users_project_access(project_id, session=db) or []
     # Преобразуем ORM-объекты в dict, чтобы соответствовать ProjectGetUsersAccess
     result = [
         {
@@ -134,26 +138,34 @@ def get_project_users_access(
 @router.delete("/api/projects/{project_id}")
 def delete_project(
     project_id: int,
-    current_user=Depends(get_current_user)
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Удалить большой проект в фоне пачками"),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """
     Удаляет проект вместе со всеми связанными сущностями.
+    С background=true удаление выполняется в фоне, а ответ 202 возвращается сразу.
     Только владелец workspace может удалить проект.
     """
-    project = OrmQuery.get_project_by_id(project_id)
+    project = OrmQuery.get_project_by_id(project_id, session=db)
     if not project:
         raise HTTPException(status_code=404, detail="Проект не найден")
 
     # Проверяем, что пользователь является владельцем workspace
-    user_role = OrmQuery.get_user_workspace_role(current_user.id, project.workspaces_id)
+    user_role = OrmQuery.get_user_workspace_role(current_user.id, project.workspaces_id, session=db)
     if user_role != "owner":
         raise HTTPException(
             status_code=403, 
             detail="Только владелец рабочего пространства может удалять проекты"
         )
 
+    if background:
+        background_tasks.add_task(OrmQuery.delete_project_in_chunks, project_id)
+        return JSONResponse(status_code=202, content={"status": "accepted", "message": "Проект будет удален в фоне"})
+
     # Удаляем проект со всеми связанными сущностями
-    success = OrmQuery.delete_project(project_id)
+    success = OrmQuery.delete_project(project_id, session=db)
     if not success:
         raise HTTPException(status_code=500, detail="Не удалось удалить проект")
 
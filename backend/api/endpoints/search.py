@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import html
+
+from db.AsyncOrmQuery import AsyncOrmQuery
+from db.database import get_async_db, prefer_replica_async
+from db.queries import SEARCH_START_SEL, SEARCH_STOP_SEL
+from core.security import get_current_user_async
+from core.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from api.models.search import SearchHitOut
+
+router = APIRouter(tags=["🔎 Поиск"])
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+
+def _highlight(snippet: str | None) -> str:
+    """
+    Экранирует фрагмент из ts_headline и заменяет маркеры совпадений на <mark>.
+    """
+    escaped = html.escape(snippet or "")
+    return escaped.replace(SEARCH_START_SEL, "<mark>").replace(SEARCH_STOP_SEL, "</mark>")
+
+
+@router.get("/api/search", response_model=List[SearchHitOut], dependencies=[Depends(prefer_replica_async)])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200, description="Поисковый запрос (синтаксис websearch: \"фраза\", or, -слово)"),
+    workspace_id: int = Query(..., description="ID рабочего пространства"),
+    cursor: str | None = Query(default=None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
+    limit: int = Query(default=SEARCH_PAGE_SIZE, ge=1, le=SEARCH_MAX_PAGE_SIZE, description="Размер страницы"),
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Полнотекстовый поиск по названиям и описаниям задач и по комментариям
+    в проектах workspace, которые пользователь может просматривать.
+    Результаты упорядочены по релевантности, с подсвеченным фрагментом текста.
+    Постраничная выдача: курсор следующей страницы приходит в заголовке X-Next-Cursor.
+    """
+    after = None
+    if cursor is not None:
+        try:
+            after = tuple(decode_cursor(cursor, (float, str, int)))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+    project_ids = await AsyncOrmQuery.get_viewable_project_ids(current_user.id, workspace_id, session=db)
+    if project_ids is None:
+        raise HTTPException(status_code=403, detail="Нет доступа к рабочему пространству")
+
+    hits = await AsyncOrmQuery.search(project_ids, q, after=after, limit=limit + 1, session=db)
+    if len(hits) > limit:
+        hits = hits[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([hits[-1].rank, hits[-1].kind, hits[-1].id])
+
+    return [
+        {
+            "kind": hit.kind,
+            "id": hit.id,
+            "task_id": hit.task_id,
+            "task_title": hit.task_title,
+            "board_id": hit.board_id,
+            "project_id": hit.project_id,
+            "rank": hit.rank,
+            "archived": hit.archived_at is not None,
+            "snippet": _highlight(hit.snippet),
+        }
+        for hit in hits
+    ]
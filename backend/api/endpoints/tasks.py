@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.security import get_current_user
-from api.models.tasks import BoardTasksOut, TaskFilledFieldsOut, TaskCardOut, TaskDetailOut, TaskCreate, TaskUpdate, TaskCommentOut, CommentCreate, UserTaskOut, CalendarTaskOut
+from core.security import get_current_user, get_current_user_async
+from core.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from core.etag import board_etag, etag_matches, REVALIDATE_CACHE_CONTROL
+from core import board_cache
+from api.models.tasks import BoardTasksOut, TaskFilledFieldsOut, TaskCardOut, TaskDetailOut, TaskCreate, TaskUpdate, TaskBatchItem, TaskBatchResult, TaskMove, TaskMoveOut, TaskCommentOut, CommentCreate, UserTaskOut, CalendarTaskOut
 from db.OrmQuery import OrmQuery
-from api.utils.permissions import can_create_task, can_edit_task, can_delete_task, can_comment_task, can_view_project
-from db.database import get_db
+from db.AsyncOrmQuery import AsyncOrmQuery
+from api.utils.permissions import can_create_task, can_edit_task, can_edit_project_tasks, can_comment_task, can_view_project_async, resolve_access
+from db.database import get_db, get_async_db, prefer_replica_async
 
 from db.dbstruct import Task as TaskModel
 from typing import List
@@ -14,6 +20,24 @@ from typing import List
 
 router = APIRouter(tags=["✅ Задачи"])
 
+# Максимум задач в одном PATCH /api/tasks/batch
+TASK_BATCH_MAX = 500
+
+def _parse_cursor(cursor: str | None, types: tuple) -> tuple | None:
+    if cursor is None:
+        return None
+    try:
+        return tuple(decode_cursor(cursor, types))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+def _require_task_view(user_id: int, task_id: int, db: Session) -> None:
+    access = resolve_access(user_id, db, task_id=task_id)
+    if not access:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    if not access.can_view:
+        raise HTTPException(status_code=403, detail="Нет доступа к проекту")
+
 @router.post("/api/tasks", response_model=TaskCardOut)
 def create_task_endpoint(
     payload: TaskCreate, 
@@ -32,7 +56,7 @@ def create_task_endpoint(
             detail="Недостаточно прав для создания задачи. Только участники и владельцы могут создавать задачи."
         )
     
-    task = OrmQuery.create_task(title=payload.title, column_id=payload.column_id, assigned_to=None, created_by=current_user.id)
+    task = OrmQuery.create_task(title=payload.title, column_id=payload.column_id, assigned_to=None, created_by=current_user.id, session=db)
     if not task:
         raise HTTPException(status_code=404, detail="Column not found")
 
@@ -43,127 +67,45 @@ def create_task_endpoint(
         "assignee": None
     }
 
-@router.get("/api/boards/{board_id}/columns", response_model=BoardTasksOut)
-def get_tasks_by_board(
+@router.get("/api/boards/{board_id}/columns", response_model=BoardTasksOut, dependencies=[Depends(prefer_replica_async)])
+async def get_tasks_by_board(
     board_id: int, 
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    if_none_match: str | None = Header(default=None),
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Возвращает колонки и задачи для указанной доски.
     Проверяет доступ пользователя к проекту доски.
+    Работает асинхронно, не занимая поток из threadpool.
+    Данные читаются плоскими проекциями и сериализуются orjson напрямую,
+    без ORM-объектов и повторной валидации через BoardTasksOut.
+    ETag — версия доски: если клиент прислал её в If-None-Match и доска
+    не менялась, ответ 304 без чтения задач. Готовое тело ответа кэшируется
+    по версии доски (core/board_cache.py) и отдаётся без запросов к задачам
+    и без сериализации.
     """
-    # Получаем доску и проверяем доступ к проекту
-    board = OrmQuery.get_board_by_id(board_id)
+    board = await AsyncOrmQuery.get_board_header(board_id, session=db)
     if not board:
         raise HTTPException(status_code=404, detail="Доска не найдена")
-    
-    project = getattr(board, "project", None)
-    if not project:
-        raise HTTPException(status_code=404, detail="Проект не найден")
-    
+
     # Проверяем доступ к проекту
-    if not can_view_project(current_user.id, project.id, db):
+    if not await can_view_project_async(current_user.id, board.project_id, db):
         raise HTTPException(status_code=403, detail="Нет доступа к проекту")
 
-    columns = OrmQuery.get_columns_with_tasks_by_board_id(board_id) or []
-
-    if not columns:
-        try:
-            board = OrmQuery.get_board_by_id(board_id)
-        except Exception:
-            board = None
-        if board is None:
-            raise HTTPException(status_code=404, detail="Board not found")
-        project = getattr(board, "project", None)
-        project_info = {"id": project.id, "title": getattr(project, "title", None), "workspaces_id": getattr(project, "workspaces_id", None)} if project else None
-        return {
-            "board_id": board.id,
-            "board_title": getattr(board, "title", None),
-            "project": project_info,
-            "columns": []
-        }
+    # Версия читается до сборки доски: запись между запросами даст ответ новее ETag,
+    # и следующий запрос клиента просто получит доску заново
+    headers = {"ETag": board_etag(board.id, board.version), "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
 
-    first_board = getattr(columns[0], "board", None)
-    project = getattr(first_board, "project", None) if first_board is not None else None
-    project_info = {"id": project.id, "title": getattr(project, "title", None), "workspaces_id": getattr(project, "workspaces_id", None)} if project else None
+    body = board_cache.get_payload(board.id, board.version)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=headers)
 
-    cols_out = []
-    for c in columns:
-        board_id_val = getattr(c, "board_id", None) or getattr(c, "boards_id", None) or (getattr(c, "board", None).id if getattr(c, "board", None) else None)
-        
-        # Добавляем информацию о цвете
-        color_info = None
-        if hasattr(c, 'color') and c.color:
-            color_info = {
-                "id": c.color.id,
-                "name": c.color.name,
-                "hex_code": c.color.hex_code
-            }
-        
-        tasks_out = []
-        for t in getattr(c, "tasks", []) or []:
-            assignee_links = getattr(t, "assignee_links", []) or []
-            assignee = getattr(t, "assignee", None)
-            
-            task_data = {
-                "id": t.id,
-                "title": getattr(t, "title", None),
-                "description": getattr(t, "description", None),
-                "priority": getattr(t, "priority", None),
-                "due_date": getattr(t, "due_date", None),
-                "board_id": getattr(t, "board_id", None) or board_id_val,
-                "column_id": getattr(t, "column_id", None) or getattr(t, "columns_id", None) or getattr(t, "columnsId", None),
-                "created_at": getattr(t, "created_at", None),
-                "labels": [
-                    {
-                        "id": l.id,
-                        "name": getattr(l, "name", None),
-                        "color": getattr(l, "color", None)
-                    }
-                    for l in getattr(t, "labels", []) or []
-                ],
-                "assignee": (
-                    {
-                        "id": assignee.id,
-                        "first_name": getattr(assignee, "first_name", None),
-                        "last_name": getattr(assignee, "last_name", None),
-                        "username": getattr(assignee, "username", None),
-                        "email": getattr(assignee, "email", None),
-                        "avatar_url": getattr(assignee, "avatar_url", None),
-                    }
-                    if assignee
-                    else None
-                ),
-                "assignees": [
-                    {
-                        "id": getattr(ta, "user", None).id if getattr(ta, "user", None) else None,
-                        "first_name": getattr(getattr(ta, "user", None), "first_name", None) if getattr(ta, "user", None) else None,
-                        "last_name": getattr(getattr(ta, "user", None), "last_name", None) if getattr(ta, "user", None) else None,
-                        "username": getattr(getattr(ta, "user", None), "username", None) if getattr(ta, "user", None) else None,
-                        "email": getattr(getattr(ta, "user", None), "email", None) if getattr(ta, "user", None) else None,
-                        "avatar_url": getattr(getattr(ta, "user", None), "avatar_url", None) if getattr(ta, "user", None) else None,
-                    }
-                    for ta in assignee_links
-                    if getattr(ta, "user", None) is not None
-                ],
-            }
-            tasks_out.append(task_data)
-        
-        cols_out.append({
-            "id": c.id,
-            "title": getattr(c, "title", None),
-            "board_id": board_id_val,
-            "color": color_info,
-            "tasks": tasks_out
-        })
-
-    return {
-        "board_id": getattr(first_board, "id", board_id),
-        "board_title": getattr(first_board, "title", None),
-        "project": project_info,
-        "columns": cols_out
-    }
+    response = ORJSONResponse(await AsyncOrmQuery.get_board_view(board, session=db), headers=headers)
+    board_cache.put_payload(board.id, board.version, response.body)
+    return response
 
 @router.get("/api/tasks/{task_id}", response_model=TaskFilledFieldsOut)
 def get_task_filled_fields(
@@ -175,30 +117,12 @@ def get_task_filled_fields(
     Возвращает заполненные поля задачи в виде словаря: имя_поля -> значение
     Проверяет доступ к проекту задачи.
     """
-    task = OrmQuery.get_task_by_id(task_id)
+    # Проверяем доступ к проекту задачи
+    _require_task_view(current_user.id, task_id, db)
+
+    task = OrmQuery.get_task_by_id(task_id, session=db)
     if not task:
         raise HTTPException(status_code=404, detail="Задача не найдена")
-    
-    # Получаем проект через колонку и доску
-    task_with_relations = OrmQuery.get_task_with_relations(task_id)
-    if not task_with_relations:
-        raise HTTPException(status_code=404, detail="Задача не найдена")
-    
-    column = getattr(task_with_relations, "column", None)
-    if not column:
-        raise HTTPException(status_code=404, detail="Колонка не найдена")
-    
-    board = getattr(column, "board", None)
-    if not board:
-        raise HTTPException(status_code=404, detail="Доска не найдена")
-    
-    project = getattr(board, "project", None)
-    if not project:
-        raise HTTPException(status_code=404, detail="Проект не найден")
-    
-    # Проверяем доступ к проекту
-    if not can_view_project(current_user.id, project.id, db):
-        raise HTTPException(status_code=403, detail="Нет доступа к проекту")
 
     filled: dict = {}
     for col in TaskModel.__table__.columns:
@@ -230,25 +154,12 @@ def get_task_card(
     - assignee (выполняющий человек)
     """
 
-    task = OrmQuery.get_task_with_relations(task_id)
+    # Права проверяются до загрузки задачи со связями
+    _require_task_view(current_user.id, task_id, db)
+
+    task = OrmQuery.get_task_with_relations(task_id, session=db)
     if not task:
         raise HTTPException(status_code=404, detail="Задача не найдена")
-    
-    # Проверяем доступ к проекту
-    column = getattr(task, "column", None)
-    if not column:
-        raise HTTPException(status_code=404, detail="Колонка не найдена")
-    
-    board = getattr(column, "board", None)
-    if not board:
-        raise HTTPException(status_code=404, detail="Доска не найдена")
-    
-    project = getattr(board, "project", None)
-    if not project:
-        raise HTTPException(status_code=404, detail="Проект не найден")
-    
-    if not can_view_project(current_user.id, project.id, db):
-        raise HTTPException(status_code=403, detail="Нет доступа к проекту")
 
     labels = [
         {"id": l.id, "name": getattr(l, "name", None), "color": getattr(l, "color", None)}
@@ -284,25 +195,12 @@ def get_task_details(
     - comments (с информацией о пользователе и времени)
     Проверяет доступ к проекту задачи.
     """
-    task = OrmQuery.get_task_with_relations(task_id)
+    # Права проверяются до загрузки задачи со связями
+    _require_task_view(current_user.id, task_id, db)
+
+    task = OrmQuery.get_task_with_relations(task_id, session=db)
     if not task:
         raise HTTPException(status_code=404, detail="Задача не найдена")
-    
-    # Проверяем доступ к проекту
-    column = getattr(task, "column", None)
-    if not column:
-        raise HTTPException(status_code=404, detail="Колонка не найдена")
-    
-    board = getattr(column, "board", None)
-    if not board:
-        raise HTTPException(status_code=404, detail="Доска не найдена")
-    
-    project = getattr(board, "project", None)
-    if not project:
-        raise HTTPException(status_code=404, detail="Проект не найден")
-    
-    if not can_view_project(current_user.id, project.id, db):
-        raise HTTPException(status_code=403, detail="Нет доступа к проекту")
 
     labels = [
         {"id": l.id, "name": getattr(l, "name", None), "color": getattr(l, "color", None)}
@@ -417,12 +315,12 @@ def update_task(
             detail="Недостаточно прав для редактирования задачи. Только участники и владельцы могут редактировать задачи."
         )
     
-    upd = OrmQuery.update_task(task_id, payload.dict(exclude_unset=True))
+    upd = OrmQuery.update_task(task_id, payload.dict(exclude_unset=True), session=db)
     if not upd:
         raise HTTPException(status_code=404, detail="Неверные данные для обновления задачи")
 
     # вернуть актуальную задачу с связями
-    task = OrmQuery.get_task_with_relations(task_id)
+    task = OrmQuery.get_task_with_relations(task_id, session=db)
     if not task:
         raise HTTPException(status_code=404, detail="Задача не найдена после обновления")
 
@@ -532,6 +430,148 @@ def update_task(
         "comments": comments
     }
 
+@router.patch("/api/tasks/batch", response_model=List[TaskBatchResult])
+def batch_update_tasks(
+    payload: List[TaskBatchItem],
+    background_tasks: BackgroundTasks,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Пакетное частичное обновление задач (перенос, метки, исполнители, простые поля).
+    Права проверяются один раз на каждый затронутый проект, допустимые изменения
+    применяются одной транзакцией. Для каждой задачи возвращается статус:
+    ok, not_found, forbidden или invalid.
+    """
+    if len(payload) > TASK_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"Не больше {TASK_BATCH_MAX} задач за запрос")
+    task_ids = [item.id for item in payload]
+    if len(set(task_ids)) != len(task_ids):
+        raise HTTPException(status_code=400, detail="Задачи в запросе повторяются")
+
+    locations = OrmQuery.get_task_locations(task_ids, session=db)
+    target_columns = {
+        column_id: scope["project_id"]
+        for column_id, scope in OrmQuery.get_column_scopes(
+            [item.column_id for item in payload if item.column_id is not None], session=db
+        ).items()
+    }
+    project_ids = {project_id for _, project_id, _ in locations.values()} | set(target_columns.values())
+    allowed = {project_id: can_edit_project_tasks(current_user.id, project_id, db) for project_id in project_ids}
+
+    results, items = [], []
+    for item in payload:
+        if item.id not in locations:
+            results.append({"id": item.id, "status": "not_found"})
+            continue
+        _, project_id, archived = locations[item.id]
+        if item.column_id is not None and item.column_id not in target_columns:
+            results.append({"id": item.id, "status": "invalid", "detail": "Колонка не найдена"})
+            continue
+        if item.column_id is not None and archived:
+            results.append({"id": item.id, "status": "invalid", "detail": "Задача в архиве"})
+            continue
+        if not allowed[project_id] or (item.column_id is not None and not allowed[target_columns[item.column_id]]):
+            results.append({"id": item.id, "status": "forbidden"})
+            continue
+        items.append(item.dict(exclude_unset=True))
+        results.append({"id": item.id, "status": "ok"})
+
+    if items:
+        for column_id in OrmQuery.batch_update_tasks(items, session=db):
+            background_tasks.add_task(OrmQuery.rebalance_column_ranks, column_id)
+    return results
+
+@router.post("/api/tasks/{task_id}/move", response_model=TaskMoveOut)
+def move_task(
+    task_id: int,
+    payload: TaskMove,
+    background_tasks: BackgroundTasks,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Перемещает задачу внутри колонки или в другую колонку между соседями after_id и before_id.
+    Меняет только ключ порядка и колонку самой задачи; если ключ стал слишком длинным,
+    колонка перенумеровывается в фоне.
+    Проверяет права доступа: только участник (participant) и владелец (owner) могут перемещать задачи.
+    """
+    if not can_edit_task(current_user.id, task_id, db):
+        raise HTTPException(
+            status_code=403,
+            detail="Недостаточно прав для перемещения задачи. Только участники и владельцы могут перемещать задачи."
+        )
+    if payload.column_id is not None and not can_create_task(current_user.id, payload.column_id, db):
+        raise HTTPException(status_code=403, detail="Недостаточно прав для перемещения задачи в эту колонку")
+
+    result = OrmQuery.move_task(
+        task_id,
+        column_id=payload.column_id,
+        before_id=payload.before_id,
+        after_id=payload.after_id,
+        session=db
+    )
+    if result["status"] == "not_found":
+        raise HTTPException(status_code=404, detail="Задача или колонка не найдена")
+    if result["status"] == "bad_neighbours":
+        raise HTTPException(status_code=409, detail="Соседние задачи не найдены в колонке или изменились, обновите доску")
+
+    task = result["task"]
+    if result["rebalance"]:
+        background_tasks.add_task(OrmQuery.rebalance_column_ranks, task.column_id)
+    return {"id": task.id, "column_id": task.column_id, "rank": task.rank}
+
+@router.post("/api/tasks/{task_id}/restore", response_model=TaskMoveOut)
+def restore_task(
+    task_id: int,
+    background_tasks: BackgroundTasks,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Возвращает задачу из архива в конец её колонки.
+    Проверяет права доступа: только участник (participant) и владелец (owner) могут восстанавливать задачи.
+    """
+    access = resolve_access(current_user.id, db, task_id=task_id)
+    if not access:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+
+    if not access.can_edit:
+        raise HTTPException(status_code=403, detail="Недостаточно прав для восстановления задачи")
+
+    result = OrmQuery.restore_task(task_id, session=db)
+    if result["status"] == "not_found":
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    if result["status"] == "not_archived":
+        raise HTTPException(status_code=409, detail="Задача не в архиве")
+
+    task = result["task"]
+    if result["rebalance"]:
+        background_tasks.add_task(OrmQuery.rebalance_column_ranks, task.column_id)
+    return {"id": task.id, "column_id": task.column_id, "rank": task.rank}
+
+@router.delete("/api/tasks/{task_id}")
+def delete_task(
+    task_id: int,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Удаляет задачу вместе с комментариями, метками и исполнителями.
+    Проверяет права доступа: только участник (participant) и владелец (owner) могут удалять задачи.
+    """
+    access = resolve_access(current_user.id, db, task_id=task_id)
+    if not access:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+
+    if not access.can_edit:
+        raise HTTPException(status_code=403, detail="Недостаточно прав для удаления задачи")
+
+    if not OrmQuery.delete_task(task_id, session=db):
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+
+    return {"status": "ok", "message": "Задача успешно удалена"}
+
 @router.post("/api/tasks/{task_id}/comments", response_model=TaskCommentOut)
 def create_comment(
     task_id: int, 
@@ -550,26 +590,12 @@ def create_comment(
             detail="Недостаточно прав для комментирования. Только комментаторы, участники и владельцы могут комментировать задачи."
         )
     
-    comment = OrmQuery.create_comment(task_id=task_id, user_id=current_user.id, content=payload.content)
+    comment = OrmQuery.create_comment(task_id=task_id, user_id=current_user.id, content=payload.content, session=db)
     if not comment:
         raise HTTPException(status_code=404, detail="Задача не найдена")
     
-    # Загружаем комментарий с пользователем
-    task = OrmQuery.get_task_with_relations(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Задача не найдена")
-    
-    # Находим созданный комментарий
-    created_comment = None
-    for com in getattr(task, "comments", []) or []:
-        if com.id == comment.id:
-            created_comment = com
-            break
-    
-    if not created_comment:
-        raise HTTPException(status_code=500, detail="Ошибка при создании комментария")
-    
-    cu = getattr(created_comment, "user", None)
+    # Автор комментария — текущий пользователь: задачу со всеми комментариями не перечитываем
+    cu = current_user
     user_obj = None
     if cu:
         user_obj = {
@@ -581,22 +607,31 @@ def create_comment(
         }
     
     return {
-        "id": created_comment.id,
-        "content": getattr(created_comment, "content", None),
+        "id": comment.id,
+        "content": getattr(comment, "content", None),
         "user": user_obj,
-        "created_at": getattr(created_comment, "created_at", None)
+        "created_at": getattr(comment, "created_at", None)
     }
 
-@router.get("/api/users/me/tasks", response_model=List[UserTaskOut])
-def get_user_tasks(
+@router.get("/api/users/me/tasks", response_model=List[UserTaskOut], dependencies=[Depends(prefer_replica_async)])
+async def get_user_tasks(
+    response: Response,
     workspace_id: int | None = Query(default=None, description="ID рабочего пространства (опционально)"),
-    current_user = Depends(get_current_user)
+    cursor: str | None = Query(default=None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы"),
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Возвращает задачи, назначенные текущему пользователю.
+    Возвращает задачи, назначенные текущему пользователю, от новых к старым.
     Если указан workspace_id, возвращает только задачи из проектов этого workspace.
+    Постраничная выдача: курсор следующей страницы приходит в заголовке X-Next-Cursor.
     """
-    tasks = OrmQuery.get_user_tasks(current_user.id, workspace_id)
+    after = _parse_cursor(cursor, (datetime, int))
+    tasks = await AsyncOrmQuery.get_user_tasks(current_user.id, workspace_id, after=after, limit=limit + 1, session=db)
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([tasks[-1].created_at, tasks[-1].id])
     
     result = []
     for task in tasks:
@@ -644,27 +679,39 @@ def get_user_tasks(
     
     return result
 
-@router.get("/api/boards/{board_id}/calendar/tasks", response_model=List[CalendarTaskOut])
-def get_calendar_tasks(
+@router.get("/api/boards/{board_id}/calendar/tasks", response_model=List[CalendarTaskOut], dependencies=[Depends(prefer_replica_async)])
+async def get_calendar_tasks(
     board_id: int,
+    response: Response,
     start_date: datetime | None = Query(default=None, description="Начальная дата для фильтрации"),
     end_date: datetime | None = Query(default=None, description="Конечная дата для фильтрации"),
     column_id: int | None = Query(default=None, description="ID колонки (статус) для фильтрации"),
     assigned_to: int | None = Query(default=None, description="ID исполнителя для фильтрации"),
     label_id: int | None = Query(default=None, description="ID тега для фильтрации"),
-    current_user = Depends(get_current_user)
+    cursor: str | None = Query(default=None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы"),
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Возвращает задачи для календаря с фильтрами.
+    Возвращает задачи для календаря с фильтрами по возрастанию срока.
+    Постраничная выдача: курсор следующей страницы приходит в заголовке X-Next-Cursor.
     """
-    tasks = OrmQuery.get_calendar_tasks(
+    after = _parse_cursor(cursor, (datetime, int))
+    tasks = await AsyncOrmQuery.get_calendar_tasks(
         board_id=board_id,
         start_date=start_date,
         end_date=end_date,
         column_id=column_id,
         assigned_to=assigned_to,
-        label_id=label_id
+        label_id=label_id,
+        after=after,
+        limit=limit + 1,
+        session=db
     )
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([tasks[-1].due_date, tasks[-1].id])
     
     result = []
     for task in tasks:
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, Form
 from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from db.database import session_factory, get_db
+from db.database import session_factory, get_db, get_async_db, prefer_replica_async
 from db.OrmQuery import OrmQuery
-from api.models.user import UserRead
+from db.AsyncOrmQuery import AsyncOrmQuery
+from api.models.user import UserRead, UserSearchOut
 from api.models.workspace import WorkspaceOut, WorkspaceWithRoleOut
 from db.dbstruct import User 
-from core.security import get_current_user
+from core.security import get_current_user, get_current_user_async
 from api.utils.workspaces import resolve_membership
 
 router = APIRouter(tags=["👤 Пользователи"])
@@ -28,14 +30,37 @@ def read_users_me(current_user: User = Depends(get_current_user)):
         "avatar_url": current_user.avatar_url
     }  
 
+@router.get("/api/users/search", response_model=List[UserSearchOut], dependencies=[Depends(prefer_replica_async)])
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100, description="Начало или часть username, имени, фамилии или email; без workspace_id — точный username или email"),
+    workspace_id: Optional[int] = Query(default=None, description="Искать среди участников workspace (для назначения исполнителей)"),
+    limit: int = Query(default=10, ge=1, le=50, description="Сколько пользователей вернуть"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+
+    """
+    Автодополнение пользователей для назначения исполнителей и приглашений.
+    С workspace_id — нечёткий поиск среди участников workspace (пользователь должен в нём состоять),
+    без него — только точное совпадение username или email, чтобы нельзя было
+    выгрузить справочник пользователей с их email.
+    """
+
+    if workspace_id is not None:
+        if not await AsyncOrmQuery.get_user_workspace_role(current_user.id, workspace_id, session=db):
+            raise HTTPException(status_code=403, detail="Рабочее пространство недоступно")
+
+    return await AsyncOrmQuery.search_users(q, workspace_id, limit=limit, session=db)
+
+
 @router.get("/api/users/{user_id}", response_model=UserRead)
-def get_user_endpoint(user_id: int):
+def get_user_endpoint(user_id: int, db: Session = Depends(get_db)):
 
     """
     Возвращает информацию о пользователе по его ID.
     """
 
-    db_user = OrmQuery.get_user_by_id(user_id=user_id)
+    db_user = OrmQuery.get_user_by_id(user_id=user_id, session=db)
     if db_user is None:
         raise HTTPException(status_code=404, detail="Пользователь не найден")
     return UserRead.model_validate(db_user)
@@ -89,7 +114,8 @@ def update_user_profile(
     last_name: Optional[str] = Form(None),
     username: Optional[str] = Form(None),
     avatar: Optional[UploadFile] = File(None),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Обновляет профиль текущего пользователя.
@@ -104,7 +130,7 @@ def update_user_profile(
     
     # Проверяем, не занят ли никнейм
     if username and username != current_user.username:
-        existing_user = OrmQuery.get_user_by_username(username)
+        existing_user = OrmQuery.get_user_by_username(username, session=db)
         if existing_user:
             raise HTTPException(status_code=400, detail="Никнейм уже занят")
     
@@ -114,7 +140,8 @@ def update_user_profile(
         first_name=first_name,
         last_name=last_name,
         username=username,
-        avatar_file=avatar
+        avatar_file=avatar,
+        session=db
     )
     
     if not updated_user:
@@ -5,15 +5,16 @@ from sqlalchemy.orm import Session, joinedload
 
 from api.models.members import WorkspaceMemberOut, MemberRoleUpdate, MemberProjectsUpdate
 from api.utils.workspaces import can_manage_members, get_membership, resolve_membership
+from core import acl_cache
 from core.security import get_current_user
-from db.database import get_db
+from db.database import get_db, prefer_replica
 from db.dbstruct import UserWorkspace
 from db.OrmQuery import OrmQuery
 
 router = APIRouter()
 
 
-@router.get("/api/workspace/members", response_model=List[WorkspaceMemberOut])
+@router.get("/api/workspace/members", response_model=List[WorkspaceMemberOut], dependencies=[Depends(prefer_replica)])
 def list_workspace_members(
     workspace_id: int | None = Query(
         default=None,
@@ -35,7 +36,7 @@ def list_workspace_members(
     for link in links:
         user = link.user
         # Получаем список проектов, к которым у пользователя есть доступ
-        accessible_project_ids = OrmQuery.get_user_project_accesses(link.user_id, membership.workspace_id)
+        accessible_project_ids = OrmQuery.get_user_project_accesses(link.user_id, membership.workspace_id, session=db)
         members.append(
             WorkspaceMemberOut(
                 workspace_link_id=link.id,
@@ -103,6 +104,7 @@ def remove_workspace_member(
 
     db.delete(target_link)
     db.commit()
+    acl_cache.invalidate_membership(user_id, membership.workspace_id)
 
     return {"status": "removed", "user_id": user_id}
 
@@ -163,7 +165,8 @@ def update_member_role(
     
     # Обновляем роль
     success = OrmQuery.update_user_workspace_role(
-        user_id, membership.workspace_id, role_update.role.lower()
+        user_id, membership.workspace_id, role_update.role.lower(),
+        session=db
     )
     
     if not success:
@@ -216,7 +219,8 @@ def update_member_projects(
     
     # Обновляем доступы к проектам
     success = OrmQuery.update_user_project_accesses(
-        user_id, membership.workspace_id, projects_update.project_ids
+        user_id, membership.workspace_id, projects_update.project_ids,
+        session=db
     )
     
     if not success:
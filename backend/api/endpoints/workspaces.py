@@ -2,29 +2,31 @@ from typing import List
 
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.models.workspace import WorkspaceWithRoleOut
 from api.models.tasks import LabelOut, LabelCreate
-from core.security import get_current_user
-from db.database import get_db
+from core.security import get_current_user, get_current_user_async
+from db.database import get_db, get_async_db
 from db.dbstruct import UserWorkspace, Label, User
 from api.utils.workspaces import resolve_membership, get_membership
 from db.OrmQuery import OrmQuery
+from db.AsyncOrmQuery import AsyncOrmQuery
 
 router = APIRouter()
 
 
 @router.get("/api/workspaces/my", response_model=List[WorkspaceWithRoleOut])
-def list_user_workspaces(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+async def list_user_workspaces(
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
 ):
-    links = (
-        db.query(UserWorkspace)
-        .options(joinedload(UserWorkspace.workspace))
-        .filter(UserWorkspace.user_id == current_user.id)
-        .order_by(UserWorkspace.created_at.asc())
-        .all()
+    links = await AsyncOrmQuery.get_user_workspace_links(current_user.id, session=db)
+
+    # Владельцы всех workspace пользователя — одним запросом
+    owner_usernames = await AsyncOrmQuery.get_workspace_owner_usernames(
+        [link.workspace_id for link in links],
+        session=db
     )
 
     items: List[WorkspaceWithRoleOut] = []
@@ -33,18 +35,6 @@ def list_user_workspaces(
         if not workspace:
             continue
         
-        # Находим владельца workspace (пользователя с ролью owner)
-        owner_link = (
-            db.query(UserWorkspace)
-            .options(joinedload(UserWorkspace.user))
-            .filter(
-                UserWorkspace.workspace_id == workspace.id,
-                UserWorkspace.role.ilike("owner")
-            )
-            .first()
-        )
-        owner_username = owner_link.user.username if owner_link and owner_link.user else None
-        
         items.append(
             WorkspaceWithRoleOut(
                 id=workspace.id,
@@ -55,7 +45,7 @@ def list_user_workspaces(
                 can_invite_users=link.can_invite_users,
                 can_create_projects=link.can_create_projects,
                 is_personal=link.role.lower() == "owner",
-                owner_username=owner_username,
+                owner_username=owner_usernames.get(workspace.id),
             )
         )
     return items
@@ -106,7 +96,8 @@ def create_workspace_label(
     label = OrmQuery.create_label(
         workspace_id=membership.workspace_id,
         name=payload.name,
-        color=payload.color
+        color=payload.color,
+        session=db
     )
     
     if not label:
@@ -130,7 +121,7 @@ def get_workspace_by_username(
     Проверяет доступ текущего пользователя к этому workspace.
     """
     # Находим пользователя по username
-    target_user = OrmQuery.get_user_by_username(username)
+    target_user = OrmQuery.get_user_by_username(username, session=db)
     if not target_user:
         raise HTTPException(status_code=404, detail="Пользователь не найден")
     
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class BoardOut(BaseModel):
@@ -7,10 +7,42 @@ class BoardOut(BaseModel):
     title: Optional[str] = Field(None, description="Название доски")
     projects_id: int = Field(..., description="ID проекта")
     created_at: Optional[datetime] = Field(None, description="Дата создания")
+    archive_column_id: Optional[int] = Field(None, description="Колонка, задачи из которой уходят в архив")
+    archive_after_days: Optional[int] = Field(None, description="Через сколько дней в этой колонке задача архивируется")
 
 class BoardCreate(BaseModel):
     title: str = Field(...)
     projects_id: int = Field(...)
 
 class BoardUpdateTitle(BaseModel):
-    title: str = Field(..., description="Новое название доски")
\ No newline at end of file
+    title: str = Field(..., description="Новое название доски")
+
+class BoardArchivePolicy(BaseModel):
+    column_id: Optional[int] = Field(None, description="Колонка архивации (например, «Готово»); null — отключить архивацию")
+    after_days: int = Field(30, ge=1, le=3650, description="Через сколько дней в колонке задача архивируется")
+
+class ArchivedTaskOut(BaseModel):
+    id: int
+    title: Optional[str] = None
+    priority: Optional[str] = None
+    due_date: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    archived_at: datetime
+    column_id: int
+    column_title: Optional[str] = None
+
+class ColumnStatsOut(BaseModel):
+    column_id: int
+    tasks: int = 0
+    overdue: int = 0
+
+class AssigneeStatsOut(BaseModel):
+    user_id: int
+    tasks: int = 0  # Задачи доски, где пользователь среди исполнителей
+
+class BoardStatsOut(BaseModel):
+    board_id: int
+    tasks: int = 0
+    overdue: int = 0
+    columns: List[ColumnStatsOut] = Field(default_factory=list)
+    assignees: List[AssigneeStatsOut] = Field(default_factory=list)
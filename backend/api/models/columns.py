@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class ColumnTitleUpdate(BaseModel):
     title: str
@@ -6,4 +6,8 @@ class ColumnTitleUpdate(BaseModel):
 class ColumnCreate(BaseModel):
     title: str
     position: int
-    board_id: int
\ No newline at end of file
+    board_id: int
+
+class ColumnPosition(BaseModel):
+    id: int
+    position: int = Field(ge=0)
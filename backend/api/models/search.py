@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+class SearchHitOut(BaseModel):
+    """Результат поиска: задача или комментарий к ней"""
+    kind: Literal["task", "comment"]
+    id: int  # ID задачи или комментария (по kind)
+    task_id: int
+    task_title: Optional[str] = None
+    board_id: int
+    project_id: int
+    rank: float
+    archived: bool = False  # Задача (или задача комментария) в архиве доски
+    snippet: str = ""  # Фрагмент текста, совпадения обёрнуты в <mark>, остальное экранировано
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 
 class ColorOut(BaseModel):
@@ -28,6 +28,7 @@ class TaskOut(BaseModel):
     due_date: Optional[datetime] = None
     board_id: Optional[int] = None
     column_id: Optional[int] = None
+    rank: Optional[str] = None  # Ключ порядка внутри колонки
     created_at: Optional[datetime] = None
     labels: List[LabelOut] = Field(default_factory=list)
     assignee: Optional[AssigneeOut] = None  # Оставляем для обратной совместимости
@@ -105,6 +106,44 @@ class TaskUpdate(BaseModel):
     assigned_to_ids: Optional[List[int]] = None  # Новое поле для множественных исполнителей
     label_ids: Optional[List[int]] = None
 
+class TaskBatchItem(BaseModel):
+    """Частичное обновление одной задачи в пакетном запросе"""
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    priority: Optional[str] = None
+    due_date: Optional[datetime] = None
+    column_id: Optional[int] = None  # Задача встаёт в конец колонки
+    assigned_to: Optional[int] = None
+    assigned_to_ids: Optional[List[int]] = None
+    label_ids: Optional[List[int]] = None
+
+class TaskBatchResult(BaseModel):
+    id: int
+    status: Literal["ok", "not_found", "forbidden", "invalid"]
+    detail: Optional[str] = None
+
+class TaskImportError(BaseModel):
+    row: int  # Номер записи в файле, начиная с 1
+    detail: str
+
+class TaskImportOut(BaseModel):
+    imported: int
+    labels_created: int = 0
+    errors: List[TaskImportError] = Field(default_factory=list)  # Пропущенные строки
+    unknown_assignees: List[str] = Field(default_factory=list)  # Не найдены среди участников workspace
+
+class TaskMove(BaseModel):
+    """Перемещение задачи: целевая колонка и соседи в ней"""
+    column_id: Optional[int] = None  # По умолчанию — текущая колонка задачи
+    after_id: Optional[int] = None  # Задача, после которой встаёт карточка
+    before_id: Optional[int] = None  # Задача, перед которой встаёт карточка
+
+class TaskMoveOut(BaseModel):
+    id: int
+    column_id: int
+    rank: str
+
 class CommentCreate(BaseModel):
     content: str
 
@@ -17,6 +17,14 @@ class UserLogin(BaseModel): # Схема для входа пользовате
     email: EmailStr
     password: str
 
+class UserSearchOut(BaseModel): # Схема результата автодополнения пользователей
+    id: int
+    username: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    email: str | None = None
+    avatar_url: str | None = None
+
 class UserUpdate(BaseModel): # Схема для обновления профиля пользователя (без файлов)
     first_name: str | None = None
     last_name: str | None = None
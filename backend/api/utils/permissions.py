@@ -1,11 +1,58 @@
 """
-Утилиты для проверки прав доступа пользователей
+Утилиты для проверки прав доступа пользователей.
+Проверки на уровне проекта берут роли в workspace, доступы к проектам и
+принадлежность проектов из кэша в памяти процесса (core/acl_cache.py).
+Проверки задачи, колонки и доски — один запрос resolve_access.
 """
-from typing import Optional
+from typing import NamedTuple, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.dbstruct import UserWorkspace, UserProjectAccess
+from core import acl_cache
 from db.OrmQuery import OrmQuery
+from db.AsyncOrmQuery import AsyncOrmQuery
+
+
+def _workspace_role(user_id: int, workspace_id: int, db: Session) -> Optional[str]:
+    """
+    Роль пользователя в workspace в нижнем регистре (None — не участник), из кэша.
+    """
+    def load():
+        role = OrmQuery.get_user_workspace_role(user_id, workspace_id, session=db)
+        return role.lower() if role else None
+    return acl_cache.workspace_roles.get_or_load((user_id, workspace_id), load)
+
+
+def _project_workspace(project_id: int, db: Session) -> Optional[int]:
+    def load():
+        project = OrmQuery.get_project_by_id(project_id, session=db)
+        return project.workspaces_id if project else None
+    return acl_cache.project_workspaces.get_or_load(project_id, load)
+
+
+def _has_project_view_access(user_id: int, project_id: int, db: Session) -> bool:
+    return acl_cache.project_view_access.get_or_load(
+        (user_id, project_id), lambda: OrmQuery.has_project_view_access(user_id, project_id, session=db)
+    )
+
+
+def _role_if_visible(user_id: int, project_id: int, workspace_id: Optional[int], db: Session) -> Optional[str]:
+    """
+    Роль пользователя в workspace проекта, если он видит проект, иначе None.
+    Владелец workspace видит все проекты, остальным нужен UserProjectAccess.
+    """
+    if workspace_id is None:
+        return None
+    role = _workspace_role(user_id, workspace_id, db)
+    if not role:
+        return None
+    if role != "owner" and not _has_project_view_access(user_id, project_id, db):
+        return None
+    return role
+
+
+def _project_role(user_id: int, project_id: int, db: Session) -> Optional[str]:
+    return _role_if_visible(user_id, project_id, _project_workspace(project_id, db), db)
 
 
 def can_view_project(user_id: int, project_id: int, db: Session) -> bool:
@@ -13,31 +60,33 @@ def can_view_project(user_id: int, project_id: int, db: Session) -> bool:
     Проверяет, может ли пользователь просматривать проект.
     Владелец workspace имеет доступ ко всем проектам.
     """
-    project = OrmQuery.get_project_by_id(project_id)
-    if not project:
+    return _project_role(user_id, project_id, db) is not None
+
+
+async def can_view_project_async(user_id: int, project_id: int, db: AsyncSession) -> bool:
+    """
+    Асинхронный вариант can_view_project для async-эндпоинтов (тот же кэш).
+    """
+    async def load_workspace():
+        project = await AsyncOrmQuery.get_project_by_id(project_id, session=db)
+        return project.workspaces_id if project else None
+    workspace_id = await acl_cache.project_workspaces.aget_or_load(project_id, load_workspace)
+    if workspace_id is None:
         return False
-    
-    # Получаем роль пользователя в workspace
-    user_role = OrmQuery.get_user_workspace_role(user_id, project.workspaces_id)
+
+    async def load_role():
+        role = await AsyncOrmQuery.get_user_workspace_role(user_id, workspace_id, session=db)
+        return role.lower() if role else None
+    user_role = await acl_cache.workspace_roles.aget_or_load((user_id, workspace_id), load_role)
     if not user_role:
         return False
-    
-    # Владелец имеет доступ ко всем проектам
-    if user_role.lower() == "owner":
+
+    if user_role == "owner":
         return True
-    
-    # Проверяем доступ к проекту через UserProjectAccess
-    access = (
-        db.query(UserProjectAccess)
-        .filter(
-            UserProjectAccess.user_id == user_id,
-            UserProjectAccess.project_id == project_id,
-            UserProjectAccess.can_view == True
-        )
-        .first()
+
+    return await acl_cache.project_view_access.aget_or_load(
+        (user_id, project_id), lambda: AsyncOrmQuery.has_project_view_access(user_id, project_id, session=db)
     )
-    
-    return access is not None
 
 
 def can_edit_project(user_id: int, project_id: int, db: Session) -> bool:
@@ -45,15 +94,56 @@ def can_edit_project(user_id: int, project_id: int, db: Session) -> bool:
     Проверяет, может ли пользователь редактировать проект.
     Только владелец может редактировать проект.
     """
-    project = OrmQuery.get_project_by_id(project_id)
-    if not project:
+    workspace_id = _project_workspace(project_id, db)
+    if workspace_id is None:
         return False
-    
-    user_role = OrmQuery.get_user_workspace_role(user_id, project.workspaces_id)
-    if not user_role:
-        return False
-    
-    return user_role.lower() == "owner"
+    return _workspace_role(user_id, workspace_id, db) == "owner"
+
+
+class AccessInfo(NamedTuple):
+    """
+    Права пользователя в проекте задачи, колонки или доски (resolve_access).
+    role — роль в workspace в нижнем регистре, None — не участник;
+    can_view — видит проект; can_edit — может создавать, редактировать и удалять задачи.
+    """
+    project_id: int
+    workspace_id: int
+    role: Optional[str]
+    can_view: bool
+    can_edit: bool
+
+    @property
+    def can_comment(self) -> bool:
+        return self.can_view and self.role in ["commenter", "participant", "owner"]
+
+    @property
+    def is_owner(self) -> bool:
+        return self.role == "owner"
+
+
+def _access_info(row) -> Optional[AccessInfo]:
+    if row is None:
+        return None
+    role = row.role.lower() if row.role else None
+    # Владелец workspace видит все проекты, остальным нужен UserProjectAccess
+    can_view = role == "owner" or (role is not None and bool(row.has_project_access))
+    return AccessInfo(row.project_id, row.workspace_id, role, can_view, can_view and role in ["participant", "owner"])
+
+
+def resolve_access(user_id: int, db: Session, task_id: int | None = None, column_id: int | None = None, board_id: int | None = None) -> Optional[AccessInfo]:
+    """
+    Права пользователя на задачу, колонку или доску одним запросом с join по индексам
+    (без загрузки самой задачи и её связей). None — объект не найден.
+    Не кэшируется: задачу можно перенести в другой проект, а права читаются вместе с ней.
+    """
+    return _access_info(OrmQuery.resolve_access(user_id, task_id, column_id, board_id, session=db))
+
+
+async def resolve_access_async(user_id: int, db: AsyncSession, task_id: int | None = None, column_id: int | None = None, board_id: int | None = None) -> Optional[AccessInfo]:
+    """
+    Асинхронный вариант resolve_access для async-эндпоинтов.
+    """
+    return _access_info(await AsyncOrmQuery.resolve_access(user_id, task_id, column_id, board_id, session=db))
 
 
 def can_create_task(user_id: int, column_id: int, db: Session) -> bool:
@@ -61,31 +151,8 @@ def can_create_task(user_id: int, column_id: int, db: Session) -> bool:
     Проверяет, может ли пользователь создавать задачи.
     Участник (participant) и владелец (owner) могут создавать задачи.
     """
-    from db.dbstruct import Column, Board, Project
-    column_obj = db.query(Column).filter(Column.id == column_id).first()
-    if not column_obj:
-        return False
-    
-    board = db.query(Board).filter(Board.id == column_obj.board_id).first()
-    if not board:
-        return False
-    
-    project = db.query(Project).filter(Project.id == board.projects_id).first()
-    if not project:
-        return False
-    
-    # Проверяем доступ к проекту
-    if not can_view_project(user_id, project.id, db):
-        return False
-    
-    # Получаем роль
-    user_role = OrmQuery.get_user_workspace_role(user_id, project.workspaces_id)
-    if not user_role:
-        return False
-    
-    role_lower = user_role.lower()
-    # Участник и владелец могут создавать задачи
-    return role_lower in ["participant", "owner"]
+    access = resolve_access(user_id, db, column_id=column_id)
+    return access is not None and access.can_edit
 
 
 def can_edit_task(user_id: int, task_id: int, db: Session) -> bool:
@@ -93,34 +160,17 @@ def can_edit_task(user_id: int, task_id: int, db: Session) -> bool:
     Проверяет, может ли пользователь редактировать задачу.
     Участник (participant) и владелец (owner) могут редактировать задачи.
     """
-    task = OrmQuery.get_task_with_relations(task_id)
-    if not task:
-        return False
-    
-    column = getattr(task, "column", None)
-    if not column:
-        return False
-    
-    board = getattr(column, "board", None)
-    if not board:
-        return False
-    
-    project = getattr(board, "project", None)
-    if not project:
-        return False
-    
-    # Проверяем доступ к проекту
-    if not can_view_project(user_id, project.id, db):
-        return False
-    
-    # Получаем роль
-    user_role = OrmQuery.get_user_workspace_role(user_id, project.workspaces_id)
-    if not user_role:
-        return False
-    
-    role_lower = user_role.lower()
-    # Участник и владелец могут редактировать задачи
-    return role_lower in ["participant", "owner"]
+    access = resolve_access(user_id, db, task_id=task_id)
+    return access is not None and access.can_edit
+
+
+def can_edit_project_tasks(user_id: int, project_id: int, db: Session) -> bool:
+    """
+    Проверяет, может ли пользователь редактировать задачи проекта.
+    То же правило, что в can_edit_task, но без загрузки самой задачи:
+    пакетные операции проверяют права один раз на проект.
+    """
+    return _project_role(user_id, project_id, db) in ["participant", "owner"]
 
 
 def can_delete_task(user_id: int, task_id: int, db: Session) -> bool:
@@ -136,34 +186,8 @@ def can_comment_task(user_id: int, task_id: int, db: Session) -> bool:
     Проверяет, может ли пользователь комментировать задачу.
     Комментатор (commenter), участник (participant) и владелец (owner) могут комментировать.
     """
-    task = OrmQuery.get_task_with_relations(task_id)
-    if not task:
-        return False
-    
-    column = getattr(task, "column", None)
-    if not column:
-        return False
-    
-    board = getattr(column, "board", None)
-    if not board:
-        return False
-    
-    project = getattr(board, "project", None)
-    if not project:
-        return False
-    
-    # Проверяем доступ к проекту
-    if not can_view_project(user_id, project.id, db):
-        return False
-    
-    # Получаем роль
-    user_role = OrmQuery.get_user_workspace_role(user_id, project.workspaces_id)
-    if not user_role:
-        return False
-    
-    role_lower = user_role.lower()
-    # Комментатор, участник и владелец могут комментировать
-    return role_lower in ["commenter", "participant", "owner"]
+    access = resolve_access(user_id, db, task_id=task_id)
+    return access is not None and access.can_comment
 
 
 def get_user_accessible_projects(user_id: int, workspace_id: int, db: Session) -> list:
@@ -174,16 +198,16 @@ def get_user_accessible_projects(user_id: int, workspace_id: int, db: Session) -
     from db.dbstruct import Project
     
     # Получаем роль пользователя
-    user_role = OrmQuery.get_user_workspace_role(user_id, workspace_id)
+    user_role = OrmQuery.get_user_workspace_role(user_id, workspace_id, session=db)
     if not user_role:
         return []
     
     # Владелец получает все проекты
     if user_role.lower() == "owner":
-        return OrmQuery.get_projects_by_workspace_id(workspace_id) or []
+        return OrmQuery.get_projects_by_workspace_id(workspace_id, session=db) or []
     
     # Для остальных получаем проекты с доступом
-    accessible_project_ids = OrmQuery.get_user_project_accesses(user_id, workspace_id)
+    accessible_project_ids = OrmQuery.get_user_project_accesses(user_id, workspace_id, session=db)
     if not accessible_project_ids:
         return []
     
@@ -0,0 +1,150 @@
+"""
+Пропускная способность GET /api/boards/{id}/columns: синхронный эндпоинт
+(def в threadpool Starlette, синхронный движок) против боевого асинхронного
+(async def в event loop, psycopg async).
+
+Синхронный вариант регистрируется в том же приложении рядом с боевым: те же
+middleware, проверка доступа и проекции из db/queries.py, отличается только
+модель исполнения. Кэш готового ответа (core/board_cache.py) отключён для
+обоих, иначе замер покажет кэш, а не работу с БД; журнал запросов тоже
+выключен. Нагрузку даёт httpx через
+ASGI-транспорт в том же процессе: concurrency клиентов шлют запросы друг
+за другом, пока не наберётся --requests ответов. Запуск из каталога backend:
+
+    BENCH_DB_NAME=kanban_bench python -m benchmarks.board_columns_sync_vs_async --tasks 200 --concurrency 10 100 500
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import common
+
+import httpx
+from fastapi import Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+
+from api.utils.permissions import can_view_project
+from core import board_cache
+from core.logger import logger
+from core.security import get_current_user
+from db import queries
+from db.database import get_db, async_engine
+from main import app
+
+SYNC_PATH = "/bench/sync/boards/{board_id}/columns"
+ASYNC_PATH = "/api/boards/{board_id}/columns"
+
+
+def board_view(header, db: Session) -> dict:
+    """
+    Синхронная копия AsyncOrmQuery.get_board_view.
+    """
+    board_id = header.id
+    labels: dict[int, list] = {}
+    for task_id, label_id, name, color in db.execute(queries.board_task_labels_stmt(board_id)):
+        labels.setdefault(task_id, []).append({"id": label_id, "name": name, "color": color})
+
+    assignees: dict[int, list] = {}
+    for task_id, *user in db.execute(queries.board_task_assignees_stmt(board_id)):
+        assignees.setdefault(task_id, []).append(dict(zip(queries.USER_FIELDS, user)))
+
+    tasks: dict[int, list] = {}
+    for row in db.execute(queries.board_tasks_stmt(board_id)):
+        (task_id, title, description, priority, due_date, column_id, rank, created_at, *assignee) = row
+        tasks.setdefault(column_id, []).append({
+            "id": task_id,
+            "title": title,
+            "description": description,
+            "priority": priority,
+            "due_date": due_date,
+            "board_id": board_id,
+            "column_id": column_id,
+            "rank": rank,
+            "created_at": created_at,
+            "labels": labels.get(task_id, []),
+            "assignee": dict(zip(queries.USER_FIELDS, assignee)) if assignee[0] is not None else None,
+            "assignees": assignees.get(task_id, []),
+        })
+
+    columns = [
+        {
+            "id": column_id,
+            "title": title,
+            "board_id": column_board_id,
+            "color": {"id": color_id, "name": color_name, "hex_code": hex_code} if color_id is not None else None,
+            "tasks": tasks.get(column_id, []),
+        }
+        for column_id, title, column_board_id, color_id, color_name, hex_code
+        in db.execute(queries.board_columns_stmt(board_id))
+    ]
+    return {
+        "board_id": board_id,
+        "board_title": header.title,
+        "project": {"id": header.project_id, "title": header.project_title, "workspaces_id": header.workspaces_id},
+        "columns": columns,
+    }
+
+
+def sync_board_columns(board_id: int, current_user=Depends(get_current_user), db: Session = Depends(get_db)):
+    header = db.execute(queries.board_header_stmt(board_id)).first()
+    if not header:
+        raise HTTPException(status_code=404, detail="Доска не найдена")
+    if not can_view_project(current_user.id, header.project_id, db):
+        raise HTTPException(status_code=403, detail="Нет доступа к проекту")
+    return ORJSONResponse(board_view(header, db))
+
+
+async def run_load(url: str, headers: dict, concurrency: int, requests: int) -> tuple[float, list[float]]:
+    """
+    Возвращает (ответов в секунду, задержки запросов в секундах).
+    """
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            for _ in remaining:
+                started = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    # Соединения async-пула привязаны к event loop прогона
+    await async_engine.dispose()
+    return len(latencies) / elapsed, latencies
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Синхронный и асинхронный GET /api/boards/{id}/columns под нагрузкой")
+    parser.add_argument("--tasks", type=int, default=200, help="Задач на синтетической доске")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 500], help="Числа параллельных клиентов")
+    parser.add_argument("--requests", type=int, default=2000, help="Запросов на один прогон")
+    args = parser.parse_args(argv)
+
+    app.add_api_route(SYNC_PATH, sync_board_columns, methods=["GET"])
+    board_cache.put_payload = lambda board_id, version, body: None
+    # Журнал каждого запроса (middleware в main.py) иначе сам становится узким местом
+    logger.remove()
+
+    board = common.create_board(args.tasks)
+    try:
+        headers = common.auth_headers(board.owner_id)
+        print(f"Доска {board.board_id}: {args.tasks} задач, {args.requests} запросов на прогон")
+        print(f"{'клиентов':>8} | {'вариант':<6} | {'отв/с':>8} | задержка")
+        for concurrency in args.concurrency:
+            for name, path in (("sync", SYNC_PATH), ("async", ASYNC_PATH)):
+                url = path.format(board_id=board.board_id)
+                asyncio.run(run_load(url, headers, min(concurrency, 10), 50))  # прогрев пулов и кэша прав
+                rps, latencies = asyncio.run(run_load(url, headers, concurrency, args.requests))
+                print(f"{concurrency:>8} | {name:<6} | {rps:>8.1f} | {common.describe(latencies)}")
+    finally:
+        common.drop_board(board)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
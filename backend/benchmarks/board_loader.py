@@ -0,0 +1,113 @@
+"""
+Регрессионный замер загрузчика доски OrmQuery.get_columns_with_tasks_by_board_id
+на синтетических досках из 100, 1 000 и 10 000 задач (по 3 метки и 3 исполнителя).
+
+Сравниваются текущий запрос (коллекции через selectinload, db/queries.py)
+и прежняя цепочка joinedload, которая возвращала строку на каждое сочетание
+колонка × задача × исполнитель × метка. Для каждого варианта печатаются
+число запросов, число строк, полученных из БД, и время загрузки. Число строк
+текущего загрузчика должно расти линейно с числом задач. Запуск из каталога backend:
+
+    BENCH_DB_NAME=kanban_bench python -m benchmarks.board_loader --tasks 100 1000 10000
+"""
+import argparse
+import time
+
+from benchmarks import common
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import joinedload
+
+from db import queries
+from db.database import engine, session_factory
+from db.dbstruct import Board, Column, Task, TaskAssignee
+
+
+def joined_columns_with_tasks_stmt(board_id: int):
+    """
+    Прежний загрузчик: все коллекции задач через joinedload, одним декартовым запросом.
+    """
+    tasks = joinedload(Column.tasks.and_(Task.archived_at.is_(None)))
+    return (
+        select(Column)
+        .where(Column.board_id == board_id)
+        .options(
+            tasks.joinedload(Task.assignee),
+            tasks.joinedload(Task.assignee_links).joinedload(TaskAssignee.user),
+            tasks.joinedload(Task.labels),
+            joinedload(Column.board).joinedload(Board.project),
+            joinedload(Column.color),
+        )
+        .order_by(Column.position.asc())
+    )
+
+
+LOADERS = {
+    "selectinload": queries.columns_with_tasks_stmt,
+    "joinedload": joined_columns_with_tasks_stmt,
+}
+
+
+class FetchCounter:
+    """
+    Число запросов и строк, которые вернула БД (по rowcount курсора).
+    """
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        self.rows += max(cursor.rowcount, 0)
+
+
+def load(stmt) -> tuple[int, float, FetchCounter]:
+    """
+    Загружает доску и обходит все связи, как это делает сериализация ответа.
+    Возвращает (число задач, время в секундах, счётчик запросов и строк).
+    """
+    counter = FetchCounter()
+    event.listen(engine, "after_cursor_execute", counter)
+    try:
+        started = time.perf_counter()
+        with session_factory() as session:
+            columns = session.execute(stmt).unique().scalars().all()
+            tasks = 0
+            for column in columns:
+                column.board.project, column.color
+                for task in column.tasks:
+                    task.assignee, task.labels, [link.user for link in task.assignee_links]
+                    tasks += 1
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine, "after_cursor_execute", counter)
+    return tasks, elapsed, counter
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Время и объём загрузки доски разными стратегиями подгрузки связей")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1000, 10000], help="Размеры синтетических досок")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов загрузки на каждый вариант")
+    args = parser.parse_args(argv)
+
+    print(f"{'задач':>6} | {'загрузчик':<12} | {'запросов':>8} | {'строк':>8} | время")
+    for size in args.tasks:
+        board = common.create_board(size)
+        try:
+            for name, build in LOADERS.items():
+                stmt = build(board.board_id)
+                load(stmt)  # прогрев соединения и кэша компиляции запроса
+                samples, counter = [], None
+                for _ in range(args.repeat):
+                    tasks, elapsed, counter = load(stmt)
+                    assert tasks == size, f"{name}: загружено {tasks} задач из {size}"
+                    samples.append(elapsed)
+                print(f"{size:>6} | {name:<12} | {counter.statements:>8} | {counter.rows:>8} | {common.describe(samples)}")
+        finally:
+            common.drop_board(board)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
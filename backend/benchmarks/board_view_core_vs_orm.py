@@ -0,0 +1,145 @@
+"""
+Представление доски (тело GET /api/boards/{id}/columns): Core-проекции против ORM.
+
+core — текущий путь: AsyncOrmQuery.get_board_view читает четыре плоские
+проекции и собирает dict, ответ сериализует orjson. orm — прежний путь:
+AsyncOrmQuery.get_columns_with_tasks_by_board_id поднимает объекты Column,
+Task, User, Label и ColorPalette, эндпоинт копирует их в dict через getattr,
+а FastAPI валидирует результат по BoardTasksOut и сериализует json.
+Для каждого варианта печатаются время на запрос, процессорное время Python
+(без работы сервера PostgreSQL) и пик выделенной памяти по tracemalloc.
+Запуск из каталога backend:
+
+    BENCH_DB_NAME=kanban_bench python -m benchmarks.board_view_core_vs_orm --tasks 100 1000 5000
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from benchmarks import common
+
+import orjson
+
+from api.models.tasks import BoardTasksOut
+from db.AsyncOrmQuery import AsyncOrmQuery
+from db.database import async_engine
+
+
+def _user(user) -> dict | None:
+    if user is None:
+        return None
+    return {
+        "id": user.id,
+        "first_name": getattr(user, "first_name", None),
+        "last_name": getattr(user, "last_name", None),
+        "username": getattr(user, "username", None),
+        "email": getattr(user, "email", None),
+        "avatar_url": getattr(user, "avatar_url", None),
+    }
+
+
+def orm_payload(columns) -> dict:
+    """
+    Сборка ответа из ORM-объектов, как в эндпоинте до перехода на проекции.
+    """
+    board = getattr(columns[0], "board", None)
+    project = getattr(board, "project", None)
+    return {
+        "board_id": board.id,
+        "board_title": getattr(board, "title", None),
+        "project": {"id": project.id, "title": getattr(project, "title", None), "workspaces_id": getattr(project, "workspaces_id", None)},
+        "columns": [
+            {
+                "id": column.id,
+                "title": getattr(column, "title", None),
+                "board_id": getattr(column, "board_id", None),
+                "color": {"id": column.color.id, "name": column.color.name, "hex_code": column.color.hex_code} if column.color else None,
+                "tasks": [
+                    {
+                        "id": task.id,
+                        "title": getattr(task, "title", None),
+                        "description": getattr(task, "description", None),
+                        "priority": getattr(task, "priority", None),
+                        "due_date": getattr(task, "due_date", None),
+                        "board_id": getattr(task, "board_id", None),
+                        "column_id": getattr(task, "column_id", None),
+                        "rank": getattr(task, "rank", None),
+                        "created_at": getattr(task, "created_at", None),
+                        "labels": [
+                            {"id": label.id, "name": getattr(label, "name", None), "color": getattr(label, "color", None)}
+                            for label in getattr(task, "labels", []) or []
+                        ],
+                        "assignee": _user(getattr(task, "assignee", None)),
+                        "assignees": [
+                            _user(link.user) for link in getattr(task, "assignee_links", []) or []
+                            if getattr(link, "user", None) is not None
+                        ],
+                    }
+                    for task in getattr(column, "tasks", []) or []
+                ],
+            }
+            for column in columns
+        ],
+    }
+
+
+async def core_body(board_id: int) -> bytes:
+    header = await AsyncOrmQuery.get_board_header(board_id)
+    return orjson.dumps(await AsyncOrmQuery.get_board_view(header))
+
+
+async def orm_body(board_id: int) -> bytes:
+    columns = await AsyncOrmQuery.get_columns_with_tasks_by_board_id(board_id)
+    payload = BoardTasksOut.model_validate(orm_payload(columns)).model_dump(mode="json")
+    return json.dumps(payload, ensure_ascii=False).encode()
+
+
+VARIANTS = {"core": core_body, "orm": orm_body}
+
+
+async def measure(body, board_id: int, repeat: int) -> tuple[list[float], list[float], int]:
+    """
+    Возвращает (время на запрос, процессорное время на запрос, пик памяти в байтах).
+    """
+    await body(board_id)  # прогрев соединений и кэша компиляции запросов
+    wall, cpu = [], []
+    for _ in range(repeat):
+        started, started_cpu = time.perf_counter(), time.process_time()
+        await body(board_id)
+        wall.append(time.perf_counter() - started)
+        cpu.append(time.process_time() - started_cpu)
+
+    tracemalloc.start()
+    try:
+        await body(board_id)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Соединения async-пула привязаны к event loop прогона
+    await async_engine.dispose()
+    return wall, cpu, peak
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Время, CPU и память сборки представления доски: Core против ORM")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1000, 5000], help="Размеры синтетических досок")
+    parser.add_argument("--repeat", type=int, default=10, help="Повторов на каждый вариант")
+    args = parser.parse_args(argv)
+
+    print(f"{'задач':>6} | {'путь':<4} | {'время':<32} | {'CPU p50':>9} | пик памяти")
+    for size in args.tasks:
+        board = common.create_board(size)
+        try:
+            for name, body in VARIANTS.items():
+                wall, cpu, peak = asyncio.run(measure(body, board.board_id, args.repeat))
+                cpu_p50 = common.percentile(cpu, 0.5) * 1000
+                print(f"{size:>6} | {name:<4} | {common.describe(wall):<32} | {cpu_p50:>6.1f} мс | {peak / 2**20:7.1f} МБ")
+        finally:
+            common.drop_board(board)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
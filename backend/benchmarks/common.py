@@ -0,0 +1,138 @@
+"""
+Общая часть замеров производительности: синтетические доски в отдельной базе.
+
+Замеры пишут данные, поэтому работают только с базой BENCH_DB_NAME, схема
+которой доведена миграциями до head (alembic upgrade head). Каждая доска
+создаётся перед замером и удаляется после. Остальные параметры подключения
+(DB_HOST, DB_PORT, DB_USER, DB_PASS) берутся из окружения или .env, как у
+приложения. Модуль импортируется раньше модулей приложения: он подменяет
+DB_NAME до чтения настроек. Запуск из каталога backend:
+
+    BENCH_DB_NAME=kanban_bench python -m benchmarks.<замер>
+"""
+import os
+import statistics
+import sys
+import uuid
+from dataclasses import dataclass
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME")
+if not BENCH_DB_NAME:
+    sys.exit("BENCH_DB_NAME не задан: замерам нужна отдельная база PostgreSQL со схемой на head")
+os.environ["DB_NAME"] = BENCH_DB_NAME
+# Реплики и фоновая архивация в замерах не участвуют
+os.environ["DB_REPLICA_URLS"] = ""
+os.environ["ARCHIVE_INTERVAL_SECONDS"] = "0"
+
+from sqlalchemy import text
+
+from core.security import create_access_token
+from db.database import engine
+
+
+@dataclass
+class SyntheticBoard:
+    owner_id: int
+    user_ids: list[int]
+    workspace_id: int
+    project_id: int
+    board_id: int
+    tasks: int
+
+
+def create_board(tasks: int, columns: int = 4, labels_per_task: int = 3, assignees_per_task: int = 3) -> SyntheticBoard:
+    """
+    Создаёт владельца с рабочим пространством, проект и доску с columns колонками
+    и tasks задачами, равномерно разложенными по колонкам. У каждой задачи
+    labels_per_task меток и assignees_per_task исполнителей (один из них — основной).
+    """
+    tag = uuid.uuid4().hex[:8]
+    users = max(assignees_per_task, 1) * 2
+    labels = max(labels_per_task, 1) * 2
+    with engine.begin() as connection:
+        user_ids = connection.execute(text(
+            "INSERT INTO users (username, email, first_name, last_name, password) "
+            "SELECT 'bench_' || :tag || '_' || g, 'bench_' || :tag || '_' || g || '@example.com', "
+            "'Bench', 'User ' || g, 'x' FROM generate_series(1, :users) g ORDER BY g RETURNING id"
+        ), {"tag": tag, "users": users}).scalars().all()
+        owner_id = user_ids[0]
+        workspace_id = connection.execute(text(
+            "INSERT INTO workspaces (name) VALUES ('bench ' || :tag) RETURNING id"
+        ), {"tag": tag}).scalar_one()
+        connection.execute(text(
+            "INSERT INTO user_workspaces (user_id, workspace_id, role) "
+            "SELECT id, :workspace_id, CASE WHEN id = :owner_id THEN 'owner' ELSE 'participant' END "
+            "FROM unnest(CAST(:user_ids AS integer[])) AS id"
+        ), {"workspace_id": workspace_id, "owner_id": owner_id, "user_ids": user_ids})
+        project_id = connection.execute(text(
+            "INSERT INTO projects (title, workspaces_id) VALUES ('Bench', :workspace_id) RETURNING id"
+        ), {"workspace_id": workspace_id}).scalar_one()
+        board_id = connection.execute(text(
+            "INSERT INTO boards (title, projects_id) VALUES ('Bench ' || :tasks, :project_id) RETURNING id"
+        ), {"tasks": tasks, "project_id": project_id}).scalar_one()
+        column_ids = connection.execute(text(
+            "INSERT INTO columns (title, position, board_id, color_id) "
+            "SELECT 'Колонка ' || g, g - 1, :board_id, 1 FROM generate_series(1, :columns) g ORDER BY g RETURNING id"
+        ), {"board_id": board_id, "columns": columns}).scalars().all()
+        label_ids = connection.execute(text(
+            "INSERT INTO labels (name, color, workspace_id) "
+            "SELECT 'Метка ' || g, '#4A90E2', :workspace_id FROM generate_series(1, :labels) g ORDER BY g RETURNING id"
+        ), {"workspace_id": workspace_id, "labels": labels}).scalars().all()
+
+        connection.execute(text(
+            "INSERT INTO tasks (title, description, column_id, board_id, project_id, workspace_id, rank, "
+            "                   assigned_to, created_by, priority, due_date) "
+            "SELECT 'Задача ' || g, 'Описание синтетической задачи ' || g, "
+            "       (CAST(:column_ids AS integer[]))[(g - 1) % :columns + 1], :board_id, :project_id, :workspace_id, "
+            "       lpad(to_hex(g), 8, '0'), (CAST(:user_ids AS integer[]))[(g - 1) % :users + 1], :owner_id, "
+            "       (ARRAY['low', 'medium', 'high'])[g % 3 + 1], now() + (g % 60) * interval '1 day' "
+            "FROM generate_series(1, :tasks) g"
+        ), {
+            "column_ids": column_ids, "columns": columns, "board_id": board_id, "project_id": project_id,
+            "workspace_id": workspace_id, "user_ids": user_ids, "users": users, "owner_id": owner_id, "tasks": tasks,
+        })
+        connection.execute(text(
+            "INSERT INTO task_assignees (task_id, user_id) "
+            "SELECT t.id, (CAST(:user_ids AS integer[]))[(t.id + k) % :users + 1] "
+            "FROM tasks t CROSS JOIN generate_series(0, :per_task - 1) k WHERE t.board_id = :board_id"
+        ), {"user_ids": user_ids, "users": users, "per_task": assignees_per_task, "board_id": board_id})
+        connection.execute(text(
+            "INSERT INTO task_labels (task_id, label_id) "
+            "SELECT t.id, (CAST(:label_ids AS integer[]))[(t.id + k) % :labels + 1] "
+            "FROM tasks t CROSS JOIN generate_series(0, :per_task - 1) k WHERE t.board_id = :board_id"
+        ), {"label_ids": label_ids, "labels": labels, "per_task": labels_per_task, "board_id": board_id})
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for table in ("tasks", "task_assignees", "task_labels"):
+            connection.execute(text(f"ANALYZE {table}"))
+
+    return SyntheticBoard(owner_id, user_ids, workspace_id, project_id, board_id, tasks)
+
+
+def drop_board(board: SyntheticBoard) -> None:
+    """
+    Удаляет всё, что создал create_board.
+    """
+    with engine.begin() as connection:
+        # Проект удаляет каскадом доску, колонки, задачи, их связи и счётчики
+        connection.execute(text("DELETE FROM projects WHERE id = :id"), {"id": board.project_id})
+        connection.execute(text("DELETE FROM labels WHERE workspace_id = :id"), {"id": board.workspace_id})
+        connection.execute(text("DELETE FROM user_workspaces WHERE workspace_id = :id"), {"id": board.workspace_id})
+        connection.execute(text("DELETE FROM workspaces WHERE id = :id"), {"id": board.workspace_id})
+        connection.execute(text("DELETE FROM users WHERE id = ANY(:ids)"), {"ids": board.user_ids})
+
+
+def auth_headers(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': str(user_id)})}"}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def describe(samples: list[float]) -> str:
+    """
+    Медиана и 95-й перцентиль выборки в миллисекундах.
+    """
+    return f"p50 {statistics.median(samples) * 1000:8.1f} мс, p95 {percentile(samples, 0.95) * 1000:8.1f} мс"
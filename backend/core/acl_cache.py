@@ -0,0 +1,39 @@
+"""
+Кэш данных для проверок прав (api/utils/permissions.py).
+Записи читаются через TTLCache.get_or_load; при изменении членства или
+доступов к проектам код, который их меняет, вызывает invalidate_* после commit.
+"""
+from core.cache import TTLCache
+from core.config import settings
+
+# (user_id, workspace_id) -> роль в workspace в нижнем регистре или None (не участник)
+workspace_roles = TTLCache(settings.ACL_CACHE_MAX_ENTRIES, settings.ACL_CACHE_TTL_SECONDS)
+# (user_id, project_id) -> есть ли UserProjectAccess с правом просмотра
+project_view_access = TTLCache(settings.ACL_CACHE_MAX_ENTRIES, settings.ACL_CACHE_TTL_SECONDS)
+# project_id -> workspace_id или None (проекта нет); проект не переносится между workspace
+project_workspaces = TTLCache(settings.ACL_CACHE_MAX_ENTRIES, settings.ACL_CACHE_TTL_SECONDS)
+
+
+def invalidate_membership(user_id: int, workspace_id: int) -> None:
+    '''
+    Роль пользователя в workspace изменилась: вступил, удалён или сменил роль.
+    '''
+    workspace_roles.pop((user_id, workspace_id))
+
+
+def invalidate_project_access(user_id: int, project_id: int | None = None) -> None:
+    '''
+    Изменились доступы пользователя к проекту (или ко всем проектам, если project_id не указан).
+    '''
+    if project_id is None:
+        project_view_access.discard_where(lambda key: key[0] == user_id)
+    else:
+        project_view_access.pop((user_id, project_id))
+
+
+def invalidate_project(project_id: int) -> None:
+    '''
+    Проект удалён: забываем его workspace и доступы к нему.
+    '''
+    project_workspaces.pop(project_id)
+    project_view_access.discard_where(lambda key: key[1] == project_id)
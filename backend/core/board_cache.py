@@ -0,0 +1,29 @@
+"""
+Кэш готового JSON представления доски (GET /api/boards/{id}/columns) в памяти процесса.
+board_id -> (version, тело ответа). Тело годится, пока не изменилась версия доски
+(boards.version растёт при каждой правке, см. OrmQuery.bump_board_versions),
+поэтому явная инвалидация не нужна: устаревшая запись просто не совпадёт по версии.
+Представление одинаково для всех, кто видит проект, — права проверяются до кэша.
+Размер ограничен суммой тел (BOARD_CACHE_MAX_BYTES), вытесняются давно не читанные доски.
+"""
+from core.cache import MISSING, TTLCache
+from core.config import settings
+
+# Предел числа досок на случай множества крошечных; основное ограничение — по байтам
+MAX_BOARDS = 100_000
+
+board_payloads = TTLCache(
+    MAX_BOARDS,
+    settings.BOARD_CACHE_TTL_SECONDS,
+    max_bytes=settings.BOARD_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(entry[1]),
+)
+
+
+def get_payload(board_id: int, version: int) -> bytes | None:
+    entry = board_payloads.get(board_id, valid=lambda entry: entry[0] == version)
+    return None if entry is MISSING else entry[1]
+
+
+def put_payload(board_id: int, version: int, body: bytes) -> None:
+    board_payloads.set(board_id, (version, body))
@@ -0,0 +1,115 @@
+"""
+Кэши в памяти процесса.
+TTLCache — словарь с ограниченным числом записей и, по желанию, суммарным
+размером значений (вытесняется то, что дольше всех не читали, LRU) и временем
+жизни записи (TTL). Потокобезопасен:
+синхронные эндпоинты выполняются в threadpool Starlette.
+Каждый процесс uvicorn держит свой кэш, поэтому изменения из другого
+процесса становятся видны не позже чем через TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+# Признак промаха: None — допустимое закэшированное значение
+MISSING = object()
+
+
+class TTLCache:
+    '''
+    LRU-кэш с TTL и счётчиком поколений для безопасной инвалидации.
+    Значение, прочитанное из БД до инвалидации, не попадёт в кэш после неё:
+    get_or_load запоминает поколение до загрузки и не сохраняет результат,
+    если за это время что-то инвалидировали.
+    '''
+
+    def __init__(self, max_entries: int, ttl_seconds: float, max_bytes: int | None = None, sizeof: Callable[[Any], int] = len):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # max_bytes — предел суммы sizeof(value) по всем записям (None — без предела)
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def get(self, key: Hashable, valid: Callable[[Any], bool] | None = None) -> Any:
+        '''
+        Значение по ключу или MISSING. valid — проверка значения (например, версии):
+        не прошедшее её значение считается промахом и заменяется вызывающим через set.
+        '''
+        with self._lock:
+            entry = self._data.get(key)
+            expired = entry is not None and entry[0] < time.monotonic()
+            if entry is None or expired or (valid is not None and not valid(entry[1])):
+                if expired:
+                    self._remove(key)
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        generation = self.generation
+        value = self.get(key)
+        if value is MISSING:
+            value = loader()
+            self.set(key, value, generation)
+        return value
+
+    async def aget_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self.generation
+        value = self.get(key)
+        if value is MISSING:
+            value = await loader()
+            self.set(key, value, generation)
+        return value
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self.generation += 1
+            self._remove(key)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        '''
+        Удаляет записи, ключ которых удовлетворяет predicate (полный проход по кэшу).
+        '''
+        with self._lock:
+            self.generation += 1
+            for key in [key for key in self._data if predicate(key)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        stats = {"entries": len(self._data), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+        if self.max_bytes is not None:
+            stats.update(bytes=self._bytes, max_bytes=self.max_bytes)
+        return stats
@@ -12,6 +12,35 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     SALT: str
     FRONTEND_URL: str = "http://localhost:3000"
+
+    # Пул соединений с БД (отдельный в каждом процессе uvicorn)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1  # секунды, -1 — не пересоздавать соединения
+    DB_POOL_PRE_PING: bool = False
+
+    # Реплики для чтения: SQLAlchemy URL через запятую (пусто — всё читается с primary)
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_MAX_LAG_SECONDS: float = 10
+    DB_REPLICA_LAG_CHECK_SECONDS: float = 5
+    DB_READ_YOUR_WRITES_SECONDS: float = 15  # после своей записи пользователь читает с primary
+
+    # Кэш данных для проверок прав в памяти процесса (роли, доступы к проектам)
+    ACL_CACHE_TTL_SECONDS: float = 30  # столько другие процессы могут видеть старые права
+    ACL_CACHE_MAX_ENTRIES: int = 100_000
+    # Кэш пользователей по subject токена (get_current_user)
+    USER_CACHE_TTL_SECONDS: float = 60
+    USER_CACHE_MAX_ENTRIES: int = 10_000
+    # Кэш готового JSON досок по версии: предел суммы тел в байтах на процесс
+    BOARD_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    BOARD_CACHE_TTL_SECONDS: float = 600
+
+    # Токен служебных метрик /api/metrics/* (заголовок X-Metrics-Token); пусто — метрики выключены
+    METRICS_TOKEN: str = ""
+
+    # Как часто процесс запускает архивацию задач по политикам досок (0 — не запускать)
+    ARCHIVE_INTERVAL_SECONDS: int = 3600
     
     # Ollama настройки
     OLLAMA_BASE_URL: str = "http://localhost:11434"
@@ -20,6 +49,20 @@ class Settings(BaseSettings):
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+psycopg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    @property
+    def DB_REPLICA_URL_LIST(self) -> list[str]:
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
+    @property
+    def DB_POOL_OPTIONS(self) -> dict:
+        return {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+        }
     
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -0,0 +1,25 @@
+"""
+Условные GET-запросы: ETag в ответе и If-None-Match в запросе.
+Клиент присылает полученный ETag, и если данные не менялись, сервер
+отвечает 304 Not Modified без тела.
+"""
+
+# Браузер хранит ответ, но перед каждым использованием сверяет ETag с сервером
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def board_etag(board_id: int, version: int) -> str:
+    # Сильный ETag: одна версия доски — одно и то же представление
+    return f'"board-{board_id}-v{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    '''
+    Совпадает ли ETag с заголовком If-None-Match (список через запятую или "*").
+    Для If-None-Match сравнение слабое: W/"x" совпадает с "x".
+    '''
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
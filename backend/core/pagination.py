@@ -0,0 +1,65 @@
+"""
+Курсоры для keyset-пагинации.
+Курсор — непрозрачная для клиента строка: base64 от JSON со значениями
+ключа сортировки последней отданной строки, например [created_at, id].
+"""
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Any, List, Sequence
+
+# Заголовок ответа с курсором следующей страницы (нет заголовка — страниц больше нет)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Границы bigint: большее целое из курсора упало бы в SQL, а не на разборе
+PG_BIGINT_MIN = -2 ** 63
+PG_BIGINT_MAX = 2 ** 63 - 1
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_value(value: Any, kind: type) -> Any:
+    if kind is datetime:
+        if not isinstance(value, dict) or set(value) != {"dt"} or not isinstance(value["dt"], str):
+            raise ValueError("Ожидалась дата")
+        return datetime.fromisoformat(value["dt"])
+    # bool — подкласс int, в курсоре ему не место
+    if isinstance(value, bool):
+        raise ValueError("Неожиданный bool")
+    if kind is int:
+        if not isinstance(value, int) or not PG_BIGINT_MIN <= value <= PG_BIGINT_MAX:
+            raise ValueError("Ожидалось целое")
+        return value
+    if kind is float:
+        if not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError("Ожидалось число")
+        return float(value)
+    if not isinstance(value, kind):
+        raise ValueError(f"Ожидался {kind.__name__}")
+    return value
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    '''
+    Декодирует курсор со значениями типов types (datetime, int, float, str) по порядку.
+    ValueError — если курсор испорчен или не совпадает по длине и типам.
+    '''
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("Неверная длина курсора")
+        return [_decode_value(value, kind) for value, kind in zip(payload, types)]
+    except (TypeError, KeyError, ValueError) as e:  # ValueError включает ошибки base64/JSON
+        raise ValueError("Некорректный курсор") from e
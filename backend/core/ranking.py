@@ -0,0 +1,105 @@
+"""
+Дробные (лексикографические) ключи порядка задач в колонке.
+Ключ — строка из цифр base62, которая читается как дробь 0.xxx.
+Между любыми двумя ключами всегда найдётся третий, поэтому перенос
+карточки меняет ровно одну строку. Строки сравниваются побайтно
+(COLLATE "C" в Postgres), алфавит упорядочен по ASCII.
+"""
+from typing import Optional, List
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Если ключ стал длиннее, колонку пора перенумеровать в фоне
+REBALANCE_KEY_LENGTH = 24
+
+
+def _digit(char: str) -> int:
+    index = DIGITS.find(char)
+    if index < 0:
+        raise ValueError(f"Недопустимый символ в ключе: {char!r}")
+    return index
+
+
+def _validate(key: str) -> None:
+    if not key or key.endswith(DIGITS[0]):
+        raise ValueError(f"Некорректный ключ: {key!r}")
+    for char in key:
+        _digit(char)
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    # a < b; a может быть пустой строкой (0), b=None — верхняя граница (1)
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = _digit(a[0]) if a else 0
+    digit_b = _digit(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    '''
+    Возвращает ключ строго между a и b.
+    a=None — начало колонки, b=None — конец колонки.
+    '''
+    if a is not None:
+        _validate(a)
+    if b is not None:
+        _validate(b)
+        if a is not None and a >= b:
+            raise ValueError(f"Ключи не упорядочены: {a!r} >= {b!r}")
+
+    if b is None and a is not None:
+        # Добавление в конец — самый частый случай: увеличиваем первую
+        # неполную цифру, чтобы ключи росли как можно медленнее
+        for i, char in enumerate(a):
+            if _digit(char) < BASE - 1:
+                return a[:i] + DIGITS[_digit(char) + 1]
+        return a + DIGITS[BASE // 2]
+
+    if a is None and b is not None:
+        # Добавление в начало — симметрично уменьшаем первую цифру больше 1
+        for i, char in enumerate(b):
+            if _digit(char) > 1:
+                return b[:i] + DIGITS[_digit(char) - 1]
+
+    return _midpoint(a or "", b)
+
+
+def keys_between(a: Optional[str], b: Optional[str], n: int) -> List[str]:
+    '''
+    Возвращает n возрастающих ключей между a и b.
+    Между None и None ключи равномерно распределены и имеют
+    одинаковую минимальную длину — так перенумеровывается колонка.
+    '''
+    if n <= 0:
+        return []
+    if a is None and b is None:
+        length = 1
+        while BASE ** length <= n:
+            length += 1
+        step = BASE ** length / (n + 1)
+        keys = []
+        for i in range(1, n + 1):
+            value = int(step * i)
+            digits = []
+            for _ in range(length):
+                value, rest = divmod(value, BASE)
+                digits.append(DIGITS[rest])
+            keys.append("".join(reversed(digits)).rstrip(DIGITS[0]))
+        return keys
+    if n == 1:
+        return [key_between(a, b)]
+    middle = key_between(a, b)
+    left = keys_between(a, middle, n // 2)
+    right = keys_between(middle, b, n - n // 2 - 1)
+    return left + [middle] + right
@@ -2,9 +2,15 @@ from passlib.context import CryptContext
 import jwt
 from core.config import settings
 import datetime
-from fastapi import Depends, HTTPException, status
+import hmac
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from db.database import get_db, get_async_db
+from db.routing import USER_ID
 
 pwd_context = CryptContext(
     schemes=["argon2"],
@@ -18,6 +24,10 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 # HTTPBearer вместо OAuth2PasswordBearer для работы SwaggerUI
 auth_scheme = HTTPBearer()
 
+# subject токена -> строка с открытыми полями пользователя (queries.auth_user_stmt) или None.
+# Строка не привязана к сессии, поэтому её можно отдавать в разные запросы
+user_cache = TTLCache(settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS)
+
 def hash_password(password: str):  # Хэширование пароля
     return pwd_context.hash(password)
 
@@ -40,24 +50,74 @@ def decode_access_token(token: str):  # Декодирование JWT токе
     except jwt.InvalidTokenError:
         return None
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(auth_scheme)):  
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+def _get_token_subject(credentials: HTTPAuthorizationCredentials) -> str:  # ID пользователя из JWT
     token = credentials.credentials  # сам токен (без "Bearer ")
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
+        subject: str = payload.get("sub")
+        if subject is None:
+            raise _credentials_exception()
     except jwt.PyJWTError:
-        raise credentials_exception
-    
+        raise _credentials_exception()
+    return subject
+
+def _subject_lookup(subject: str) -> dict:
+    # Токены, выданные до перехода на ID, несут в sub email — принимаем их, пока не истекут
+    return {"user_id": int(subject)} if subject.isdigit() else {"email": subject}
+
+def invalidate_user(user_id: int, email: str | None = None) -> None:  # Вызывать после изменения пользователя
+    user_cache.pop(str(user_id))
+    if email is not None:
+        user_cache.pop(email)
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(auth_scheme),
+    db: Session = Depends(get_db),
+):
+    """
+    Текущий пользователь — строка с открытыми полями (id, email, имя, username, аватар).
+    Берётся из кэша по subject токена; другие процессы видят изменения профиля
+    не позже чем через USER_CACHE_TTL_SECONDS.
+    """
+    subject = _get_token_subject(credentials)
+
     from db.OrmQuery import OrmQuery
-    user = OrmQuery.get_user_by_email(email=email)  # Получение пользователя из базы
+    user = user_cache.get_or_load(subject, lambda: OrmQuery.get_auth_user(**_subject_lookup(subject), session=db))
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    db.info[USER_ID] = user.id  # для маршрутизации чтений (read-your-writes)
     return user
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(auth_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Асинхронный вариант get_current_user для async-эндпоинтов:
+    не уходит в threadpool ради запроса пользователя.
+    """
+    subject = _get_token_subject(credentials)
+
+    from db.AsyncOrmQuery import AsyncOrmQuery
+    user = await user_cache.aget_or_load(subject, lambda: AsyncOrmQuery.get_auth_user(**_subject_lookup(subject), session=db))
+    if user is None:
+        raise _credentials_exception()
+    db.info[USER_ID] = user.id
+    return user
+
+def require_metrics_token(x_metrics_token: str | None = Header(default=None)) -> None:
+    """
+    Доступ к служебным метрикам только по METRICS_TOKEN (заголовок X-Metrics-Token),
+    для мониторинга, а не для пользователей. Без настроенного токена метрики выключены.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_metrics_token is None or not hmac.compare_digest(x_metrics_token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Нет доступа к метрикам")
@@ -0,0 +1,97 @@
+"""
+Разбор файлов массового импорта задач (CSV или JSON).
+Поля строки: title (обязательно), description, priority, due_date (ISO 8601),
+column (название колонки доски; пусто — первая колонка), labels (названия
+меток), assignees (email или username участников workspace).
+В CSV метки и исполнители перечисляются через запятую, в JSON — списком
+или той же строкой через запятую. Загрузка в БД — OrmQuery.import_tasks.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, List, Literal, Optional
+
+# Больше строк за один импорт не принимаем: весь файл разбирается в памяти
+MAX_IMPORT_ROWS = 200_000
+
+ImportFormat = Literal["csv", "json"]
+
+
+def _split(value: Any) -> List[str]:
+    if value is None:
+        return []
+    items = value if isinstance(value, list) else str(value).split(",")
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_row(line: int, raw: Any) -> dict:
+    if not isinstance(raw, dict):
+        raise ValueError("Строка должна быть объектом")
+
+    title = _text(raw.get("title"))
+    if not title:
+        raise ValueError("Не указано название задачи (title)")
+
+    due_date = _text(raw.get("due_date"))
+    if due_date is not None:
+        try:
+            due_date = datetime.fromisoformat(due_date)
+        except ValueError:
+            raise ValueError(f"Некорректная дата due_date: {due_date!r}")
+        if due_date.tzinfo is not None:
+            # В БД даты хранятся в UTC без часового пояса
+            due_date = due_date.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return {
+        "line": line,
+        "title": title,
+        "description": _text(raw.get("description")),
+        "priority": _text(raw.get("priority")),
+        "due_date": due_date,
+        "column": _text(raw.get("column")),
+        "labels": _split(raw.get("labels")),
+        "assignees": _split(raw.get("assignees")),
+    }
+
+
+def parse_import_file(data: bytes, fmt: ImportFormat) -> tuple[List[dict], List[dict]]:
+    '''
+    Разбирает файл импорта. Возвращает (строки, ошибки); ошибка — {"row": номер, "detail": текст}.
+    Номер строки — номер записи в файле, начиная с 1 (заголовок CSV не считается).
+    ValueError — если файл целиком не читается или строк больше MAX_IMPORT_ROWS.
+    '''
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("Файл должен быть в кодировке UTF-8")
+
+    if fmt == "csv":
+        records = csv.DictReader(io.StringIO(text))
+    else:
+        try:
+            records = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Некорректный JSON: {e}")
+        if not isinstance(records, list):
+            raise ValueError("JSON должен быть списком задач")
+
+    rows, errors = [], []
+    try:
+        for line, raw in enumerate(records, start=1):
+            if line > MAX_IMPORT_ROWS:
+                raise ValueError(f"Не больше {MAX_IMPORT_ROWS} задач за один импорт")
+            try:
+                rows.append(_parse_row(line, raw))
+            except ValueError as e:
+                errors.append({"row": line, "detail": str(e)})
+    except csv.Error as e:
+        raise ValueError(f"Некорректный CSV: {e}")
+    return rows, errors
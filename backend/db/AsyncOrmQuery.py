@@ -0,0 +1,361 @@
+from typing import Optional, List, AsyncIterator, Any
+from datetime import datetime
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.database import use_async_session
+from db.dbstruct import User, Board, Project, Column, Task, UserWorkspace
+from db import queries
+
+# Сколько строк забирать из серверного курсора за раз при выгрузке
+EXPORT_BATCH_SIZE = 1000
+
+
+class AsyncOrmQuery:
+    '''
+    Асинхронный аналог OrmQuery для горячих read-эндпоинтов.
+    Использует те же построители запросов (db/queries.py), но выполняет их
+    через AsyncSession, не занимая поток из threadpool Starlette.
+    Все связи подгружаются заранее: ленивые загрузки в async-сессии недоступны.
+    '''
+
+    @staticmethod
+    async def get_user_by_email(email: str, session: AsyncSession | None = None) -> User | None:
+
+        '''
+        Возвращает пользователя по его email.
+        '''
+
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.user_by_email_stmt(email))
+            return result.scalars().first()
+
+    @staticmethod
+    async def get_auth_user(user_id: int | None = None, email: str | None = None, session: AsyncSession | None = None) -> Row | None:
+
+        '''
+        Возвращает строку с открытыми полями пользователя (см. queries.auth_user_stmt).
+        '''
+
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.auth_user_stmt(user_id, email))
+            return result.first()
+
+    @staticmethod
+    async def get_board_by_id(board_id: int, session: AsyncSession | None = None) -> Board | None:
+
+        '''
+        Возвращает доску по ее ID вместе с проектом.
+        '''
+
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.board_by_id_stmt(board_id))
+            return result.scalars().first()
+
+    @staticmethod
+    async def get_project_by_id(project_id: int, session: AsyncSession | None = None) -> Project | None:
+        """
+        Возвращает проект по его ID.
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.project_by_id_stmt(project_id))
+            return result.scalars().first()
+
+    @staticmethod
+    async def get_user_workspace_role(user_id: int, workspace_id: int, session: AsyncSession | None = None) -> str | None:
+        """
+        Получить роль пользователя в workspace или None, если связь не найдена.
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.user_workspace_role_stmt(user_id, workspace_id))
+            return result.scalars().first()
+
+    @staticmethod
+    async def has_project_view_access(user_id: int, project_id: int, session: AsyncSession | None = None) -> bool:
+        """
+        Проверяет наличие записи UserProjectAccess с правом просмотра.
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.project_view_access_stmt(user_id, project_id))
+            return result.scalars().first() is not None
+
+    @staticmethod
+    async def resolve_access(user_id: int, task_id: int | None = None, column_id: int | None = None, board_id: int | None = None, session: AsyncSession | None = None) -> Row | None:
+        """
+        Возвращает строку (project_id, workspace_id, role, has_project_access) одним запросом.
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.access_stmt(user_id, task_id, column_id, board_id))
+            return result.first()
+
+    @staticmethod
+    async def get_columns_with_tasks_by_board_id(board_id: int, session: AsyncSession | None = None) -> List[Column]:
+        """
+        Возвращает колонки с задачами для указанной доски.
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.columns_with_tasks_stmt(board_id))
+            return result.unique().scalars().all()
+
+    @staticmethod
+    async def get_board_header(board_id: int, session: AsyncSession | None = None) -> Row | None:
+        """
+        Возвращает строку (id, title, project_id, project_title, workspaces_id, version) доски.
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.board_header_stmt(board_id))
+            return result.first()
+
+    @staticmethod
+    async def get_board_view(header: Row, session: AsyncSession | None = None) -> dict[str, Any]:
+        """
+        Собирает представление доски (колонки, задачи, метки, исполнители)
+        из плоских строк четырьмя запросами, минуя ORM-объекты.
+        Результат — готовые к сериализации dict/list в формате BoardTasksOut.
+        """
+        async with use_async_session(session) as session:
+            board_id = header.id
+            labels: dict[int, list] = {}
+            for task_id, label_id, name, color in await session.execute(queries.board_task_labels_stmt(board_id)):
+                labels.setdefault(task_id, []).append({"id": label_id, "name": name, "color": color})
+
+            assignees: dict[int, list] = {}
+            for task_id, *user in await session.execute(queries.board_task_assignees_stmt(board_id)):
+                assignees.setdefault(task_id, []).append(dict(zip(queries.USER_FIELDS, user)))
+
+            tasks: dict[int, list] = {}
+            for row in await session.execute(queries.board_tasks_stmt(board_id)):
+                (task_id, title, description, priority, due_date, column_id, rank, created_at, *assignee) = row
+                tasks.setdefault(column_id, []).append({
+                    "id": task_id,
+                    "title": title,
+                    "description": description,
+                    "priority": priority,
+                    "due_date": due_date,
+                    "board_id": board_id,
+                    "column_id": column_id,
+                    "rank": rank,
+                    "created_at": created_at,
+                    "labels": labels.get(task_id, []),
+                    "assignee": dict(zip(queries.USER_FIELDS, assignee)) if assignee[0] is not None else None,
+                    "assignees": assignees.get(task_id, []),
+                })
+
+            columns = [
+                {
+                    "id": column_id,
+                    "title": title,
+                    "board_id": column_board_id,
+                    "color": {"id": color_id, "name": color_name, "hex_code": hex_code} if color_id is not None else None,
+                    "tasks": tasks.get(column_id, []),
+                }
+                for column_id, title, column_board_id, color_id, color_name, hex_code
+                in await session.execute(queries.board_columns_stmt(board_id))
+            ]
+
+            return {
+                "board_id": board_id,
+                "board_title": header.title,
+                "project": {"id": header.project_id, "title": header.project_title, "workspaces_id": header.workspaces_id},
+                "columns": columns,
+            }
+
+    @staticmethod
+    async def get_board_stats(board_id: int, session: AsyncSession | None = None) -> dict[str, Any]:
+        """
+        Статистика доски из счётчиков task_counters (без загрузки задач):
+        задачи по доске, колонкам и исполнителям, просроченные — по индексу due_date.
+        """
+        async with use_async_session(session) as session:
+            columns = (await session.execute(queries.board_column_counters_stmt(board_id))).all()
+            board = dict((await session.execute(queries.board_counters_stmt(board_id, "board"))).all())
+            assignees = (await session.execute(queries.board_counters_stmt(board_id, "assignee"))).all()
+            overdue = dict((await session.execute(queries.board_overdue_counts_stmt(board_id, datetime.utcnow()))).all())
+            return {
+                "board_id": board_id,
+                "tasks": board.get(board_id, 0),
+                "overdue": sum(overdue.values()),
+                "columns": [
+                    {"column_id": column_id, "tasks": tasks, "overdue": overdue.get(column_id, 0)}
+                    for column_id, tasks in columns
+                ],
+                "assignees": [{"user_id": user_id, "tasks": tasks} for user_id, tasks in assignees],
+            }
+
+    @staticmethod
+    async def get_board_archive(
+        board_id: int,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        session: AsyncSession | None = None
+    ) -> List[Row]:
+        """
+        Возвращает архивные задачи доски от недавно архивированных к старым.
+        after — ключ (archived_at, id), после которого начинается страница.
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.board_archive_stmt(board_id, after=after, limit=limit))
+            return result.all()
+
+    @staticmethod
+    async def get_columns_by_board_id(board_id: int, session: AsyncSession | None = None) -> List[Column]:
+        """
+        Возвращает все колонки доски без задач.
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.columns_by_board_stmt(board_id))
+            return result.scalars().all()
+
+    @staticmethod
+    async def get_user_tasks(
+        user_id: int,
+        workspace_id: Optional[int] = None,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        session: AsyncSession | None = None
+    ) -> List[Task]:
+        """
+        Возвращает задачи, назначенные пользователю (assigned_to или TaskAssignee),
+        от новых к старым. after — ключ (created_at, id), после которого начинается страница.
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.user_tasks_stmt(user_id, workspace_id, after=after, limit=limit))
+            return result.unique().scalars().all()
+
+    @staticmethod
+    async def get_calendar_tasks(
+        board_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        column_id: Optional[int] = None,
+        assigned_to: Optional[int] = None,
+        label_id: Optional[int] = None,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        session: AsyncSession | None = None
+    ) -> List[Task]:
+        """
+        Возвращает задачи для календаря с фильтрами по возрастанию due_date.
+        after — ключ (due_date, id), после которого начинается страница.
+        """
+        async with use_async_session(session) as session:
+            stmt = queries.calendar_tasks_stmt(
+                board_id=board_id,
+                start_date=start_date,
+                end_date=end_date,
+                column_id=column_id,
+                assigned_to=assigned_to,
+                label_id=label_id,
+                after=after,
+                limit=limit
+            )
+            result = await session.execute(stmt)
+            return result.unique().scalars().all()
+
+    @staticmethod
+    async def get_user_workspace_links(user_id: int, session: AsyncSession | None = None) -> List[UserWorkspace]:
+        """
+        Возвращает связи пользователя с рабочими пространствами (с подгруженным workspace).
+        """
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.user_workspace_links_stmt(user_id))
+            return result.scalars().all()
+
+    @staticmethod
+    async def get_workspace_owner_usernames(workspace_ids: List[int], session: AsyncSession | None = None) -> dict[int, str | None]:
+        """
+        Возвращает username владельца для каждого workspace одним запросом.
+        """
+        if not workspace_ids:
+            return {}
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.workspace_owner_usernames_stmt(workspace_ids))
+            owners: dict[int, str | None] = {}
+            for workspace_id, username in result.all():
+                owners.setdefault(workspace_id, username)
+            return owners
+
+    @staticmethod
+    async def get_viewable_project_ids(user_id: int, workspace_id: int, session: AsyncSession | None = None) -> List[int] | None:
+        """
+        Возвращает ID проектов workspace, доступных пользователю для просмотра,
+        или None, если пользователь не состоит в workspace.
+        """
+        async with use_async_session(session) as session:
+            role = (await session.execute(queries.user_workspace_role_stmt(user_id, workspace_id))).scalars().first()
+            if not role:
+                return None
+            is_owner = role.lower() == "owner"
+            result = await session.execute(queries.viewable_project_ids_stmt(user_id, workspace_id, is_owner))
+            return list(result.scalars().all())
+
+    @staticmethod
+    async def search_users(
+        q: str,
+        workspace_id: Optional[int] = None,
+        limit: int = 10,
+        session: AsyncSession | None = None
+    ) -> List[Row]:
+        """
+        Автодополнение пользователей по username, имени, фамилии и email
+        среди участников workspace_id. Без workspace_id — только точное
+        совпадение username или email.
+        """
+        async with use_async_session(session) as session:
+            if workspace_id is None:
+                stmt = queries.user_lookup_stmt(q, limit=limit)
+            else:
+                stmt = queries.user_search_stmt(q, workspace_id, limit=limit)
+            result = await session.execute(stmt)
+            return result.all()
+
+    @staticmethod
+    async def search(
+        project_ids: List[int],
+        q: str,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        session: AsyncSession | None = None
+    ) -> List[Row]:
+        """
+        Полнотекстовый поиск по задачам и комментариям проектов project_ids.
+        Строки (kind, id, task_id, rank, task_title, board_id, project_id, snippet)
+        от релевантных к менее релевантным; after — ключ (rank, kind, id).
+        """
+        if not project_ids:
+            return []
+        async with use_async_session(session) as session:
+            result = await session.execute(queries.search_stmt(project_ids, q, after=after, limit=limit))
+            return result.all()
+
+    @staticmethod
+    async def iter_export_tasks(
+        board_id: Optional[int] = None,
+        project_ids: Optional[List[int]] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Потоково отдаёт задачи доски или проектов пачками по batch_size строк.
+        Строки читаются серверным курсором (stream + yield_per), к каждой пачке
+        двумя запросами добавляются метки и исполнители — в памяти одна пачка.
+        Открывает собственную сессию: генератор живёт дольше обработчика запроса.
+        """
+        async with use_async_session() as session:
+            stmt = queries.export_tasks_stmt(board_id=board_id, project_ids=project_ids)
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            async for partition in result.mappings().partitions():
+                rows = [dict(row) for row in partition]
+                task_ids = [row["task_id"] for row in rows]
+
+                labels: dict[int, list] = {}
+                for task_id, name in (await session.execute(queries.task_label_names_stmt(task_ids))).all():
+                    labels.setdefault(task_id, []).append(name)
+                assignees: dict[int, list] = {}
+                for task_id, username in (await session.execute(queries.task_assignee_usernames_stmt(task_ids))).all():
+                    assignees.setdefault(task_id, []).append(username)
+
+                for row in rows:
+                    row["labels"] = labels.get(row["task_id"], [])
+                    row["assignees"] = assignees.get(row["task_id"], [])
+                yield rows
@@ -1,22 +1,32 @@
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, insert, update, delete, case, func, and_, or_, text, literal, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from fastapi import Depends
 from sqlalchemy.exc import SQLAlchemyError
 import random
 
-from core.security import hash_password
+from core.security import hash_password, invalidate_user
 from core.avatar_generator import generate_avatar
 from core.logger import logger
+from core import acl_cache
+from core.ranking import key_between, keys_between, REBALANCE_KEY_LENGTH
 
-from db.database import engine, Base, session_factory
-from db.dbstruct import User, Workspace, Project, Board, Column, Task, UserWorkspace, Comment, Label, ColorPalette, WorkspaceInvite, UserProjectAccess, TaskLabel, TaskAssignee
+from db.database import engine, Base, use_session
+from db.dbstruct import User, Workspace, Project, Board, Column, Task, UserWorkspace, Comment, Label, ColorPalette, WorkspaceInvite, UserProjectAccess, TaskLabel, TaskAssignee, TaskCounter, UTC_NOW
+from db import queries
 from api.models.user import UserCreate
 from api.models.projects import ProjectCreate
 from api.models.boards import BoardCreate
 
-from typing import Optional, List
+from typing import Optional, List, Iterable
 from datetime import datetime
+from collections import Counter
 
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, Session
+
+# Размер пачки задач при фоновом удалении больших проектов и досок
+DELETE_CHUNK_SIZE = 1000
+# Размер пачки (и транзакции) фоновой архивации задач
+ARCHIVE_BATCH_SIZE = 1000
 
 class OrmQuery:
     @staticmethod
@@ -29,43 +39,53 @@ class OrmQuery:
         Base.metadata.create_all(engine)
     
     @staticmethod
-    def get_user_by_id(user_id: int) -> User | None:
+    def get_user_by_id(user_id: int, session: Session | None = None) -> User | None:
 
         '''
         Возвращает пользователя по его ID.
         '''
 
-        with session_factory() as session:
+        with use_session(session) as session:
             return session.query(User).filter(User.id == user_id).first()
         
     @staticmethod
-    def get_user_by_email(email: str) -> User | None:
+    def get_user_by_email(email: str, session: Session | None = None) -> User | None:
 
         '''
         Возвращает пользователя по его email.
         '''
 
-        with session_factory() as session:
-            return session.query(User).filter(User.email == email).first()
+        with use_session(session) as session:
+            return session.execute(queries.user_by_email_stmt(email)).scalars().first()
     
     @staticmethod
-    def get_user_by_username(username: str) -> User | None:
+    def get_auth_user(user_id: int | None = None, email: str | None = None, session: Session | None = None):
+
+        '''
+        Возвращает строку с открытыми полями пользователя (см. queries.auth_user_stmt).
+        '''
+
+        with use_session(session) as session:
+            return session.execute(queries.auth_user_stmt(user_id, email)).first()
+
+    @staticmethod
+    def get_user_by_username(username: str, session: Session | None = None) -> User | None:
 
         '''
         Возвращает пользователя по его username.
         '''
 
-        with session_factory() as session:
+        with use_session(session) as session:
             return session.query(User).filter(User.username == username).first()
     
     @staticmethod
-    def create_user(user: UserCreate, avatar_url: Optional[str] = None) -> User:
+    def create_user(user: UserCreate, avatar_url: Optional[str] = None, session: Session | None = None) -> User:
 
         '''
         Создает нового пользователя.
         '''
 
-        with session_factory() as session:
+        with use_session(session) as session:
             avatar_path = generate_avatar(user.first_name, user.last_name)
             avatar_url = f"http://localhost:8000/{avatar_path}"
 
@@ -100,33 +120,26 @@ class OrmQuery:
             session.add(owner_link)
 
             session.commit()
-            session.refresh(new_user)
-            session.refresh(new_workspace)
             return new_user  
 
     @staticmethod
-    def get_board_by_id(board_id: int):
+    def get_board_by_id(board_id: int, session: Session | None = None):
 
         '''
         Возвращает доску по ее ID.
         '''
 
-        with session_factory() as session:
-            return (
-                session.query(Board)
-                .options(joinedload(Board.project))
-                .filter(Board.id == board_id)
-                .first()
-            )
+        with use_session(session) as session:
+            return session.execute(queries.board_by_id_stmt(board_id)).scalars().first()
         
     @staticmethod
-    def get_workspace_by_user_id(user_id: int) -> Workspace | None:
+    def get_workspace_by_user_id(user_id: int, session: Session | None = None) -> Workspace | None:
 
         """
         Возвращает рабочее пространство по user_id
         """
 
-        with session_factory() as session:
+        with use_session(session) as session:
             return (
                 session.query(Workspace)
                 .join(UserWorkspace, Workspace.id == UserWorkspace.workspace_id)
@@ -135,13 +148,13 @@ class OrmQuery:
             )
 
     @staticmethod
-    def get_projects_by_workspace_id(workspace_id: int) -> list[Project]:
+    def get_projects_by_workspace_id(workspace_id: int, session: Session | None = None) -> list[Project]:
 
         """
         Возвращает проекты по workspace_id вместе с досками
         """
 
-        with session_factory() as session:
+        with use_session(session) as session:
             projects = (
                 session.query(Project)
                 .options(joinedload(Project.boards))
@@ -151,49 +164,34 @@ class OrmQuery:
             return projects
 
     @staticmethod
-    def get_columns_with_tasks_by_board_id(board_id: int):
+    def get_columns_with_tasks_by_board_id(board_id: int, session: Session | None = None):
 
         """
         Возвращает колонки с задачами для указанной доски.
         """
 
-        with session_factory() as session:
-            return (
-                session.query(Column)
-                .filter(Column.board_id == board_id)
-                .options(
-                    joinedload(Column.tasks)  # подгружаем задачи колонки
-                        .joinedload(Task.assignee),
-                    joinedload(Column.tasks)
-                        .joinedload(Task.assignee_links).joinedload(TaskAssignee.user),  # Загружаем множественных исполнителей через TaskAssignee с данными пользователей
-                    joinedload(Column.tasks)
-                        .joinedload(Task.labels),
-                    joinedload(Column.board).joinedload(Board.project),
-                    joinedload(Column.color) 
-                )
-                .order_by(Column.position.asc())
-                .all()
-            )
+        with use_session(session) as session:
+            return session.execute(queries.columns_with_tasks_stmt(board_id)).unique().scalars().all()
         
     @staticmethod
-    def get_task_by_id(task_id: int):
+    def get_task_by_id(task_id: int, session: Session | None = None):
 
         '''
         Возвращает задачу по ее ID.
         '''
 
-        with session_factory() as session:
+        with use_session(session) as session:
             return session.query(Task).filter(Task.id == task_id).first()
         
     @staticmethod
-    def get_task_with_relations(task_id: int):
+    def get_task_with_relations(task_id: int, session: Session | None = None):
 
         """
         Возвращает задачу вместе с подгруженными relations (labels, assignee, assignees, author, column->board, comments->user),
         чтобы работать с ними после закрытия сессии.
         """
 
-        with session_factory() as session:
+        with use_session(session) as session:
             return (
                 session.query(Task)
                 .options(
@@ -209,43 +207,434 @@ class OrmQuery:
             )
 
     @staticmethod
-    def create_task(title: str, column_id: int, assigned_to: int | None = None, created_by: int | None = None):
+    def create_task(title: str, column_id: int, assigned_to: int | None = None, created_by: int | None = None, session: Session | None = None):
         """
         Создаёт задачу с минимальными полями (title, column_id).
         Возвращает объект Task или None, если колонка не найдена.
         """
-        with session_factory() as session:
-            col = session.query(Column).filter(Column.id == column_id).first()
-            if not col:
+        with use_session(session) as session:
+            scope = OrmQuery.get_column_scopes([column_id], session=session).get(column_id)
+            if not scope:
                 return None
+            # Новая задача встаёт в конец колонки
+            OrmQuery.lock_columns([column_id], session=session)
+            last_rank = OrmQuery.get_last_task_rank(column_id, session=session)
             new_task = Task(
                 title=title,
                 column_id=column_id,
+                rank=key_between(last_rank, None),
                 assigned_to=assigned_to,
-                created_by=created_by
+                created_by=created_by,
+                **scope
             )
             session.add(new_task)
+            OrmQuery.bump_task_counters([], OrmQuery.task_counter_keys(scope["board_id"], column_id), session=session)
+            OrmQuery.bump_board_versions(Board.id == scope["board_id"], session=session)
             session.commit()
-            session.refresh(new_task)
             return new_task 
 
     @staticmethod
-    def update_task(task_id: int, data: dict):
+    def delete_task(task_id: int, session: Session | None = None) -> bool:
+        """
+        Удаляет задачу (комментарии, метки и исполнители удаляются каскадом в БД)
+        и уменьшает счётчики доски, если задача не в архиве. Возвращает False, если задачи нет.
+        """
+        with use_session(session) as session:
+            task = session.execute(
+                select(Task.board_id, Task.column_id, Task.archived_at).where(Task.id == task_id).with_for_update()
+            ).first()
+            if not task:
+                return False
+            assignees = OrmQuery.get_task_assignee_ids([task_id], session=session).get(task_id, [])
+            session.execute(delete(Task).where(Task.id == task_id).execution_options(synchronize_session=False))
+            if task.archived_at is None:
+                OrmQuery.bump_task_counters(OrmQuery.task_counter_keys(task.board_id, task.column_id, assignees), [], session=session)
+                OrmQuery.bump_board_versions(Board.id == task.board_id, session=session)
+            session.commit()
+            return True
+
+    @staticmethod
+    def get_task_assignee_ids(task_ids: list[int], session: Session | None = None) -> dict[int, list[int]]:
+        """
+        Возвращает {task_id: [user_id, ...]} по таблице task_assignees.
+        """
+        with use_session(session) as session:
+            assignees: dict[int, list[int]] = {}
+            for task_id, user_id in session.execute(
+                select(TaskAssignee.task_id, TaskAssignee.user_id).where(TaskAssignee.task_id.in_(task_ids))
+            ):
+                assignees.setdefault(task_id, []).append(user_id)
+            return assignees
+
+    @staticmethod
+    def task_counter_keys(board_id: int, column_id: int, user_ids: Iterable[int] = ()) -> list[tuple[int, str, int]]:
+        """
+        Ключи счётчиков (board_id, kind, key_id), в которых учитывается одна задача.
+        """
+        return [
+            (board_id, "board", board_id),
+            (board_id, "column", column_id),
+            *((board_id, "assignee", user_id) for user_id in user_ids),
+        ]
+
+    @staticmethod
+    def bump_task_counters(removed: Iterable[tuple], added: Iterable[tuple], session: Session | None = None) -> None:
+        """
+        Применяет разницу счётчиков (ключи из task_counter_keys) одним
+        INSERT ... ON CONFLICT DO UPDATE в текущей транзакции; commit — за вызывающим.
+        Строки идут в порядке ключа, чтобы параллельные транзакции не ловили deadlock.
+        """
+        deltas = Counter(added)
+        deltas.subtract(removed)
+        rows = [
+            {"board_id": board_id, "kind": kind, "key_id": key_id, "value": delta}
+            for (board_id, kind, key_id), delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+        with use_session(session) as session:
+            stmt = pg_insert(TaskCounter).values(rows)
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=[TaskCounter.board_id, TaskCounter.kind, TaskCounter.key_id],
+                set_={"value": TaskCounter.value + stmt.excluded.value},
+            ))
+
+    @staticmethod
+    def bump_board_versions(board_filter, session: Session | None = None) -> None:
+        """
+        Увеличивает версию досок, подходящих под board_filter (условие на Board),
+        в текущей транзакции; commit — за вызывающим. Строки блокируются в порядке id,
+        чтобы параллельные транзакции с несколькими досками не ловили deadlock.
+        Блокировка — FOR NO KEY UPDATE: она совместима с FOR KEY SHARE, который берут
+        проверки FK при вставке в tasks и task_counters, иначе две вставки в одну
+        доску ждали бы друг друга.
+        """
+        with use_session(session) as session:
+            locked = (
+                select(Board.id).where(board_filter).order_by(Board.id)
+                .with_for_update(key_share=True).subquery()
+            )
+            session.execute(
+                update(Board).where(Board.id == locked.c.id).values(version=Board.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def get_board_counters(board_id: int, session: Session | None = None) -> list[tuple[str, int, int]]:
+        """
+        Возвращает счётчики доски: [(kind, key_id, value), ...].
+        """
+        with use_session(session) as session:
+            return session.execute(
+                select(TaskCounter.kind, TaskCounter.key_id, TaskCounter.value).where(TaskCounter.board_id == board_id)
+            ).all()
+
+    @staticmethod
+    def repair_task_counters(board_id: int | None = None, session: Session | None = None) -> int:
+        """
+        Пересчитывает счётчики с нуля по неархивным задачам и task_assignees
+        (для всех досок или одной). Таблица счётчиков блокируется на время
+        пересчёта, чтобы параллельные записи не потерялись. Возвращает число строк.
+        """
+        with use_session(session) as session:
+            session.execute(text("LOCK TABLE task_counters IN SHARE ROW EXCLUSIVE MODE"))
+            scope = [Task.archived_at.is_(None)]
+            if board_id is not None:
+                scope.append(Task.board_id == board_id)
+            session.execute(delete(TaskCounter).where(
+                *([TaskCounter.board_id == board_id] if board_id is not None else [])
+            ))
+            columns = ["board_id", "kind", "key_id", "value"]
+            total = 0
+            for source in (
+                select(Task.board_id, literal("board"), Task.board_id, func.count())
+                .where(*scope).group_by(Task.board_id),
+                select(Task.board_id, literal("column"), Task.column_id, func.count())
+                .where(*scope).group_by(Task.board_id, Task.column_id),
+                select(Task.board_id, literal("assignee"), TaskAssignee.user_id, func.count())
+                .join(TaskAssignee, TaskAssignee.task_id == Task.id)
+                .where(*scope).group_by(Task.board_id, TaskAssignee.user_id),
+            ):
+                total += session.execute(insert(TaskCounter).from_select(columns, source)).rowcount
+            session.commit()
+            return total
+
+    @staticmethod
+    def get_column_scopes(column_ids: list[int], session: Session | None = None) -> dict[int, dict]:
+        """
+        Возвращает {column_id: {"board_id", "project_id", "workspace_id"}} — значения
+        денормализованных полей задачи в этой колонке. Нет колонки — нет ключа.
+        """
+        with use_session(session) as session:
+            return {
+                column_id: {"board_id": board_id, "project_id": project_id, "workspace_id": workspace_id}
+                for column_id, board_id, project_id, workspace_id
+                in session.execute(queries.column_scopes_stmt(column_ids))
+            }
+
+    @staticmethod
+    def get_last_task_rank(column_id: int, exclude_task_id: int | None = None, session: Session | None = None) -> str | None:
+        """
+        Возвращает наибольший ключ порядка неархивных задач в колонке (None для пустой колонки).
+        """
+        with use_session(session) as session:
+            stmt = select(func.max(Task.rank)).where(Task.column_id == column_id, Task.archived_at.is_(None))
+            if exclude_task_id is not None:
+                stmt = stmt.where(Task.id != exclude_task_id)
+            return session.execute(stmt).scalar()
+
+    @staticmethod
+    def lock_columns(column_ids: Iterable[int], session: Session | None = None) -> None:
+        """
+        Блокирует строки колонок до конца транзакции (в порядке id), прежде чем
+        читать из них ключи порядка: иначе параллельные вставки и переносы в одну
+        колонку получили бы одинаковые ключи. FOR NO KEY UPDATE не мешает проверкам
+        FK при вставке задач (FOR KEY SHARE).
+        """
+        with use_session(session) as session:
+            session.execute(
+                select(Column.id).where(Column.id.in_(list(column_ids))).order_by(Column.id)
+                .with_for_update(key_share=True)
+            )
+
+    @staticmethod
+    def _move_bounds(task_id: int, column_id: int, after_id: int | None, before_id: int | None, session: Session) -> tuple | None:
+        """
+        Границы (lower, upper) нового ключа задачи между соседями after_id и before_id
+        в колонке column_id; None — соседи не из этой колонки.
+        """
+        neighbour_ids = [i for i in (after_id, before_id) if i is not None]
+        # Архивные задачи на доске не видны и соседями быть не могут
+        ranks = dict(session.execute(
+            select(Task.id, Task.rank).where(
+                Task.id.in_(neighbour_ids), Task.column_id == column_id, Task.archived_at.is_(None)
+            )
+        ).all()) if neighbour_ids else {}
+        if len(ranks) != len(neighbour_ids) or any(rank is None for rank in ranks.values()):
+            return None
+
+        lower = ranks.get(after_id)
+        upper = ranks.get(before_id)
+        others = and_(Task.column_id == column_id, Task.id != task_id, Task.archived_at.is_(None))
+        if after_id is not None and before_id is None:
+            upper = session.execute(select(func.min(Task.rank)).where(others, Task.rank > lower)).scalar()
+        elif before_id is not None and after_id is None:
+            lower = session.execute(select(func.max(Task.rank)).where(others, Task.rank < upper)).scalar()
+        elif after_id is None and before_id is None:
+            lower = OrmQuery.get_last_task_rank(column_id, exclude_task_id=task_id, session=session)
+        return lower, upper
+
+    @staticmethod
+    def move_task(
+        task_id: int,
+        column_id: int | None = None,
+        before_id: int | None = None,
+        after_id: int | None = None,
+        session: Session | None = None
+    ) -> dict:
+        """
+        Перемещает задачу в колонку column_id (по умолчанию — текущую) между соседями:
+        after_id — задача, после которой встаёт карточка, before_id — перед которой.
+        Если сосед указан один, второй берётся из колонки; без соседей — в конец.
+        Меняется только строка самой задачи.
+
+        Возвращает:
+         - {"status": "ok", "task": Task, "rebalance": bool} — rebalance=True, если ключ стал длинным
+         - {"status": "not_found"} — нет задачи или колонки (архивной задачи на доске нет)
+         - {"status": "bad_neighbours"} — соседи не из этой колонки или стоят не по порядку
+        """
+        with use_session(session) as session:
+            task = session.get(Task, task_id)
+            if not task or task.archived_at is not None:
+                return {"status": "not_found"}
+
+            target_column_id = column_id if column_id is not None else task.column_id
+            scope = None
+            if target_column_id != task.column_id:
+                scope = OrmQuery.get_column_scopes([target_column_id], session=session).get(target_column_id)
+                if scope is None:
+                    return {"status": "not_found"}
+
+            neighbour_ids = [i for i in (after_id, before_id) if i is not None]
+            if task_id in neighbour_ids or len(set(neighbour_ids)) != len(neighbour_ids):
+                return {"status": "bad_neighbours"}
+
+            OrmQuery.lock_columns([target_column_id], session=session)
+            bounds = OrmQuery._move_bounds(task_id, target_column_id, after_id, before_id, session)
+            if bounds is not None and bounds[0] is not None and bounds[0] == bounds[1]:
+                # Одинаковые ключи у соседей (например, от вставок до блокировки колонки):
+                # между ними не встать, поэтому колонка перенумеровывается сразу
+                OrmQuery.renumber_column_ranks(target_column_id, session=session)
+                session.expire(task, ["rank"])
+                bounds = OrmQuery._move_bounds(task_id, target_column_id, after_id, before_id, session)
+            if bounds is None:
+                return {"status": "bad_neighbours"}
+            lower, upper = bounds
+
+            if lower is not None and upper is not None and lower >= upper:
+                return {"status": "bad_neighbours"}
+
+            if target_column_id != task.column_id:
+                assignees = OrmQuery.get_task_assignee_ids([task_id], session=session).get(task_id, [])
+                OrmQuery.bump_task_counters(
+                    OrmQuery.task_counter_keys(task.board_id, task.column_id, assignees),
+                    OrmQuery.task_counter_keys(scope["board_id"], target_column_id, assignees),
+                    session=session
+                )
+                task.column_entered_at = UTC_NOW
+            OrmQuery.bump_board_versions(Board.id.in_({task.board_id, (scope or {}).get("board_id", task.board_id)}), session=session)
+            task.column_id = target_column_id
+            for field, value in (scope or {}).items():
+                setattr(task, field, value)
+            task.rank = key_between(lower, upper)
+            session.commit()
+            return {"status": "ok", "task": task, "rebalance": len(task.rank) > REBALANCE_KEY_LENGTH}
+
+    @staticmethod
+    def rebalance_column_ranks(column_id: int, session: Session | None = None) -> int:
+        """
+        Перенумеровывает ключи порядка задач колонки равномерно и коротко,
+        сохраняя текущий порядок. Возвращает число задач.
+        """
+        with use_session(session) as session:
+            count = OrmQuery.renumber_column_ranks(column_id, session=session)
+            if count:
+                OrmQuery.bump_board_versions(Board.id == select(Column.board_id).where(Column.id == column_id).scalar_subquery(), session=session)
+            session.commit()
+            return count
+
+    @staticmethod
+    def renumber_column_ranks(column_id: int, session: Session | None = None) -> int:
+        """
+        Перенумеровывает ключи неархивных задач колонки в текущей транзакции
+        (колонка блокируется); commit и версия доски — за вызывающим. Возвращает число задач.
+        """
+        with use_session(session) as session:
+            OrmQuery.lock_columns([column_id], session=session)
+            task_ids = session.execute(
+                select(Task.id)
+                .where(Task.column_id == column_id, Task.archived_at.is_(None))
+                .order_by(Task.rank.asc().nulls_last(), Task.id.asc())
+                .with_for_update()
+            ).scalars().all()
+            if not task_ids:
+                return 0
+            ranks = dict(zip(task_ids, keys_between(None, None, len(task_ids))))
+            session.execute(
+                update(Task)
+                .where(Task.id.in_(ranks.keys()))
+                .values(rank=case(ranks, value=Task.id))
+                .execution_options(synchronize_session=False)
+            )
+            return len(task_ids)
+
+    @staticmethod
+    def archive_due_tasks(batch_size: int = ARCHIVE_BATCH_SIZE, session: Session | None = None) -> int:
+        """
+        Архивирует задачи, пролежавшие в колонке архивации своей доски дольше
+        archive_after_days дней. Пачки по batch_size, каждая в своей транзакции;
+        строки берутся FOR UPDATE SKIP LOCKED, поэтому архивация из нескольких
+        процессов сразу не ждёт ни друг друга, ни пользовательских правок.
+        Счётчики доски уменьшаются в той же транзакции. Возвращает число задач.
+        """
+        due_stmt = (
+            select(Task.id, Task.board_id, Task.column_id)
+            .join(Board, and_(Board.id == Task.board_id, Board.archive_column_id == Task.column_id))
+            .where(
+                Task.archived_at.is_(None),
+                Board.archive_after_days.isnot(None),
+                Task.column_entered_at < UTC_NOW - Board.archive_after_days * literal_column("interval '1 day'"),
+            )
+            .limit(batch_size)
+            .with_for_update(of=Task, skip_locked=True)
+        )
+        total = 0
+        with use_session(session) as session:
+            while True:
+                due = session.execute(due_stmt).all()
+                if not due:
+                    break
+                task_ids = [row.id for row in due]
+                assignees = OrmQuery.get_task_assignee_ids(task_ids, session=session)
+                session.execute(
+                    update(Task).where(Task.id.in_(task_ids)).values(archived_at=UTC_NOW)
+                    .execution_options(synchronize_session=False)
+                )
+                OrmQuery.bump_task_counters(
+                    [key for row in due for key in OrmQuery.task_counter_keys(row.board_id, row.column_id, assignees.get(row.id, []))],
+                    [],
+                    session=session
+                )
+                OrmQuery.bump_board_versions(Board.id.in_({row.board_id for row in due}), session=session)
+                session.commit()
+                total += len(due)
+                if len(due) < batch_size:
+                    break
+        if total:
+            logger.info(f"Архивировано задач: {total}")
+        return total
+
+    @staticmethod
+    def restore_task(task_id: int, session: Session | None = None) -> dict:
+        """
+        Возвращает задачу из архива в конец её колонки; срок до повторной
+        архивации отсчитывается заново.
+
+        Возвращает:
+         - {"status": "ok", "task": Task, "rebalance": bool}
+         - {"status": "not_found"} — нет задачи
+         - {"status": "not_archived"} — задача не в архиве
+        """
+        with use_session(session) as session:
+            task = session.get(Task, task_id, with_for_update=True)
+            if not task:
+                return {"status": "not_found"}
+            if task.archived_at is None:
+                return {"status": "not_archived"}
+
+            assignees = OrmQuery.get_task_assignee_ids([task_id], session=session).get(task_id, [])
+            task.archived_at = None
+            task.column_entered_at = UTC_NOW
+            OrmQuery.lock_columns([task.column_id], session=session)
+            task.rank = key_between(OrmQuery.get_last_task_rank(task.column_id, exclude_task_id=task_id, session=session), None)
+            OrmQuery.bump_task_counters([], OrmQuery.task_counter_keys(task.board_id, task.column_id, assignees), session=session)
+            OrmQuery.bump_board_versions(Board.id == task.board_id, session=session)
+            session.commit()
+            return {"status": "ok", "task": task, "rebalance": len(task.rank) > REBALANCE_KEY_LENGTH}
+
+    @staticmethod
+    def update_task(task_id: int, data: dict, session: Session | None = None):
         """
         Обновляет задачу: простые поля и связи (column_id, assigned_to, labels).
         Нормализует assigned_to (0/invalid -> None) и проверяет существование column.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             task = session.query(Task).filter(Task.id == task_id).first()
             if not task:
                 return None
 
+            # Счётчики доски меняются при переносе и смене исполнителей (архивные задачи не учитываются)
+            counted = task.archived_at is None
+            old_assignees = OrmQuery.get_task_assignee_ids([task_id], session=session).get(task_id, [])
+            old_counter_keys = OrmQuery.task_counter_keys(task.board_id, task.column_id, old_assignees)
+            old_board_id = task.board_id
+            new_assignees = old_assignees
+
             # Проверить column_id если передан
             if "column_id" in data and data["column_id"] is not None:
-                col = session.query(Column).filter(Column.id == int(data["column_id"])).first()
-                if not col:
+                column_id = int(data["column_id"])
+                scope = OrmQuery.get_column_scopes([column_id], session=session).get(column_id)
+                if not scope:
                     # колонка не найдена — считаем запрос некорректным
                     return None
+                if column_id != task.column_id:
+                    # При переносе в другую колонку задача встаёт в её конец
+                    OrmQuery.lock_columns([column_id], session=session)
+                    task.rank = key_between(OrmQuery.get_last_task_rank(column_id, session=session), None)
+                    task.column_entered_at = UTC_NOW
+                    for field, value in scope.items():
+                        setattr(task, field, value)
 
             # Нормализовать assigned_to: не допускать 0 или несуществующего пользователя
             if "assigned_to" in data:
@@ -281,84 +670,391 @@ class OrmQuery:
             # Обновляем множественных исполнителей (assigned_to_ids)
             if "assigned_to_ids" in data and data["assigned_to_ids"] is not None:
                 assignee_ids = [int(i) for i in data["assigned_to_ids"]] if data["assigned_to_ids"] else []
+                assignee_ids = list(dict.fromkeys(assignee_ids))  # пара (task_id, user_id) уникальна
                 
                 # Удаляем старые связи TaskAssignee
                 session.query(TaskAssignee).filter(TaskAssignee.task_id == task_id).delete()
                 
                 # Создаем новые связи TaskAssignee
+                new_assignees = []
                 for user_id in assignee_ids:
                     # Проверяем, существует ли пользователь
                     user_exists = session.query(User).filter(User.id == user_id).first()
                     if user_exists:
                         task_assignee = TaskAssignee(task_id=task_id, user_id=user_id)
                         session.add(task_assignee)
+                        new_assignees.append(user_id)
                 
                 session.flush()  # Принудительно сохраняем изменения
 
+            if counted:
+                OrmQuery.bump_task_counters(
+                    old_counter_keys,
+                    OrmQuery.task_counter_keys(task.board_id, task.column_id, new_assignees),
+                    session=session
+                )
+                # Архивной задачи на доске нет — её правка представление доски не меняет
+                OrmQuery.bump_board_versions(Board.id.in_({old_board_id, task.board_id}), session=session)
             session.add(task)
             session.commit()
-            session.refresh(task)
             return task
 
     @staticmethod
-    def update_column_positions(positions: list[dict]):
+    def get_task_scope(task_id: int, session: Session | None = None) -> tuple[int, int] | None:
+        """
+        Возвращает (project_id, workspace_id) задачи по её денормализованным полям, без join.
+        """
+        with use_session(session) as session:
+            return session.execute(
+                select(Task.project_id, Task.workspace_id).where(Task.id == task_id)
+            ).first()
 
+    @staticmethod
+    def get_task_locations(task_ids: list[int], session: Session | None = None) -> dict[int, tuple[int, int, bool]]:
         """
-            Обновляет позиции колонок.
+        Возвращает {task_id: (column_id, project_id, archived)} для существующих задач одним запросом.
         """
+        with use_session(session) as session:
+            rows = session.execute(
+                select(Task.id, Task.column_id, Task.project_id, Task.archived_at.isnot(None)).where(Task.id.in_(task_ids))
+            ).all()
+            return {task_id: (column_id, project_id, archived) for task_id, column_id, project_id, archived in rows}
 
-        with session_factory() as session:
-            for col_data in positions:
-                session.query(Column).filter(Column.id == col_data["id"]).update(
-                    {"position": col_data["position"]}
+    @staticmethod
+    def batch_update_tasks(items: list[dict], session: Session | None = None) -> list[int]:
+        """
+        Применяет частичные обновления задач одной транзакцией.
+        items — проверенные вызывающим кодом dict с ключом id и только переданными полями.
+
+        Простые поля: один UPDATE ... WHERE id IN (...) на каждый набор одинаковых значений.
+        Перенос в колонку: задачи встают в её конец одним UPDATE на колонку (ранги через CASE);
+        архивные задачи не переносятся.
+        Метки и исполнители: один DELETE и один INSERT на весь пакет.
+        Несуществующие пользователи и метки отбрасываются, как в update_task.
+        Возвращает колонки, ключи порядка в которых стали длинными и требуют перенумерации.
+        """
+        with use_session(session) as session:
+            user_ids = {i for item in items for i in item.get("assigned_to_ids") or []}
+            user_ids |= {item["assigned_to"] for item in items if item.get("assigned_to")}
+            existing_users = set(session.execute(select(User.id).where(User.id.in_(user_ids))).scalars()) if user_ids else set()
+            label_ids = {i for item in items for i in item.get("label_ids") or []}
+            existing_labels = set(session.execute(select(Label.id).where(Label.id.in_(label_ids))).scalars()) if label_ids else set()
+
+            rebalance: list[int] = []
+            groups: dict[tuple, list[int]] = {}
+            moves: dict[int, list[int]] = {}
+            label_links: dict[int, list[int]] = {}
+            assignee_links: dict[int, list[int]] = {}
+            for item in items:
+                values = {f: item[f] for f in ("title", "description", "priority", "due_date") if f in item}
+                if "assigned_to" in item:
+                    values["assigned_to"] = item["assigned_to"] if item["assigned_to"] in existing_users else None
+                if values:
+                    groups.setdefault(tuple(sorted(values.items())), []).append(item["id"])
+                if item.get("column_id") is not None:
+                    moves.setdefault(item["column_id"], []).append(item["id"])
+                if item.get("label_ids") is not None:
+                    label_links[item["id"]] = [i for i in dict.fromkeys(item["label_ids"]) if i in existing_labels]
+                if item.get("assigned_to_ids") is not None:
+                    assignee_links[item["id"]] = [i for i in dict.fromkeys(item["assigned_to_ids"]) if i in existing_users]
+
+            # Состояние задач для счётчиков до изменений: колонка, доска и исполнители
+            counted = list({*assignee_links, *(i for task_ids in moves.values() for i in task_ids)})
+            state_stmt = select(Task.id, Task.board_id, Task.column_id).where(Task.id.in_(counted), Task.archived_at.is_(None))
+            before = {row.id: row for row in session.execute(state_stmt)} if counted else {}
+            old_assignees = OrmQuery.get_task_assignee_ids(counted, session=session) if counted else {}
+            board_ids = set(session.execute(
+                select(Task.board_id).where(Task.id.in_([item["id"] for item in items])).distinct()
+            ).scalars())
+
+            for values, task_ids in groups.items():
+                session.execute(
+                    update(Task).where(Task.id.in_(task_ids)).values(dict(values))
+                    .execution_options(synchronize_session=False)
                 )
+
+            scopes = OrmQuery.get_column_scopes(list(moves), session=session) if moves else {}
+            if moves:
+                OrmQuery.lock_columns(moves, session=session)
+            for column_id, task_ids in moves.items():
+                # Задачи, уже стоящие в этой колонке, остаются на своих местах;
+                # остальные встают в конец в порядке запроса. Архивные не переносятся
+                moving = set(session.execute(
+                    select(Task.id).where(Task.id.in_(task_ids), Task.column_id != column_id, Task.archived_at.is_(None))
+                ).scalars())
+                task_ids = [i for i in task_ids if i in moving]
+                if not task_ids:
+                    continue
+                last_rank = OrmQuery.get_last_task_rank(column_id, session=session)
+                ranks = dict(zip(task_ids, keys_between(last_rank, None, len(task_ids))))
+                session.execute(
+                    update(Task).where(Task.id.in_(ranks.keys()))
+                    .values(column_id=column_id, rank=case(ranks, value=Task.id), column_entered_at=UTC_NOW, **scopes[column_id])
+                    .execution_options(synchronize_session=False)
+                )
+                if len(ranks[task_ids[-1]]) > REBALANCE_KEY_LENGTH:
+                    rebalance.append(column_id)
+
+            for model, column, links in (
+                (TaskLabel, "label_id", label_links),
+                (TaskAssignee, "user_id", assignee_links),
+            ):
+                if not links:
+                    continue
+                session.execute(delete(model).where(model.task_id.in_(links.keys())))
+                rows = [{"task_id": task_id, column: i} for task_id, ids in links.items() for i in ids]
+                if rows:
+                    session.execute(insert(model), rows)
+
+            if counted:
+                removed, added = [], []
+                for row in session.execute(state_stmt):
+                    old = before[row.id]
+                    removed += OrmQuery.task_counter_keys(old.board_id, old.column_id, old_assignees.get(row.id, []))
+                    added += OrmQuery.task_counter_keys(
+                        row.board_id, row.column_id, assignee_links.get(row.id, old_assignees.get(row.id, []))
+                    )
+                OrmQuery.bump_task_counters(removed, added, session=session)
+
+            board_ids |= {scope["board_id"] for scope in scopes.values()}
+            if board_ids:
+                OrmQuery.bump_board_versions(Board.id.in_(board_ids), session=session)
             session.commit()
+            return rebalance
 
     @staticmethod
-    def get_project_by_id(projects_id: int):
+    def import_tasks(board_id: int, rows: list[dict], created_by: int, session: Session | None = None) -> dict | None:
+        """
+        Массовый импорт задач в доску (строки из core.task_import.parse_import_file).
+        Колонки, метки и исполнители сопоставляются в Python (метки, которых нет
+        в workspace, создаются). Сами задачи загружаются через COPY во временную
+        таблицу, откуда переносятся в tasks, task_labels и task_assignees тремя
+        INSERT ... SELECT в одной транзакции. Новые задачи встают в конец колонок.
+
+        Возвращает {"imported", "labels_created", "errors", "unknown_assignees"}
+        или None, если доски нет. Только Postgres (COPY через psycopg).
+        """
+        with use_session(session) as session:
+            scope = session.execute(
+                select(Board.projects_id, Project.workspaces_id).join(Project, Board.projects_id == Project.id).where(Board.id == board_id)
+            ).first()
+            if scope is None:
+                return None
+            project_id, workspace_id = scope
+
+            columns = session.execute(
+                select(Column.id, Column.title).where(Column.board_id == board_id).order_by(Column.position.asc())
+            ).all()
+            column_ids = {(title or "").strip().lower(): column_id for column_id, title in reversed(columns)}
+
+            errors, staged = [], []
+            for row in rows:
+                if row["column"] is None and columns:
+                    column_id = columns[0].id
+                else:
+                    column_id = column_ids.get((row["column"] or "").lower())
+                if column_id is None:
+                    errors.append({"row": row["line"], "detail": f"Колонка не найдена: {row['column']!r}"})
+                    continue
+                staged.append((row, column_id))
+
+            label_ids = {}
+            for label_id, name in session.execute(
+                select(Label.id, Label.name).where(Label.workspace_id == workspace_id).order_by(Label.id.desc())
+            ):
+                label_ids[(name or "").lower()] = label_id
+            missing_labels = {}
+            for row, _ in staged:
+                for name in row["labels"]:
+                    if name.lower() not in label_ids:
+                        missing_labels.setdefault(name.lower(), name)
+            if missing_labels:
+                created = session.execute(
+                    insert(Label).returning(Label.id, Label.name),
+                    [
+                        {"workspace_id": workspace_id, "name": name, "color": OrmQuery.generate_random_color()}
+                        for name in missing_labels.values()
+                    ],
+                ).all()
+                label_ids.update({name.lower(): label_id for label_id, name in created})
+
+            logins = {login for row, _ in staged for login in row["assignees"]}
+            user_ids = {}
+            if logins:
+                members = session.execute(
+                    select(User.id, User.email, User.username)
+                    .join(UserWorkspace, UserWorkspace.user_id == User.id)
+                    .where(
+                        UserWorkspace.workspace_id == workspace_id,
+                        or_(func.lower(User.email).in_([login.lower() for login in logins]), User.username.in_(logins)),
+                    )
+                ).all()
+                for user_id, email, username in members:
+                    if username:
+                        user_ids.setdefault(username, user_id)
+                    if email:
+                        user_ids[email.lower()] = user_id
+            unknown_assignees = sorted(
+                login for login in logins if login not in user_ids and login.lower() not in user_ids
+            )
+
+            # Ранги: задачи каждой колонки встают после её последней задачи в порядке файла
+            per_column: dict[int, int] = {}
+            for _, column_id in staged:
+                per_column[column_id] = per_column.get(column_id, 0) + 1
+            if per_column:
+                OrmQuery.lock_columns(per_column, session=session)
+            last_ranks = dict(session.execute(
+                select(Task.column_id, func.max(Task.rank))
+                .where(Task.column_id.in_(per_column.keys()), Task.archived_at.is_(None))
+                .group_by(Task.column_id)
+            ).all()) if per_column else {}
+            ranks = {
+                column_id: iter(keys_between(last_ranks.get(column_id), None, count))
+                for column_id, count in per_column.items()
+            }
+
+            counter_keys = []
+            if staged:
+                raw = session.connection().connection.driver_connection
+                with raw.cursor() as cursor:
+                    cursor.execute(
+                        "CREATE TEMP TABLE task_import ("
+                        " title text, description text, priority text, due_date timestamp,"
+                        " column_id integer, rank text, label_ids integer[], user_ids integer[], task_id integer"
+                        ") ON COMMIT DROP"
+                    )
+                    with cursor.copy(
+                        "COPY task_import (title, description, priority, due_date, column_id, rank, label_ids, user_ids)"
+                        " FROM STDIN"
+                    ) as copy:
+                        copy.set_types(["text", "text", "text", "timestamp", "int4", "text", "int4[]", "int4[]"])
+                        for row, column_id in staged:
+                            assignees = list(dict.fromkeys(
+                                user_ids.get(login, user_ids.get(login.lower())) for login in row["assignees"]
+                                if login in user_ids or login.lower() in user_ids
+                            ))
+                            counter_keys += OrmQuery.task_counter_keys(board_id, column_id, assignees)
+                            copy.write_row((
+                                row["title"], row["description"], row["priority"], row["due_date"],
+                                column_id, next(ranks[column_id]),
+                                list(dict.fromkeys(label_ids[name.lower()] for name in row["labels"])),
+                                assignees,
+                            ))
+
+                # id выдаём заранее из последовательности tasks, чтобы связать метки и исполнителей
+                session.execute(text("UPDATE task_import SET task_id = nextval(pg_get_serial_sequence('tasks', 'id'))"))
+                session.execute(text(
+                    "INSERT INTO tasks (id, title, description, priority, due_date, column_id, rank, created_by,"
+                    " board_id, project_id, workspace_id)"
+                    " SELECT task_id, title, description, priority, due_date, column_id, rank, :created_by,"
+                    " :board_id, :project_id, :workspace_id FROM task_import"
+                ), {"created_by": created_by, "board_id": board_id, "project_id": project_id, "workspace_id": workspace_id})
+                session.execute(text(
+                    "INSERT INTO task_labels (task_id, label_id)"
+                    " SELECT task_id, unnest(label_ids) FROM task_import"
+                ))
+                session.execute(text(
+                    "INSERT INTO task_assignees (task_id, user_id)"
+                    " SELECT task_id, unnest(user_ids) FROM task_import"
+                ))
+                OrmQuery.bump_task_counters([], counter_keys, session=session)
+                OrmQuery.bump_board_versions(Board.id == board_id, session=session)
+
+            session.commit()
+            return {
+                "imported": len(staged),
+                "labels_created": len(missing_labels),
+                "errors": errors,
+                "unknown_assignees": unknown_assignees,
+            }
+
+    @staticmethod
+    def get_board_id_for_columns(column_ids: list[int], session: Session | None = None) -> int | None:
+
+        """
+            Возвращает ID доски, которой принадлежат все переданные колонки.
+            None — если какой-то колонки нет или колонки с разных досок.
+        """
+
+        with use_session(session) as session:
+            rows = session.execute(
+                select(Column.id, Column.board_id).where(Column.id.in_(column_ids))
+            ).all()
+            board_ids = {board_id for _, board_id in rows}
+            if len(rows) != len(set(column_ids)) or len(board_ids) != 1:
+                return None
+            return board_ids.pop()
+
+    @staticmethod
+    def update_column_positions(board_id: int, positions: dict[int, int], session: Session | None = None) -> bool:
+
+        """
+            Обновляет позиции колонок доски одним UPDATE ... SET position = CASE id ... END.
+            positions: {column_id: position}.
+            Возвращает False (без изменений), если обновлены не все колонки.
+        """
+
+        with use_session(session) as session:
+            stmt = (
+                update(Column)
+                .where(Column.board_id == board_id, Column.id.in_(positions.keys()))
+                .values(position=case(positions, value=Column.id))
+                .execution_options(synchronize_session=False)
+            )
+            result = session.execute(stmt)
+            if result.rowcount != len(positions):
+                session.rollback()
+                return False
+            OrmQuery.bump_board_versions(Board.id == board_id, session=session)
+            session.commit()
+            return True
+
+    @staticmethod
+    def get_project_by_id(projects_id: int, session: Session | None = None):
         """
         Возвращает проект по его ID.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             project = session.query(Project).filter(Project.id == projects_id).first()
             return project
 
 
     @staticmethod
-    def create_project(project: ProjectCreate):
+    def create_project(project: ProjectCreate, session: Session | None = None):
         """
         Создает новый проект.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             new_project = Project(
                 title=project.title,
                 workspaces_id=project.workspaces_id
             )
             session.add(new_project)
             session.commit()
-            session.refresh(new_project)
             return new_project
 
     @staticmethod
-    def update_project_title(project_id: int, new_title: str):
+    def update_project_title(project_id: int, new_title: str, session: Session | None = None):
         """
         Обновляет название проекта.
         """
-        with session_factory() as session:
-            project = session.query(Project).filter(Project.id == project_id).first()
-            if not project:
-                return None
-            project.title = new_title
+        with use_session(session) as session:
+            # UPDATE ... RETURNING: одна команда вместо SELECT + UPDATE + SELECT
+            project = session.scalars(
+                update(Project).where(Project.id == project_id).values(title=new_title).returning(Project)
+            ).first()
+            # Название проекта входит в представление каждой его доски
+            OrmQuery.bump_board_versions(Board.projects_id == project_id, session=session)
             session.commit()
-            session.refresh(project)
             return project
 
     @staticmethod
-    def create_board(board: BoardCreate):
+    def create_board(board: BoardCreate, session: Session | None = None):
         """
         Создает доску и добавляет стандартные колонки.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             # Создаем доску
             new_board = Board(
                 title=board.title,
@@ -373,69 +1069,88 @@ class OrmQuery:
                 session.add(Column(title=col_title, board_id=new_board.id, position=idx, color_id=1))
 
             session.commit()
-            session.refresh(new_board)
             return new_board
         
     @staticmethod
-    def update_board_title(board_id: int, new_title: str):
+    def update_board_title(board_id: int, new_title: str, session: Session | None = None):
         """
         Обновляет название доски.
         """
-        with session_factory() as session:
-            board = session.query(Board).filter(Board.id == board_id).first()
-            if not board:
+        with use_session(session) as session:
+            # UPDATE ... RETURNING: одна команда вместо SELECT + UPDATE + SELECT
+            board = session.scalars(
+                update(Board).where(Board.id == board_id).values(title=new_title, version=Board.version + 1).returning(Board)
+            ).first()
+            session.commit()
+            return board
+
+    @staticmethod
+    def update_board_archive_policy(board_id: int, column_id: int | None, after_days: int | None, session: Session | None = None) -> Board | None:
+        """
+        Задаёт политику архивации доски: задачи колонки column_id архивируются
+        через after_days дней. column_id=None отключает архивацию.
+        Возвращает None, если доски нет или колонка не с этой доски.
+        """
+        with use_session(session) as session:
+            if column_id is not None and not session.execute(
+                select(Column.id).where(Column.id == column_id, Column.board_id == board_id)
+            ).first():
                 return None
-            board.title = new_title
+            board = session.scalars(
+                update(Board).where(Board.id == board_id)
+                .values(archive_column_id=column_id, archive_after_days=after_days if column_id is not None else None)
+                .returning(Board)
+            ).first()
             session.commit()
-            session.refresh(board)
             return board
         
     @classmethod
-    def get_available_colors(cls):
-        with session_factory() as session:
+    def get_available_colors(cls, session: Session | None = None):
+        with use_session(session) as session:
             return session.query(ColorPalette).filter_by(is_active=True).all()
         
     @classmethod
-    def get_column_by_id(cls, column_id: int):
+    def get_column_by_id(cls, column_id: int, session: Session | None = None):
         """Получить колонку по ID"""
-        with session_factory() as session:
+        with use_session(session) as session:
             return session.query(Column).filter(Column.id == column_id).first()
 
     @classmethod
-    def get_color_by_id(cls, color_id: int):
+    def get_color_by_id(cls, color_id: int, session: Session | None = None):
         """Получить цвет по ID"""
-        with session_factory() as session:
+        with use_session(session) as session:
             return session.query(ColorPalette).filter(ColorPalette.id == color_id).first()
 
     @classmethod
-    def update_column_color(cls, column_id: int, color_id: int):
+    def update_column_color(cls, column_id: int, color_id: int, session: Session | None = None):
         """Обновить цвет колонки"""
-        with session_factory() as session:
+        with use_session(session) as session:
             column = session.query(Column).filter(Column.id == column_id).first()
             if column:
                 column.color_id = color_id
+                OrmQuery.bump_board_versions(Board.id == column.board_id, session=session)
                 session.commit()
-                session.refresh(column)
                 # Загружаем связанные данные цвета
                 column.color
             return column
         
     @staticmethod
-    def update_column_title(column_id: int, new_title: str):
+    def update_column_title(column_id: int, new_title: str, session: Session | None = None):
         """
         Обновляет название колонки.
         """
-        with session_factory() as session:
-            column = session.query(Column).filter(Column.id == column_id).first()
-            if not column:
-                return None
-            column.title = new_title
+        with use_session(session) as session:
+            # UPDATE ... RETURNING: одна команда вместо SELECT + UPDATE + SELECT
+            column = session.scalars(
+                update(Column).where(Column.id == column_id).values(title=new_title).returning(Column)
+            ).first()
+            if column:
+                OrmQuery.bump_board_versions(Board.id == column.board_id, session=session)
             session.commit()
-            session.refresh(column)
             return column
         
     @staticmethod
-    def create_column(board_id: int, title: str, position: int, color_id: int = 1, user_id: Optional[int] = None):
+    def create_column(board_id: int, title: str, position: int, color_id: int = 1, user_id: Optional[int] = None, session: Session | None = None):
         """
         Создает новую колонку в доске.
         Всегда устанавливает color_id == 1.
@@ -450,7 +1165,7 @@ class OrmQuery:
         Returns:
             Column объект или None, если доска не найдена или нет доступа
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             # Получаем доску с проектом
             board = (
                 session.query(Board)
@@ -495,12 +1210,12 @@ class OrmQuery:
                 )
                 session.add(new_column)
                 session.flush()  # Получаем ID без коммита
+                OrmQuery.bump_board_versions(Board.id == board_id, session=session)
                 
                 # Проверяем, что объект был добавлен
                 logger.info(f"Создание колонки: title={title}, board_id={board_id}, position={position}, color_id={color_id}")
                 
                 session.commit()
-                session.refresh(new_column)
                 
                 logger.info(f"Колонка успешно создана с ID={new_column.id}")
                 return new_column
@@ -514,7 +1229,7 @@ class OrmQuery:
                 raise
         
     @staticmethod
-    def accept_invite(token: str, user_id: int):
+    def accept_invite(token: str, user_id: int, session: Session | None = None):
         """
         Принимает приглашение по токену и связывает пользователя с воркспейсом.
         Возвращает:
@@ -523,7 +1238,7 @@ class OrmQuery:
          - None если токен недействителен/неактивен
         """
         # Проверяем токен приглашения
-        with session_factory() as session:
+        with use_session(session) as session:
             invite = session.query(WorkspaceInvite).filter(
                 WorkspaceInvite.token == token,
                 WorkspaceInvite.is_active == True
@@ -555,11 +1270,11 @@ class OrmQuery:
                 pass
 
             session.commit()
-            session.refresh(link)
+            acl_cache.invalidate_membership(user_id, invite.workspace_id)
             return {"status": "ok", "link": link}
 
     @staticmethod
-    def create_invite(user_id: int) -> WorkspaceInvite | None:
+    def create_invite(user_id: int, session: Session | None = None) -> WorkspaceInvite | None:
         """
         Создаёт приглашение для воркспейса, связанного с user_id.
         Требует реальный user_id (создателя) — он будет записан в created_by_id (NOT NULL).
@@ -567,9 +1282,9 @@ class OrmQuery:
         """
         import secrets
 
-        with session_factory() as session:
+        with use_session(session) as session:
             # Получаем воркспейс пользователя через существующий метод
-            workspace = OrmQuery.get_workspace_by_user_id(user_id)
+            workspace = OrmQuery.get_workspace_by_user_id(user_id, session=session)
             if workspace is None:
                 return None
 
@@ -599,17 +1314,16 @@ class OrmQuery:
             )
             session.add(new_invite)
             session.commit()
-            session.refresh(new_invite)
             return new_invite
 
     @staticmethod
-    def delete_invite(token: str, user_id: int) -> bool:
+    def delete_invite(token: str, user_id: int, session: Session | None = None) -> bool:
         """
         Удаляет (деактивирует) инвайт по токену.
         Проверяет, что пользователь является владельцем workspace.
         Возвращает True при успехе, False если токен не найден или нет прав.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             # Находим инвайт
             invite = session.query(WorkspaceInvite).filter(
                 WorkspaceInvite.token == token,
@@ -620,7 +1334,7 @@ class OrmQuery:
                 return False
             
             # Проверяем права пользователя на workspace
-            user_role = OrmQuery.get_user_workspace_role(user_id, invite.workspace_id)
+            user_role = OrmQuery.get_user_workspace_role(user_id, invite.workspace_id, session=session)
             if user_role != "owner":
                 return False
             
@@ -630,12 +1344,12 @@ class OrmQuery:
             return True
 
     @staticmethod
-    def create_user_project_access(project_id: int, user_id: int, can_edit: bool = False, can_view: bool = True):
+    def create_user_project_access(project_id: int, user_id: int, can_edit: bool = False, can_view: bool = True, session: Session | None = None):
         """
         Создать или обновить запись в user_project_accesses.
         Возвращает объект UserProjectAccess или None (если проект/пользователь не найдены).
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             # Проверяем существование проекта и пользователя
             project = session.query(Project).filter(Project.id == project_id).first()
             user = session.query(User).filter(User.id == user_id).first()
@@ -652,7 +1366,7 @@ class OrmQuery:
                 existing.can_view = can_view
                 session.add(existing)
                 session.commit()
-                session.refresh(existing)
+                acl_cache.invalidate_project_access(user_id, project_id)
                 return existing
 
             new_access = UserProjectAccess(
@@ -663,26 +1377,26 @@ class OrmQuery:
             )
             session.add(new_access)
             session.commit()
-            session.refresh(new_access)
+            acl_cache.invalidate_project_access(user_id, project_id)
             return new_access
 
     @staticmethod
-    def get_users_project_access(project_id: int):
+    def get_users_project_access(project_id: int, session: Session | None = None):
         """
         Получить все записи доступа к проекту по project_id.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             accesses = session.query(UserProjectAccess).filter(
                 UserProjectAccess.project_id == project_id
             ).all()
             return accesses
 
     @staticmethod
-    def get_user_project_accesses(user_id: int, workspace_id: int) -> List[int]:
+    def get_user_project_accesses(user_id: int, workspace_id: int, session: Session | None = None) -> List[int]:
         """
         Получить список ID проектов, к которым у пользователя есть доступ в workspace.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             # Получаем все проекты workspace
             workspace_projects = session.query(Project).filter(
                 Project.workspaces_id == workspace_id
@@ -701,12 +1415,12 @@ class OrmQuery:
             return [a.project_id for a in accesses]
 
     @staticmethod
-    def update_user_workspace_role(user_id: int, workspace_id: int, role: str) -> bool:
+    def update_user_workspace_role(user_id: int, workspace_id: int, role: str, session: Session | None = None) -> bool:
         """
         Обновить роль пользователя в workspace.
         Возвращает True, если обновление успешно, False, если связь не найдена.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             user_workspace = session.query(UserWorkspace).filter(
                 UserWorkspace.user_id == user_id,
                 UserWorkspace.workspace_id == workspace_id
@@ -731,16 +1445,17 @@ class OrmQuery:
             
             session.add(user_workspace)
             session.commit()
+            acl_cache.invalidate_membership(user_id, workspace_id)
             return True
 
     @staticmethod
-    def update_user_project_accesses(user_id: int, workspace_id: int, project_ids: List[int]) -> bool:
+    def update_user_project_accesses(user_id: int, workspace_id: int, project_ids: List[int], session: Session | None = None) -> bool:
         """
         Обновить список проектов, к которым у пользователя есть доступ.
         Удаляет старые доступы и создает новые.
         Возвращает True, если обновление успешно.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             # Проверяем, что пользователь является участником workspace
             user_workspace = session.query(UserWorkspace).filter(
                 UserWorkspace.user_id == user_id,
@@ -788,15 +1503,33 @@ class OrmQuery:
                 session.add(new_access)
             
             session.commit()
+            acl_cache.invalidate_project_access(user_id)
             return True
 
     @staticmethod
-    def get_user_workspace_role(user_id: int, workspace_id: int) -> str | None:
+    def has_project_view_access(user_id: int, project_id: int, session: Session | None = None) -> bool:
+        """
+        Проверяет наличие записи UserProjectAccess с правом просмотра.
+        """
+        with use_session(session) as session:
+            return session.execute(queries.project_view_access_stmt(user_id, project_id)).first() is not None
+
+    @staticmethod
+    def resolve_access(user_id: int, task_id: int | None = None, column_id: int | None = None, board_id: int | None = None, session: Session | None = None):
+        """
+        Возвращает строку (project_id, workspace_id, role, has_project_access) для задачи,
+        колонки или доски одним запросом (см. queries.access_stmt), None — объект не найден.
+        """
+        with use_session(session) as session:
+            return session.execute(queries.access_stmt(user_id, task_id, column_id, board_id)).first()
+
+    @staticmethod
+    def get_user_workspace_role(user_id: int, workspace_id: int, session: Session | None = None) -> str | None:
         """
         Получить роль пользователя в workspace.
         Возвращает роль ('owner', 'admin', 'member', 'guest') или None, если связь не найдена.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             user_workspace = session.query(UserWorkspace).filter(
                 UserWorkspace.user_id == user_id,
                 UserWorkspace.workspace_id == workspace_id
@@ -804,78 +1537,77 @@ class OrmQuery:
             return user_workspace.role if user_workspace else None
 
     @staticmethod
-    def delete_project(project_id: int) -> bool:
+    def delete_project(project_id: int, session: Session | None = None) -> bool:
         """
-        Удаляет проект по его ID вместе со всеми связанными сущностями:
-        - Досками (boards)
-        - Колонками (columns)
-        - Задачами (tasks) 
-        - Правами доступа (user_project_accesses)
-        
+        Удаляет проект по его ID одним DELETE. Доски, колонки, задачи с комментариями,
+        метками и исполнителями, а также права доступа удаляет БД (ON DELETE CASCADE).
+
         Возвращает True, если проект был удален, False, если проект не найден.
         """
-        with session_factory() as session:
-            project = session.query(Project).filter(Project.id == project_id).first()
-            if not project:
-                return False
-            
-            # Получаем все доски проекта
-            boards = session.query(Board).filter(Board.projects_id == project_id).all()
-            
-            for board in boards:
-                # Получаем все колонки доски
-                columns = session.query(Column).filter(Column.board_id == board.id).all()
-                
-                for column in columns:
-                    # Удаляем все задачи колонки
-                    session.query(Task).filter(Task.column_id == column.id).delete()
-                
-                # Удаляем все колонки доски
-                session.query(Column).filter(Column.board_id == board.id).delete()
-            
-            # Удаляем все доски проекта
-            session.query(Board).filter(Board.projects_id == project_id).delete()
-            
-            # Удаляем все права доступа к проекту
-            session.query(UserProjectAccess).filter(UserProjectAccess.project_id == project_id).delete()
-            
-            # Удаляем сам проект
-            session.delete(project)
+        with use_session(session) as session:
+            result = session.execute(delete(Project).where(Project.id == project_id))
             session.commit()
-            return True
+            acl_cache.invalidate_project(project_id)
+            return result.rowcount > 0
 
     @staticmethod
-    def delete_board(board_id: int) -> bool:
+    def delete_board(board_id: int, session: Session | None = None) -> bool:
         """
-        Удаляет доску по её ID вместе со всеми связанными сущностями:
-        - Колонками (columns)
-        - Задачами (tasks)
-        
+        Удаляет доску по её ID одним DELETE; колонки и задачи удаляются каскадно.
+
         Возвращает True, если доска была удалена, False, если доска не найдена.
         """
-        with session_factory() as session:
-            board = session.query(Board).filter(Board.id == board_id).first()
-            if not board:
-                return False
-            
-            # Получаем все колонки доски
-            columns = session.query(Column).filter(Column.board_id == board_id).all()
-            
-            for column in columns:
-                # Удаляем все задачи колонки
-                session.query(Task).filter(Task.column_id == column.id).delete()
-            
-            # Удаляем все колонки доски
-            session.query(Column).filter(Column.board_id == board_id).delete()
-            
-            # Удаляем саму доску
-            session.delete(board)
+        with use_session(session) as session:
+            result = session.execute(delete(Board).where(Board.id == board_id))
             session.commit()
-            return True
+            return result.rowcount > 0
+
+    @staticmethod
+    def delete_project_in_chunks(project_id: int, chunk_size: int = DELETE_CHUNK_SIZE, session: Session | None = None) -> bool:
+        """
+        Фоновое удаление большого проекта: задачи удаляются пачками по chunk_size
+        в отдельных транзакциях, затем сам проект одним DELETE.
+        """
+        deleted = OrmQuery._delete_in_chunks(
+            delete(Project).where(Project.id == project_id), Board.projects_id == project_id, Task.project_id == project_id, chunk_size, session
+        )
+        acl_cache.invalidate_project(project_id)
+        return deleted
+
+    @staticmethod
+    def delete_board_in_chunks(board_id: int, chunk_size: int = DELETE_CHUNK_SIZE, session: Session | None = None) -> bool:
+        """
+        Фоновое удаление большой доски (см. delete_project_in_chunks).
+        """
+        return OrmQuery._delete_in_chunks(delete(Board).where(Board.id == board_id), Board.id == board_id, Task.board_id == board_id, chunk_size, session)
+
+    @staticmethod
+    def _delete_in_chunks(root_delete, board_filter, task_filter, chunk_size: int, session: Session | None = None) -> bool:
+        # Короткие транзакции не держат блокировки и не раздувают WAL одним огромным DELETE
+        with use_session(session) as session:
+            # Доски уходят целиком: их счётчики обнуляются вместе с первой пачкой,
+            # а не при финальном каскадном DELETE
+            session.execute(delete(TaskCounter).where(
+                TaskCounter.board_id.in_(select(Board.id).where(board_filter))
+            ))
+            while True:
+                chunk = select(Task.id).where(task_filter).limit(chunk_size)
+                deleted = session.execute(
+                    delete(Task).where(Task.id.in_(chunk)).execution_options(synchronize_session=False)
+                ).rowcount
+                # Каждая пачка меняет доску: ETag и кэш представления не должны отдавать удалённые задачи
+                OrmQuery.bump_board_versions(board_filter, session=session)
+                session.commit()
+                if deleted < chunk_size:
+                    break
+            result = session.execute(root_delete)
+            session.commit()
+            logger.info(f"Фоновое удаление завершено: {root_delete.table.name}, строк={result.rowcount}")
+            return result.rowcount > 0
 
     @staticmethod
     def update_user(user_id: int, first_name: str | None = None, last_name: str | None = None, 
-                   username: str | None = None, avatar_file = None) -> User | None:
+                   username: str | None = None, avatar_file = None, session: Session | None = None) -> User | None:
         """
         Обновляет данные пользователя.
         Если передан avatar_file (UploadFile), сохраняет его и обновляет avatar_url.
@@ -883,7 +1615,7 @@ class OrmQuery:
         """
         from core.avatar_generator import save_avatar_file
         
-        with session_factory() as session:
+        with use_session(session) as session:
             user = session.query(User).filter(User.id == user_id).first()
             if not user:
                 return None
@@ -901,17 +1633,23 @@ class OrmQuery:
                 new_avatar_url = save_avatar_file(avatar_file, old_avatar_url)
                 user.avatar_url = new_avatar_url
             
+            # Имя и аватар исполнителя показываются на карточках: меняется версия досок с его задачами
+            active = Task.archived_at.is_(None)
+            OrmQuery.bump_board_versions(or_(
+                Board.id.in_(select(Task.board_id).where(Task.assigned_to == user_id, active)),
+                Board.id.in_(select(Task.board_id).join(TaskAssignee, TaskAssignee.task_id == Task.id).where(TaskAssignee.user_id == user_id, active)),
+            ), session=session)
             session.commit()
-            session.refresh(user)
+            invalidate_user(user.id, user.email)
             return user
 
     @staticmethod
-    def create_comment(task_id: int, user_id: int, content: str) -> Comment | None:
+    def create_comment(task_id: int, user_id: int, content: str, session: Session | None = None) -> Comment | None:
         """
         Создаёт комментарий к задаче.
         Возвращает объект Comment или None, если задача не найдена.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             task = session.query(Task).filter(Task.id == task_id).first()
             if not task:
                 return None
@@ -923,52 +1661,26 @@ class OrmQuery:
             )
             session.add(new_comment)
             session.commit()
-            session.refresh(new_comment)
             return new_comment
 
     @staticmethod
-    def get_user_tasks(user_id: int, workspace_id: Optional[int] = None):
+    def get_user_tasks(
+        user_id: int,
+        workspace_id: Optional[int] = None,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        session: Session | None = None
+    ):
         """
         Возвращает задачи, назначенные пользователю.
         Учитывает как старое поле assigned_to, так и новую таблицу TaskAssignee.
         Если передан workspace_id, возвращает только задачи из проектов этого workspace.
+        after/limit — keyset-пагинация по (created_at, id) от новых к старым.
         Загружает связанные данные: column, board, project, workspace, author.
         """
-        with session_factory() as session:
-            # Базовый запрос с подгрузкой всех связей
-            # Ищем задачи, назначенные через старое поле assigned_to ИЛИ через TaskAssignee
-            query = (
-                session.query(Task)
-                .options(
-                    joinedload(Task.column).joinedload(Column.board).joinedload(Board.project).joinedload(Project.workspace),
-                    joinedload(Task.column).joinedload(Column.color),  # загружаем цвет колонки
-                    joinedload(Task.author),
-                    joinedload(Task.assignee_links).joinedload(TaskAssignee.user)  # загружаем множественных исполнителей
-                )
-            )
-            
-            # Если указан workspace_id, сначала фильтруем по нему через join
-            if workspace_id is not None:
-                query = (
-                    query.join(Column, Task.column_id == Column.id)
-                    .join(Board, Column.board_id == Board.id)
-                    .join(Project, Board.projects_id == Project.id)
-                    .filter(Project.workspaces_id == workspace_id)
-                )
-            
-            # Затем добавляем outerjoin с TaskAssignee и фильтруем по пользователю
-            query = (
-                query.outerjoin(TaskAssignee, Task.id == TaskAssignee.task_id)
-                .filter(
-                    or_(
-                        Task.assigned_to == user_id,  # старое поле
-                        TaskAssignee.user_id == user_id  # новая таблица множественных исполнителей
-                    )
-                )
-                .distinct()  # избегаем дубликатов, если задача назначена и через старое поле, и через TaskAssignee
-            )
-            
-            return query.order_by(Task.created_at.desc()).all()
+        with use_session(session) as session:
+            stmt = queries.user_tasks_stmt(user_id, workspace_id, after=after, limit=limit)
+            return session.execute(stmt).unique().scalars().all()
 
     @staticmethod
     def generate_random_color() -> str:
@@ -986,13 +1698,13 @@ class OrmQuery:
         return random.choice(tag_colors)
 
     @staticmethod
-    def create_label(workspace_id: int, name: str, color: str | None = None) -> Label | None:
+    def create_label(workspace_id: int, name: str, color: str | None = None, session: Session | None = None) -> Label | None:
         """
         Создаёт новый тег в рабочем пространстве.
         Если цвет не передан, генерируется случайный цвет.
         Возвращает объект Label или None, если пространство не найдено.
         """
-        with session_factory() as session:
+        with use_session(session) as session:
             workspace = session.query(Workspace).filter(Workspace.id == workspace_id).first()
             if not workspace:
                 return None
@@ -1007,7 +1719,6 @@ class OrmQuery:
             )
             session.add(new_label)
             session.commit()
-            session.refresh(new_label)
             return new_label
 
     @staticmethod
@@ -1017,7 +1728,10 @@ class OrmQuery:
         end_date: Optional[datetime] = None,
         column_id: Optional[int] = None,
         assigned_to: Optional[int] = None,
-        label_id: Optional[int] = None
+        label_id: Optional[int] = None,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        session: Session | None = None
     ):
         """
         Возвращает задачи для календаря с фильтрами.
@@ -1029,56 +1743,29 @@ class OrmQuery:
             column_id: ID колонки (статус) для фильтрации
             assigned_to: ID пользователя (исполнитель) для фильтрации
             label_id: ID тега для фильтрации
+            after: ключ (due_date, id) последней задачи предыдущей страницы
+            limit: размер страницы
         
         Returns:
             Список задач с подгруженными связями
         """
-        with session_factory() as session:
-            query = (
-                session.query(Task)
-                .join(Column, Task.column_id == Column.id)
-                .filter(Column.board_id == board_id)
-                .options(
-                    joinedload(Task.assignee),
-                    joinedload(Task.assignee_links).joinedload(TaskAssignee.user),  # Загружаем множественных исполнителей через TaskAssignee
-                    joinedload(Task.labels),
-                    joinedload(Task.column)
-                )
+        with use_session(session) as session:
+            stmt = queries.calendar_tasks_stmt(
+                board_id=board_id,
+                start_date=start_date,
+                end_date=end_date,
+                column_id=column_id,
+                assigned_to=assigned_to,
+                label_id=label_id,
+                after=after,
+                limit=limit
             )
-            
-            # Фильтр по дате (due_date) - показываем только задачи с датами
-            query = query.filter(Task.due_date.isnot(None))
-            if start_date:
-                query = query.filter(Task.due_date >= start_date)
-            if end_date:
-                query = query.filter(Task.due_date <= end_date)
-            
-            # Фильтр по статусу (column_id)
-            if column_id:
-                query = query.filter(Task.column_id == column_id)
-            
-            # Фильтр по исполнителю
-            if assigned_to:
-                query = query.filter(Task.assigned_to == assigned_to)
-            
-            # Фильтр по тегу
-            if label_id:
-                query = query.join(TaskLabel, Task.id == TaskLabel.task_id).filter(
-                    TaskLabel.label_id == label_id
-                )
-            
-            return query.order_by(Task.due_date.asc(), Task.created_at.asc()).all()
+            return session.execute(stmt).unique().scalars().all()
 
     @staticmethod
-    def get_columns_by_board_id(board_id: int):
+    def get_columns_by_board_id(board_id: int, session: Session | None = None):
         """
         Возвращает все колонки доски без задач.
         """
-        with session_factory() as session:
-            return (
-                session.query(Column)
-                .filter(Column.board_id == board_id)
-                .options(joinedload(Column.color))
-                .order_by(Column.position.asc())
-                .all()
-            )
\ No newline at end of file
+        with use_session(session) as session:
+            return session.execute(queries.columns_by_board_stmt(board_id)).scalars().all()
\ No newline at end of file
@@ -1,18 +1,78 @@
+from contextlib import contextmanager, asynccontextmanager
+from typing import Iterator, AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from fastapi import Depends
 
 from core.config import settings
+from db.pool_metrics import instrumented_pool_class
+from db.routing import RoutingSession, AsyncRoutingSession, USE_REPLICA
+
+# Параметры пула задаются через Settings (DB_POOL_*); пул считается на процесс uvicorn
+engine = create_engine(
+    url=settings.DATABASE_URL,
+    poolclass=instrumented_pool_class(QueuePool, "sync"),
+    **settings.DB_POOL_OPTIONS,
+)
+
+# RoutingSession может отправлять чтения на реплики (DB_REPLICA_URLS), см. prefer_replica
+# expire_on_commit=False: объекты остаются актуальными после commit без повторного SELECT
+session_factory = sessionmaker(engine, expire_on_commit=False, class_=RoutingSession)
 
-engine = create_engine(url=settings.DATABASE_URL)
+# Асинхронный движок (psycopg async) для эндпоинтов, работающих прямо в event loop
+async_engine = create_async_engine(
+    url=settings.DATABASE_URL,
+    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, "async"),
+    **settings.DB_POOL_OPTIONS,
+)
 
-session_factory = sessionmaker(engine)
+# expire_on_commit=False: в асинхронной сессии ленивые загрузки после commit недоступны
+async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False, sync_session_class=AsyncRoutingSession)
 
 class Base(DeclarativeBase):
     pass
 
 def get_db() -> Session:
+    # Одна сессия на запрос: её разделяют get_current_user, проверки прав и OrmQuery
     db = session_factory()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db() -> AsyncSession:
+    async with async_session_factory() as db:
+        yield db
+
+def prefer_replica(db: Session = Depends(get_db)) -> None:
+    # Зависимость для read-only эндпоинтов: разрешает сессии запроса читать с реплики
+    db.info[USE_REPLICA] = True
+
+async def prefer_replica_async(db: AsyncSession = Depends(get_async_db)) -> None:
+    db.info[USE_REPLICA] = True
+
+@contextmanager
+def use_session(session: Session | None = None) -> Iterator[Session]:
+    '''
+    Возвращает переданную сессию запроса (не закрывая её)
+    или открывает новую, если метод вызван вне запроса.
+    '''
+    if session is not None:
+        yield session
+        return
+    with session_factory() as new_session:
+        yield new_session
+
+@asynccontextmanager
+async def use_async_session(session: AsyncSession | None = None) -> AsyncIterator[AsyncSession]:
+    '''
+    Асинхронный аналог use_session.
+    '''
+    if session is not None:
+        yield session
+        return
+    async with async_session_factory() as new_session:
+        yield new_session
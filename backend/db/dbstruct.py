@@ -1,4 +1,5 @@
-from sqlalchemy import Integer, String, Boolean, ForeignKey, Column, DateTime, Text, Table
+from sqlalchemy import Integer, String, Boolean, ForeignKey, Column, DateTime, Text, Table, Index, Computed, func, literal, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from typing import Optional, List
 from datetime import datetime
@@ -6,17 +7,26 @@ import uuid
 
 from db.database import Base
 
+# Время создания проставляет сама БД: INSERT ... RETURNING сразу возвращает его
+# вместе с id, без отдельного SELECT после commit
+UTC_NOW = func.timezone('utc', func.now())
+
+# Конфигурация полнотекстового поиска (морфология русского языка)
+SEARCH_CONFIG = "russian"
+# Текст длиннее обрезается перед to_tsvector: tsvector ограничен 1 МБ
+SEARCH_TEXT_LIMIT = 100_000
+
 class User(Base):
     __tablename__ = 'users'
 
     id: Mapped[int] = mapped_column(primary_key=True)
     first_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     last_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    username: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    email: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    username: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
+    email: Mapped[Optional[str]] = mapped_column(String, nullable=True, unique=True, index=True)
     password: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     avatar_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
 
     workspaces: Mapped[List["Workspace"]] = relationship(
         "Workspace",
@@ -45,13 +55,27 @@ class User(Base):
     )
     task_assignee_links: Mapped[List["TaskAssignee"]] = relationship(back_populates="user")
 
+# Строка автодополнения пользователей: username, имя, фамилия и email в нижнем регистре.
+# Триграммный GIN-индекс по ней обслуживает и ILIKE '%...%', и нечёткое <% (pg_trgm);
+# запросы должны использовать именно это выражение, иначе индекс не подойдёт
+_EMPTY, _SPACE = literal("", literal_execute=True), literal(" ", literal_execute=True)  # константы, а не параметры: как в индексе
+USER_SEARCH_TEXT = func.lower(
+    func.coalesce(User.username, _EMPTY).concat(_SPACE).concat(func.coalesce(User.first_name, _EMPTY))
+    .concat(_SPACE).concat(func.coalesce(User.last_name, _EMPTY))
+    .concat(_SPACE).concat(func.coalesce(User.email, _EMPTY))
+)
+Index(
+    "ix_users_search_trgm", USER_SEARCH_TEXT.label("search_text"),
+    postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+)
+
 class Workspace(Base):
     __tablename__ = 'workspaces'
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
 
     users: Mapped[List["User"]] = relationship(
         "User",
@@ -71,24 +95,35 @@ class Project(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    workspaces_id: Mapped[int] = mapped_column(ForeignKey("workspaces.id"))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    workspaces_id: Mapped[int] = mapped_column(ForeignKey("workspaces.id"), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
 
     workspace: Mapped["Workspace"] = relationship(back_populates="projects")
-    boards: Mapped[List["Board"]] = relationship(back_populates="project")
+    # Дочерние строки удаляет сама БД (ON DELETE CASCADE)
+    boards: Mapped[List["Board"]] = relationship(back_populates="project", passive_deletes=True)
 
-    user_accesses: Mapped[List["UserProjectAccess"]] = relationship(back_populates="project")
+    user_accesses: Mapped[List["UserProjectAccess"]] = relationship(back_populates="project", passive_deletes=True)
 
 class Board(Base):
     __tablename__ = 'boards'
     
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    projects_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    projects_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    # Политика архивации: задачи, пролежавшие в колонке archive_column_id больше
+    # archive_after_days дней, архивирует фоновая задача (OrmQuery.archive_due_tasks)
+    archive_column_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("columns.id", ondelete="SET NULL", use_alter=True, name="fk_boards_archive_column_id"),
+        nullable=True,
+    )
+    archive_after_days: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Растёт при каждой записи, меняющей представление доски (OrmQuery.bump_board_versions);
+    # отдаётся как ETag в GET /api/boards/{id}/columns
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     
     project: Mapped["Project"] = relationship(back_populates="boards")
-    columns: Mapped[List["Column"]] = relationship(back_populates="board")
+    columns: Mapped[List["Column"]] = relationship(back_populates="board", passive_deletes=True, foreign_keys="Column.board_id")
 
 class ColorPalette(Base):
     __tablename__ = 'color_palettes'
@@ -106,86 +141,159 @@ class Column(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     position: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    board_id: Mapped[int] = mapped_column(ForeignKey("boards.id"))
+    board_id: Mapped[int] = mapped_column(ForeignKey("boards.id", ondelete="CASCADE"), index=True)
     color_id: Mapped[int] = mapped_column(ForeignKey("color_palettes.id"))
     
-    board: Mapped["Board"] = relationship(back_populates="columns")
-    tasks: Mapped[List["Task"]] = relationship(back_populates="column")
+    board: Mapped["Board"] = relationship(back_populates="columns", foreign_keys=[board_id])
+    tasks: Mapped[List["Task"]] = relationship(back_populates="column", order_by="[Task.rank, Task.id]", passive_deletes=True)
     color: Mapped["ColorPalette"] = relationship(back_populates="columns")
 
 class Task(Base):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Горячие запросы доски читают только неархивные задачи
+        Index("ix_tasks_column_id_rank", "column_id", "rank", postgresql_where=text("archived_at IS NULL")),
+        # Кандидаты на архивацию: колонка и время попадания в неё
+        Index("ix_tasks_archive_candidates", "column_id", "column_entered_at", postgresql_where=text("archived_at IS NULL")),
+        # Архив доски: keyset по (archived_at, id) от новых к старым
+        Index("ix_tasks_board_id_archived_at_id", "board_id", "archived_at", "id", postgresql_where=text("archived_at IS NOT NULL")),
+        # Ключи keyset-пагинации "моих задач" и календаря
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_due_date_id", "due_date", "id"),
+        # Календарь доски: фильтр по board_id и keyset по (due_date, id)
+        Index("ix_tasks_board_id_due_date_id", "board_id", "due_date", "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    assigned_to: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True)
+    assigned_to: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
     created_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True)
     priority: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
     due_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    column_id: Mapped[int] = mapped_column(ForeignKey("columns.id"))
+    column_id: Mapped[int] = mapped_column(ForeignKey("columns.id", ondelete="CASCADE"), index=True)
+    # Денормализованный путь column -> board -> project -> workspace: фильтры по доске,
+    # проекту и workspace без join. Обновляются вместе с column_id (OrmQuery.get_column_scopes)
+    board_id: Mapped[int] = mapped_column(ForeignKey("boards.id", ondelete="CASCADE"))
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), index=True)
+    workspace_id: Mapped[int] = mapped_column(ForeignKey("workspaces.id"), index=True)
+    # Ключ порядка внутри колонки (core/ranking.py); сравнивается побайтно
+    rank: Mapped[Optional[str]] = mapped_column(
+        String().with_variant(String(collation="C"), "postgresql"), nullable=True
+    )
+    # Когда задача попала в текущую колонку (обновляется при переносе) и когда ушла в архив.
+    # Архивные задачи не показываются на доске и не учитываются в task_counters
+    column_entered_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    archived_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Поисковый вектор считает сама БД: название весит больше описания (A > B)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', left(coalesce(description, ''), {SEARCH_TEXT_LIMIT})), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     
     assignee: Mapped["User"] = relationship(foreign_keys=[assigned_to], back_populates="assigned_tasks")
-    assignees: Mapped[List["User"]] = relationship("User", secondary="task_assignees", back_populates="assigned_tasks_many")
-    assignee_links: Mapped[List["TaskAssignee"]] = relationship(back_populates="task")
+    assignees: Mapped[List["User"]] = relationship("User", secondary="task_assignees", back_populates="assigned_tasks_many", passive_deletes=True)
+    assignee_links: Mapped[List["TaskAssignee"]] = relationship(back_populates="task", passive_deletes=True)
     author: Mapped["User"] = relationship(foreign_keys=[created_by])
     column: Mapped["Column"] = relationship(back_populates="tasks")
-    comments: Mapped[List["Comment"]] = relationship(back_populates="task")
-    labels: Mapped[List["Label"]] = relationship("Label", secondary="task_labels", back_populates="tasks")
+    comments: Mapped[List["Comment"]] = relationship(back_populates="task", passive_deletes=True)
+    labels: Mapped[List["Label"]] = relationship("Label", secondary="task_labels", back_populates="tasks", passive_deletes=True)
 
 class TaskLabel(Base):
     __tablename__ = 'task_labels'
+    __table_args__ = (
+        Index("uq_task_labels_task_id_label_id", "task_id", "label_id", unique=True),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"))
-    label_id: Mapped[int] = mapped_column(ForeignKey("labels.id"))
+    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"))
+    label_id: Mapped[int] = mapped_column(ForeignKey("labels.id"), index=True)
 
 class TaskAssignee(Base):
     __tablename__ = 'task_assignees'
+    __table_args__ = (
+        Index("uq_task_assignees_task_id_user_id", "task_id", "user_id", unique=True),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"))
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     
     user: Mapped["User"] = relationship("User", back_populates="task_assignee_links")
     task: Mapped["Task"] = relationship("Task", back_populates="assignee_links")
 
+class TaskCounter(Base):
+    """
+    Счётчики задач доски, поддерживаемые при каждой записи (OrmQuery.bump_task_counters).
+    kind: "board" (key_id = id доски), "column" (key_id = id колонки),
+    "assignee" (key_id = id пользователя из task_assignees).
+    """
+    __tablename__ = 'task_counters'
+
+    board_id: Mapped[int] = mapped_column(ForeignKey("boards.id", ondelete="CASCADE"), primary_key=True)
+    kind: Mapped[str] = mapped_column(String, primary_key=True)
+    key_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
 class UserWorkspace(Base):
     __tablename__ = 'user_workspaces'
+    __table_args__ = (
+        Index("uq_user_workspaces_user_id_workspace_id", "user_id", "workspace_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    workspace_id: Mapped[int] = mapped_column(ForeignKey("workspaces.id"))
+    workspace_id: Mapped[int] = mapped_column(ForeignKey("workspaces.id"), index=True)
     role: Mapped[str] = mapped_column(String, default="member")  # owner, admin, member, guest
     can_create_projects: Mapped[bool] = mapped_column(Boolean, default=False)
     can_invite_users: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
 
     user: Mapped["User"] = relationship(back_populates="workspace_links")
     workspace: Mapped["Workspace"] = relationship(back_populates="user_links")
 
 class UserProjectAccess(Base):
     __tablename__ = "user_project_accesses"
+    __table_args__ = (
+        Index("uq_user_project_accesses_user_id_project_id", "user_id", "project_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), index=True)
     can_edit: Mapped[bool] = mapped_column(Boolean, default=False)
     can_view: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
 
     user: Mapped["User"] = relationship(back_populates="project_accesses")
     project: Mapped["Project"] = relationship(back_populates="user_accesses")
 
 class Comment(Base):
     __tablename__ = 'comments'
+    __table_args__ = (
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"))
+    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{SEARCH_CONFIG}', left(coalesce(content, ''), {SEARCH_TEXT_LIMIT}))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     
     task: Mapped["Task"] = relationship(back_populates="comments")
     user: Mapped["User"] = relationship(back_populates="comments")
@@ -196,7 +304,7 @@ class Label(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     color: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    workspace_id: Mapped[int] = mapped_column(ForeignKey("workspaces.id"))
+    workspace_id: Mapped[int] = mapped_column(ForeignKey("workspaces.id"), index=True)
     
     workspace: Mapped["Workspace"] = relationship(back_populates="labels")
     tasks: Mapped[List["Task"]] = relationship("Task", secondary="task_labels", back_populates="labels")
@@ -208,7 +316,7 @@ class WorkspaceInvite(Base):
     workspace_id: Mapped[int] = mapped_column(ForeignKey("workspaces.id"))
     token: Mapped[str] = mapped_column(String, unique=True, index=True)
     created_by_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     used_count: Mapped[int] = mapped_column(Integer, default=0)
 
@@ -0,0 +1,109 @@
+"""
+Метрики пула соединений с БД.
+Пул движка подменяется подклассом, который замеряет время ожидания
+соединения (checkout) и считает таймауты. Остальные показатели
+(занято, переполнение, свободно) берутся у самого пула.
+"""
+import threading
+import time
+from typing import Type
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+# Верхние границы корзин гистограммы времени ожидания, мс
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    '''
+    Счётчики одного пула: количество выдач соединений, таймауты
+    и гистограмма времени ожидания соединения.
+    '''
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)  # последняя корзина — "+Inf"
+
+    def observe_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for i, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.buckets[i] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            observed = self.checkouts + self.timeouts
+            histogram = {f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS_MS, self.buckets)}
+            histogram["le_inf"] = self.buckets[-1]
+            wait = {
+                "count": observed,
+                "avg_ms": round(self.wait_total_ms / observed, 3) if observed else 0.0,
+                "max_ms": round(self.wait_max_ms, 3),
+                "histogram": histogram,
+            }
+            checkouts, timeouts = self.checkouts, self.timeouts
+
+        return {
+            "pool": self.name,
+            "pool_class": type(pool).__mro__[1].__name__,
+            "size": _call(pool, "size"),
+            "checked_out": _call(pool, "checkedout"),
+            "checked_in": _call(pool, "checkedin"),
+            "overflow": _call(pool, "overflow"),
+            "checkouts_total": checkouts,
+            "timeouts_total": timeouts,
+            "checkout_wait": wait,
+        }
+
+
+def _call(pool: Pool, method: str):
+    # У NullPool/StaticPool нет счётчиков QueuePool
+    func = getattr(pool, method, None)
+    return func() if callable(func) else None
+
+
+def instrumented_pool_class(base: Type[Pool], name: str) -> Type[Pool]:
+    '''
+    Возвращает подкласс base, замеряющий ожидание в connect().
+    Метрики хранятся в атрибуте класса, поэтому переживают
+    pool.recreate() (он создаёт экземпляр того же класса).
+    '''
+    metrics = PoolMetrics(name)
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = base.connect(self)
+        except exc.TimeoutError:
+            metrics.observe_wait((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        metrics.observe_wait((time.perf_counter() - started) * 1000)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"metrics": metrics, "connect": connect})
+
+
+def pool_snapshot(pool: Pool) -> dict:
+    metrics: PoolMetrics | None = getattr(pool, "metrics", None)
+    if metrics is None:
+        return {"pool_class": type(pool).__name__, "size": _call(pool, "size"), "checked_out": _call(pool, "checkedout")}
+    return metrics.snapshot(pool)
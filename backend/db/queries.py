@@ -0,0 +1,507 @@
+"""
+Построители SELECT-запросов, общие для OrmQuery и AsyncOrmQuery.
+Сами запросы не выполняются здесь — только собираются, чтобы синхронный
+и асинхронный слой не расходились в логике фильтрации и подгрузки связей.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Double, select, and_, case, cast, func, literal, literal_column, or_, tuple_, union_all
+from sqlalchemy.orm import aliased, joinedload, selectinload
+
+from db.dbstruct import User, Project, Board, Column, Task, Comment, UserWorkspace, UserProjectAccess, TaskLabel, TaskAssignee, Label, ColorPalette, TaskCounter, SEARCH_CONFIG, USER_SEARCH_TEXT
+
+
+def user_by_email_stmt(email: str):
+    return select(User).where(User.email == email)
+
+
+def auth_user_stmt(user_id: int | None = None, email: str | None = None):
+    """
+    Открытые поля пользователя (без хэша пароля) для get_current_user:
+    по первичному ключу или, для старых токенов, по email.
+    """
+    return select(
+        User.id, User.email, User.first_name, User.last_name, User.username, User.avatar_url, User.created_at
+    ).where(User.id == user_id if user_id is not None else User.email == email)
+
+
+def board_by_id_stmt(board_id: int):
+    return (
+        select(Board)
+        .options(joinedload(Board.project))
+        .where(Board.id == board_id)
+    )
+
+
+def project_by_id_stmt(project_id: int):
+    return select(Project).where(Project.id == project_id)
+
+
+def user_workspace_role_stmt(user_id: int, workspace_id: int):
+    return select(UserWorkspace.role).where(
+        UserWorkspace.user_id == user_id,
+        UserWorkspace.workspace_id == workspace_id
+    )
+
+
+def project_view_access_stmt(user_id: int, project_id: int):
+    return select(UserProjectAccess.id).where(
+        UserProjectAccess.user_id == user_id,
+        UserProjectAccess.project_id == project_id,
+        UserProjectAccess.can_view == True
+    )
+
+
+def access_stmt(user_id: int, task_id: int | None = None, column_id: int | None = None, board_id: int | None = None):
+    """
+    (project_id, workspace_id, role, has_project_access) для задачи, колонки или доски
+    одной строкой: роль в workspace и доступ к проекту подтягиваются outer join
+    по уникальным индексам (user_id, workspace_id) и (user_id, project_id).
+    Нет строки — нет самой задачи/колонки/доски.
+    """
+    if task_id is not None:
+        # У задачи проект и workspace денормализованы — join с доской не нужен
+        project_id, workspace_id = Task.project_id, Task.workspace_id
+        stmt = select(Task.project_id, Task.workspace_id).where(Task.id == task_id)
+    else:
+        project_id, workspace_id = Project.id, Project.workspaces_id
+        stmt = select(project_id.label("project_id"), workspace_id.label("workspace_id")).select_from(Board).join(Project, Board.projects_id == Project.id)
+        if column_id is not None:
+            stmt = stmt.join(Column, Column.board_id == Board.id).where(Column.id == column_id)
+        else:
+            stmt = stmt.where(Board.id == board_id)
+    return (
+        stmt.add_columns(UserWorkspace.role, UserProjectAccess.id.is_not(None).label("has_project_access"))
+        .outerjoin(UserWorkspace, and_(UserWorkspace.user_id == user_id, UserWorkspace.workspace_id == workspace_id))
+        .outerjoin(UserProjectAccess, and_(
+            UserProjectAccess.user_id == user_id,
+            UserProjectAccess.project_id == project_id,
+            UserProjectAccess.can_view == True
+        ))
+    )
+
+
+def columns_with_tasks_stmt(board_id: int):
+    # Коллекции (задачи, исполнители, метки) грузим через selectinload:
+    # по одному запросу с IN (...) на уровень, без декартова произведения
+    # колонки × задачи × исполнители × метки. joinedload остаётся только
+    # для связей "многие к одному". Архивные задачи на доску не попадают
+    tasks = selectinload(Column.tasks.and_(Task.archived_at.is_(None)))
+    return (
+        select(Column)
+        .where(Column.board_id == board_id)
+        .options(
+            tasks.joinedload(Task.assignee),
+            tasks.selectinload(Task.assignee_links).joinedload(TaskAssignee.user),  # Загружаем множественных исполнителей через TaskAssignee с данными пользователей
+            tasks.selectinload(Task.labels),
+            joinedload(Column.board).joinedload(Board.project),
+            joinedload(Column.color)
+        )
+        .order_by(Column.position.asc())
+    )
+
+
+# Проекции для представления доски: только нужные ответу колонки, без
+# ORM-объектов и identity map. Связи "многие ко многим" — отдельными
+# плоскими запросами по board_id, склейка в AsyncOrmQuery.get_board_view.
+USER_FIELDS = ("id", "first_name", "last_name", "username", "email", "avatar_url")
+
+
+def board_header_stmt(board_id: int):
+    return (
+        select(Board.id, Board.title, Project.id.label("project_id"), Project.title.label("project_title"), Project.workspaces_id, Board.version)
+        .join(Project, Board.projects_id == Project.id)
+        .where(Board.id == board_id)
+    )
+
+
+def board_columns_stmt(board_id: int):
+    return (
+        select(Column.id, Column.title, Column.board_id, ColorPalette.id.label("color_id"), ColorPalette.name.label("color_name"), ColorPalette.hex_code)
+        .outerjoin(ColorPalette, Column.color_id == ColorPalette.id)
+        .where(Column.board_id == board_id)
+        .order_by(Column.position.asc())
+    )
+
+
+def board_tasks_stmt(board_id: int):
+    assignee = aliased(User)
+    return (
+        select(
+            Task.id, Task.title, Task.description, Task.priority, Task.due_date,
+            Task.column_id, Task.rank, Task.created_at,
+            *(getattr(assignee, field).label(f"assignee_{field}") for field in USER_FIELDS),
+        )
+        .outerjoin(assignee, Task.assigned_to == assignee.id)
+        .where(Task.board_id == board_id, Task.archived_at.is_(None))
+        .order_by(Task.column_id, Task.rank, Task.id)
+    )
+
+
+def board_task_labels_stmt(board_id: int):
+    return (
+        select(TaskLabel.task_id, Label.id, Label.name, Label.color)
+        .join(Label, TaskLabel.label_id == Label.id)
+        .join(Task, TaskLabel.task_id == Task.id)
+        .where(Task.board_id == board_id, Task.archived_at.is_(None))
+        .order_by(TaskLabel.task_id, Label.id)
+    )
+
+
+def board_task_assignees_stmt(board_id: int):
+    return (
+        select(TaskAssignee.task_id, *(getattr(User, field) for field in USER_FIELDS))
+        .join(User, TaskAssignee.user_id == User.id)
+        .join(Task, TaskAssignee.task_id == Task.id)
+        .where(Task.board_id == board_id, Task.archived_at.is_(None))
+        .order_by(TaskAssignee.task_id, TaskAssignee.id)
+    )
+
+
+def board_archive_stmt(board_id: int, after: Optional[tuple] = None, limit: Optional[int] = None):
+    # Архив доски от недавно архивированных к старым, keyset по (archived_at, id)
+    stmt = (
+        select(Task.id, Task.title, Task.priority, Task.due_date, Task.created_at, Task.archived_at,
+               Task.column_id, Column.title.label("column_title"))
+        .join(Column, Task.column_id == Column.id)
+        .where(Task.board_id == board_id, Task.archived_at.isnot(None))
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(Task.archived_at, Task.id) < tuple_(*after))
+    stmt = stmt.order_by(Task.archived_at.desc(), Task.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def column_scopes_stmt(column_ids: list[int]):
+    # Значения денормализованных полей задачи (board_id, project_id, workspace_id) для колонок
+    return (
+        select(Column.id, Column.board_id, Board.projects_id.label("project_id"), Project.workspaces_id.label("workspace_id"))
+        .join(Board, Column.board_id == Board.id)
+        .join(Project, Board.projects_id == Project.id)
+        .where(Column.id.in_(column_ids))
+    )
+
+
+def board_column_counters_stmt(board_id: int):
+    # Все колонки доски по порядку, счётчик задач из task_counters (нет строки — 0)
+    return (
+        select(Column.id, func.coalesce(TaskCounter.value, 0))
+        .outerjoin(TaskCounter, and_(
+            TaskCounter.board_id == board_id,
+            TaskCounter.kind == "column",
+            TaskCounter.key_id == Column.id,
+        ))
+        .where(Column.board_id == board_id)
+        .order_by(Column.position.asc())
+    )
+
+
+def board_counters_stmt(board_id: int, kind: str):
+    return (
+        select(TaskCounter.key_id, TaskCounter.value)
+        .where(TaskCounter.board_id == board_id, TaskCounter.kind == kind, TaskCounter.value > 0)
+        .order_by(TaskCounter.value.desc(), TaskCounter.key_id)
+    )
+
+
+def board_overdue_counts_stmt(board_id: int, now: datetime):
+    # Просрочка зависит от текущего времени, поэтому не хранится в счётчиках:
+    # диапазон по индексу (board_id, due_date, id) читает только просроченные задачи
+    return (
+        select(Task.column_id, func.count())
+        .where(Task.board_id == board_id, Task.due_date < now, Task.archived_at.is_(None))
+        .group_by(Task.column_id)
+    )
+
+
+def columns_by_board_stmt(board_id: int):
+    return (
+        select(Column)
+        .where(Column.board_id == board_id)
+        .options(joinedload(Column.color))
+        .order_by(Column.position.asc())
+    )
+
+
+def user_tasks_stmt(
+    user_id: int,
+    workspace_id: Optional[int] = None,
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None
+):
+    # Keyset-пагинация по (created_at, id) в порядке убывания:
+    # after — ключ последней задачи предыдущей страницы
+    # Ищем задачи, назначенные через старое поле assigned_to ИЛИ через TaskAssignee
+    stmt = (
+        select(Task)
+        .options(
+            joinedload(Task.column).joinedload(Column.board).joinedload(Board.project).joinedload(Project.workspace),
+            joinedload(Task.column).joinedload(Column.color),  # загружаем цвет колонки
+            joinedload(Task.author),
+            selectinload(Task.assignee_links).joinedload(TaskAssignee.user)  # загружаем множественных исполнителей
+        )
+        .where(Task.archived_at.is_(None))
+    )
+
+    if workspace_id is not None:
+        stmt = stmt.where(Task.workspace_id == workspace_id)
+
+    # Фильтруем по пользователю; подзапрос вместо outerjoin не плодит дубликаты,
+    # поэтому не нужен DISTINCT и LIMIT применяется к задачам, а не к строкам join
+    stmt = stmt.where(
+        or_(
+            Task.assigned_to == user_id,  # старое поле
+            Task.id.in_(select(TaskAssignee.task_id).where(TaskAssignee.user_id == user_id))  # новая таблица множественных исполнителей
+        )
+    )
+
+    if after is not None:
+        stmt = stmt.where(tuple_(Task.created_at, Task.id) < tuple_(*after))
+    stmt = stmt.order_by(Task.created_at.desc(), Task.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def calendar_tasks_stmt(
+    board_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    column_id: Optional[int] = None,
+    assigned_to: Optional[int] = None,
+    label_id: Optional[int] = None,
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None
+):
+    # Keyset-пагинация по (due_date, id) по возрастанию
+    stmt = (
+        select(Task)
+        .where(Task.board_id == board_id, Task.archived_at.is_(None))
+        .options(
+            joinedload(Task.assignee),
+            selectinload(Task.assignee_links).joinedload(TaskAssignee.user),  # Загружаем множественных исполнителей через TaskAssignee
+            selectinload(Task.labels),
+            joinedload(Task.column)
+        )
+    )
+
+    # Фильтр по дате (due_date) - показываем только задачи с датами
+    stmt = stmt.where(Task.due_date.isnot(None))
+    if start_date:
+        stmt = stmt.where(Task.due_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Task.due_date <= end_date)
+
+    # Фильтр по статусу (column_id)
+    if column_id:
+        stmt = stmt.where(Task.column_id == column_id)
+
+    # Фильтр по исполнителю
+    if assigned_to:
+        stmt = stmt.where(Task.assigned_to == assigned_to)
+
+    # Фильтр по тегу
+    if label_id:
+        stmt = stmt.join(TaskLabel, Task.id == TaskLabel.task_id).where(
+            TaskLabel.label_id == label_id
+        )
+
+    if after is not None:
+        stmt = stmt.where(tuple_(Task.due_date, Task.id) > tuple_(*after))
+    stmt = stmt.order_by(Task.due_date.asc(), Task.id.asc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def user_workspace_links_stmt(user_id: int):
+    return (
+        select(UserWorkspace)
+        .options(joinedload(UserWorkspace.workspace))
+        .where(UserWorkspace.user_id == user_id)
+        .order_by(UserWorkspace.created_at.asc())
+    )
+
+
+def workspace_owner_usernames_stmt(workspace_ids: list[int]):
+    return (
+        select(UserWorkspace.workspace_id, User.username)
+        .join(User, User.id == UserWorkspace.user_id)
+        .where(
+            UserWorkspace.workspace_id.in_(workspace_ids),
+            UserWorkspace.role.ilike("owner")
+        )
+        .order_by(UserWorkspace.workspace_id, UserWorkspace.id)
+    )
+
+
+def viewable_project_ids_stmt(user_id: int, workspace_id: int, is_owner: bool):
+    # Владелец видит все проекты workspace, остальные — только с правом просмотра
+    stmt = select(Project.id).where(Project.workspaces_id == workspace_id)
+    if not is_owner:
+        stmt = stmt.where(
+            Project.id.in_(
+                select(UserProjectAccess.project_id).where(
+                    UserProjectAccess.user_id == user_id,
+                    UserProjectAccess.can_view == True
+                )
+            )
+        )
+    return stmt
+
+
+def export_tasks_stmt(board_id: Optional[int] = None, project_ids: Optional[list[int]] = None):
+    # Плоские строки без ORM-объектов: для потоковой выгрузки через серверный курсор
+    stmt = (
+        select(
+            Task.id.label("task_id"),
+            Task.title,
+            Task.description,
+            Task.priority,
+            Task.due_date,
+            Task.created_at,
+            Task.assigned_to,
+            Task.created_by,
+            Column.id.label("column_id"),
+            Column.title.label("column_title"),
+            Board.id.label("board_id"),
+            Board.title.label("board_title"),
+            Project.id.label("project_id"),
+            Project.title.label("project_title"),
+        )
+        .join(Column, Task.column_id == Column.id)
+        .join(Board, Column.board_id == Board.id)
+        .join(Project, Board.projects_id == Project.id)
+    )
+    if board_id is not None:
+        stmt = stmt.where(Task.board_id == board_id)
+    if project_ids is not None:
+        stmt = stmt.where(Task.project_id.in_(project_ids))
+    return stmt.order_by(Board.id, Column.position, Task.rank, Task.id)
+
+
+def task_label_names_stmt(task_ids: list[int]):
+    return (
+        select(TaskLabel.task_id, Label.name)
+        .join(Label, TaskLabel.label_id == Label.id)
+        .where(TaskLabel.task_id.in_(task_ids))
+        .order_by(TaskLabel.task_id, Label.id)
+    )
+
+
+def task_assignee_usernames_stmt(task_ids: list[int]):
+    return (
+        select(TaskAssignee.task_id, User.username)
+        .join(User, TaskAssignee.user_id == User.id)
+        .where(TaskAssignee.task_id.in_(task_ids))
+        .order_by(TaskAssignee.task_id, TaskAssignee.id)
+    )
+
+
+def user_lookup_stmt(q: str, limit: int = 10):
+    # Поиск вне workspace — только точное совпадение username или email
+    # (по их btree-индексам): перебрать справочник пользователей подстрокой нельзя
+    q = q.strip()
+    return (
+        select(User.id, User.username, User.first_name, User.last_name, User.email, User.avatar_url)
+        .where(or_(User.username == q, User.email == q))
+        .order_by(User.id)
+        .limit(limit)
+    )
+
+
+def user_search_stmt(q: str, workspace_id: int, limit: int = 10):
+    # Нечёткий поиск — только среди участников workspace.
+    # Кандидаты — подстрока или нечёткое совпадение (word_similarity) по USER_SEARCH_TEXT,
+    # оба условия обслуживает триграммный индекс ix_users_search_trgm.
+    # Сначала совпадения по началу поля, затем подстрока, затем по похожести
+    q = q.strip().lower()
+    is_prefix = or_(*(
+        func.lower(field).startswith(q, autoescape=True)
+        for field in (User.username, User.first_name, User.last_name, User.email)
+    ))
+    # Шаблон одним параметром, чтобы планировщик видел его целиком
+    pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    is_substring = USER_SEARCH_TEXT.like(pattern, escape="\\")
+    return (
+        select(User.id, User.username, User.first_name, User.last_name, User.email, User.avatar_url)
+        .where(or_(is_substring, literal(q).bool_op("<%")(USER_SEARCH_TEXT)))
+        .order_by(
+            case((is_prefix, 0), (is_substring, 1), else_=2),
+            func.word_similarity(q, USER_SEARCH_TEXT).desc(),
+            User.id,
+        )
+        .where(User.id.in_(
+            select(UserWorkspace.user_id).where(UserWorkspace.workspace_id == workspace_id)
+        ))
+        .limit(limit)
+    )
+
+
+# Маркеры подсветки в ts_headline; заменяются на <mark> после экранирования HTML
+SEARCH_START_SEL = "\x02"
+SEARCH_STOP_SEL = "\x03"
+
+
+def search_stmt(project_ids: list[int], q: str, after: Optional[tuple] = None, limit: Optional[int] = None):
+    # Кандидаты находятся по GIN-индексам search_vector задач и комментариев,
+    # ts_headline (дорогой) считается только для строк отданной страницы.
+    # Порядок и ключ keyset-пагинации — (rank, kind, id) по убыванию.
+    # ts_rank_cd возвращает real; ранг приводится к double precision, чтобы значение
+    # из курсора (float8 в Python) сравнивалось без потерь и строки на границе не терялись.
+    # Архивные задачи ищутся наравне с остальными
+    config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+    query = func.websearch_to_tsquery(config, q)
+
+    hits = union_all(
+        select(
+            literal("task").label("kind"),
+            Task.id.label("id"),
+            Task.id.label("task_id"),
+            cast(func.ts_rank_cd(Task.search_vector, query), Double).label("rank"),
+        ).where(Task.search_vector.bool_op("@@")(query), Task.project_id.in_(project_ids)),
+        select(
+            literal("comment").label("kind"),
+            Comment.id.label("id"),
+            Comment.task_id.label("task_id"),
+            cast(func.ts_rank_cd(Comment.search_vector, query), Double).label("rank"),
+        )
+        .join(Task, Task.id == Comment.task_id)
+        .where(Comment.search_vector.bool_op("@@")(query), Task.project_id.in_(project_ids)),
+    ).subquery("hits")
+
+    page = select(hits)
+    if after is not None:
+        rank, kind, hit_id = after
+        page = page.where(tuple_(hits.c.rank, hits.c.kind, hits.c.id) < tuple_(literal(rank, Double), kind, hit_id))
+    page = page.order_by(hits.c.rank.desc(), hits.c.kind.desc(), hits.c.id.desc())
+    if limit is not None:
+        page = page.limit(limit)
+    page = page.subquery("page")
+
+    document = case(
+        (page.c.kind == "task", func.concat_ws(" — ", Task.title, func.left(Task.description, 10_000))),
+        else_=func.left(Comment.content, 10_000),
+    )
+    return (
+        select(
+            page.c.kind,
+            page.c.id,
+            page.c.task_id,
+            page.c.rank,
+            Task.title.label("task_title"),
+            Task.board_id,
+            Task.project_id,
+            Task.archived_at,
+            func.ts_headline(
+                config, document, query,
+                f"StartSel={SEARCH_START_SEL}, StopSel={SEARCH_STOP_SEL}, MaxWords=30, MinWords=10, MaxFragments=2",
+            ).label("snippet"),
+        )
+        .join(Task, Task.id == page.c.task_id)
+        .outerjoin(Comment, and_(page.c.kind == "comment", Comment.id == page.c.id))
+        .order_by(page.c.rank.desc(), page.c.kind.desc(), page.c.id.desc())
+    )
@@ -0,0 +1,156 @@
+"""
+Маршрутизация чтений на реплики Postgres.
+Сессия отправляет SELECT на реплику только если запрос явно разрешил это
+(prefer_replica в db/database.py), пользователь уже определён, сессия ещё
+ничего не писала и у пользователя нет свежей записи (read-your-writes).
+Реплика с отставанием больше DB_REPLICA_MAX_LAG_SECONDS или недоступная
+временно исключается; отставание проверяется не чаще раза в
+DB_REPLICA_LAG_CHECK_SECONDS. Без DB_REPLICA_URLS всё идёт на primary.
+"""
+import random
+import threading
+import time
+
+from sqlalchemy import Engine, Select, create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.config import settings
+from core.logger import logger
+from db.pool_metrics import instrumented_pool_class
+
+# Ключи в Session.info
+USE_REPLICA = "use_replica"  # запрос разрешил читать с реплики
+USER_ID = "user_id"  # текущий пользователь (ставит get_current_user)
+WROTE = "wrote"  # сессия уже писала: дальше только primary
+REPLICA = "replica"  # выбранная для сессии реплика
+
+# Отставание реплики в секундах (0, если всё полученное WAL уже применено)
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaState:
+    '''
+    Движок реплики и закэшированный результат проверки её отставания.
+    '''
+
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.lag: float | None = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        if time.monotonic() - self.checked_at >= settings.DB_REPLICA_LAG_CHECK_SECONDS:
+            self._refresh()
+        return self.lag is not None and self.lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+
+    def _refresh(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return  # проверку уже выполняет другой поток — используем прошлый результат
+        try:
+            with self.engine.connect() as connection:
+                self.lag = float(connection.execute(LAG_QUERY).scalar() or 0)
+        except Exception as e:
+            logger.warning(f"Реплика {self.name} недоступна: {e}")
+            self.lag = None
+        finally:
+            self.checked_at = time.monotonic()
+            self._lock.release()
+
+
+class RecentWrites:
+    '''
+    Время последней записи каждого пользователя (в пределах процесса).
+    Пока не прошло DB_READ_YOUR_WRITES_SECONDS, его чтения идут на primary.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._written_at: dict[int, float] = {}
+
+    def record(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._written_at[user_id] = now
+            if len(self._written_at) > 10000:
+                window = settings.DB_READ_YOUR_WRITES_SECONDS
+                self._written_at = {uid: ts for uid, ts in self._written_at.items() if now - ts < window}
+
+    def is_recent(self, user_id: int) -> bool:
+        written_at = self._written_at.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < settings.DB_READ_YOUR_WRITES_SECONDS
+
+
+recent_writes = RecentWrites()
+
+
+def _replica_engines(is_async: bool) -> list[ReplicaState]:
+    replicas = []
+    for i, url in enumerate(settings.DB_REPLICA_URL_LIST):
+        name = f"replica-{i}{'-async' if is_async else ''}"
+        if is_async:
+            engine = create_async_engine(
+                url=url,
+                poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, name),
+                **settings.DB_POOL_OPTIONS,
+            ).sync_engine
+        else:
+            engine = create_engine(
+                url=url,
+                poolclass=instrumented_pool_class(QueuePool, name),
+                **settings.DB_POOL_OPTIONS,
+            )
+        replicas.append(ReplicaState(name, engine))
+    return replicas
+
+
+class RoutingSession(Session):
+    '''
+    Сессия, выбирающая движок для каждого запроса: primary или реплику.
+    '''
+    replicas: list[ReplicaState] = _replica_engines(is_async=False)
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = super().get_bind(mapper, clause=clause, **kw)
+        is_read = isinstance(clause, Select) and clause._for_update_arg is None
+
+        # Всё, что не SELECT (DML, text(), DDL), считаем записью
+        if self._flushing or (clause is not None and not is_read):
+            self.info[WROTE] = True
+            return primary
+
+        if not self.replicas or not is_read or not self.info.get(USE_REPLICA) or self.info.get(WROTE):
+            return primary
+
+        user_id = self.info.get(USER_ID)
+        if user_id is None or recent_writes.is_recent(user_id):
+            return primary
+
+        replica = self.info.get(REPLICA)
+        if replica is None or not replica.is_available():
+            available = [r for r in self.replicas if r.is_available()]
+            if not available:
+                return primary
+            replica = self.info[REPLICA] = random.choice(available)
+        return replica.engine
+
+
+class AsyncRoutingSession(RoutingSession):
+    '''
+    Синхронная часть AsyncSession: реплики — sync_engine асинхронных движков.
+    '''
+    replicas: list[ReplicaState] = _replica_engines(is_async=True)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session: Session) -> None:
+    # Окно read-your-writes отсчитывается от фиксации записи
+    user_id = session.info.get(USER_ID)
+    if session.info.get(WROTE) and user_id is not None:
+        recent_writes.record(user_id)
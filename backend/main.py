@@ -12,12 +12,20 @@ from api.endpoints import (
     workspace_members,
     workspaces,
     ai,
+    metrics,
+    exports,
+    imports,
+    search,
 )
 from fastapi.staticfiles import StaticFiles
 from db.database import Base, engine
 from db import dbstruct  # Импортируем все модели для создания таблиц
 from core.config import settings
 from core.logger import logger
+from core.pagination import NEXT_CURSOR_HEADER
+from db.OrmQuery import OrmQuery
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import time
 
 app = FastAPI() # Создание экземпляра FastAPI
@@ -34,6 +42,10 @@ app.include_router(invites.router) # Подключение роутеров
 app.include_router(workspace_members.router) # Подключение роутеров
 app.include_router(workspaces.router) # Подключение роутеров
 app.include_router(ai.router) # Подключение роутера AI
+app.include_router(metrics.router) # Подключение роутера метрик
+app.include_router(exports.router) # Подключение роутера экспорта
+app.include_router(imports.router) # Подключение роутера импорта
+app.include_router(search.router) # Подключение роутера поиска
 
 raw_origins = [origin.strip() for origin in settings.FRONTEND_URL.split(",") if origin.strip()]
 if "http://localhost:3000" not in raw_origins:
@@ -46,12 +58,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],        
     allow_headers=["*"],         
+    expose_headers=[NEXT_CURSOR_HEADER],  # курсор keyset-пагинации должен быть виден фронтенду
 )
 
 @app.on_event("startup")
 def startup_db():
     Base.metadata.create_all(bind=engine)
 
+
+async def archive_loop():
+    # Каждый процесс запускает свою архивацию: пачки берутся с SKIP LOCKED и не пересекаются
+    while True:
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(OrmQuery.archive_due_tasks)
+        except Exception as e:
+            logger.error(f"Архивация задач не удалась: {e}")
+
+
+@app.on_event("startup")
+async def start_archive_loop():
+    if settings.ARCHIVE_INTERVAL_SECONDS > 0:
+        app.state.archive_task = asyncio.create_task(archive_loop())
+
+
+@app.on_event("shutdown")
+async def stop_archive_loop():
+    task = getattr(app.state, "archive_task", None)
+    if task is not None:
+        task.cancel()
+
     
 @app.get("/")
 def read_root():
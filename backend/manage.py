@@ -0,0 +1,76 @@
+"""
+Служебные команды бэкенда. Запуск из каталога backend:
+
+    python manage.py import-tasks --board 12 --user 3 tasks.csv
+    python manage.py repair-counters [--board 12]
+    python manage.py archive-tasks
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from core.logger import logger
+from core.task_import import parse_import_file
+from db.OrmQuery import OrmQuery, ARCHIVE_BATCH_SIZE
+
+
+def import_tasks(args: argparse.Namespace) -> int:
+    path = Path(args.file)
+    fmt = args.format or ("json" if path.suffix.lower() == ".json" else "csv")
+    try:
+        rows, errors = parse_import_file(path.read_bytes(), fmt)
+    except ValueError as e:
+        logger.error(f"Файл не прочитан: {e}")
+        return 1
+
+    result = OrmQuery.import_tasks(args.board, rows, created_by=args.user)
+    if result is None:
+        logger.error(f"Доска {args.board} не найдена")
+        return 1
+
+    for error in sorted(errors + result["errors"], key=lambda error: error["row"]):
+        logger.warning(f"Строка {error['row']}: {error['detail']}")
+    if result["unknown_assignees"]:
+        logger.warning(f"Исполнители не найдены в workspace: {', '.join(result['unknown_assignees'])}")
+    logger.info(f"Импортировано задач: {result['imported']}, создано меток: {result['labels_created']}")
+    return 0
+
+
+def repair_counters(args: argparse.Namespace) -> int:
+    rows = OrmQuery.repair_task_counters(args.board)
+    scope = f"доски {args.board}" if args.board else "всех досок"
+    logger.info(f"Счётчики {scope} пересчитаны, строк: {rows}")
+    return 0
+
+
+def archive_tasks(args: argparse.Namespace) -> int:
+    archived = OrmQuery.archive_due_tasks(batch_size=args.batch_size)
+    logger.info(f"Архивировано задач: {archived}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="manage.py", description="Служебные команды kanban-бэкенда")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("import-tasks", help="Массовый импорт задач в доску из CSV или JSON")
+    command.add_argument("file", help="Путь к файлу CSV или JSON")
+    command.add_argument("--board", type=int, required=True, help="ID доски")
+    command.add_argument("--user", type=int, required=True, help="ID пользователя-автора задач")
+    command.add_argument("--format", choices=["csv", "json"], help="Формат файла; по умолчанию — по расширению")
+    command.set_defaults(handler=import_tasks)
+
+    command = commands.add_parser("repair-counters", help="Пересчитать счётчики задач (task_counters) по самим задачам")
+    command.add_argument("--board", type=int, help="ID доски; по умолчанию — все доски")
+    command.set_defaults(handler=repair_counters)
+
+    command = commands.add_parser("archive-tasks", help="Архивировать задачи по политикам досок (разово, например из cron)")
+    command.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="Задач в одной транзакции")
+    command.set_defaults(handler=archive_tasks)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
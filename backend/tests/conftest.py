@@ -0,0 +1,179 @@
+"""
+Интеграционные тесты бэкенда на PostgreSQL.
+
+Тесты работают с отдельной базой TEST_DB_NAME: схема создаётся миграциями
+Alembic, а таблицы очищаются перед каждым тестом, поэтому рабочую базу
+указывать нельзя. Остальные параметры подключения (DB_HOST, DB_PORT, DB_USER,
+DB_PASS) берутся из окружения или .env, как у приложения. Без TEST_DB_NAME
+тесты пропускаются. Запуск из каталога backend:
+
+    TEST_DB_NAME=kanban_test python -m pytest tests
+"""
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.chdir(BACKEND_DIR)  # static/ и alembic.ini ищутся относительно backend
+
+TEST_DB_NAME = os.environ.get("TEST_DB_NAME")
+if TEST_DB_NAME:
+    os.environ["DB_NAME"] = TEST_DB_NAME
+else:
+    # Настройки обязательны уже при импорте приложения; без базы тесты всё равно пропускаются
+    for name, value in (("DB_HOST", "localhost"), ("DB_PORT", "5432"), ("DB_USER", "postgres"),
+                        ("DB_PASS", ""), ("DB_NAME", "kanban_test"), ("SECRET_KEY", "test"), ("SALT", "test")):
+        os.environ.setdefault(name, value)
+# Реплики и фоновая архивация в тестах не участвуют
+os.environ["DB_REPLICA_URLS"] = ""
+os.environ["ARCHIVE_INTERVAL_SECONDS"] = "0"
+
+# Таблицы со справочными данными из миграций не очищаются
+KEEP_TABLES = {"alembic_version", "color_palettes"}
+
+
+@pytest.fixture(scope="session")
+def database():
+    """
+    Движок тестовой базы со схемой, доведённой миграциями до head.
+    """
+    if not TEST_DB_NAME:
+        pytest.skip("TEST_DB_NAME не задан: интеграционным тестам нужна отдельная база PostgreSQL")
+    from alembic import command
+    from alembic.config import Config
+    from db.database import engine
+
+    command.upgrade(Config(str(BACKEND_DIR / "alembic.ini")), "head")
+    return engine
+
+
+def truncate_all(engine) -> None:
+    from sqlalchemy import inspect, text
+
+    tables = [name for name in inspect(engine).get_table_names() if name not in KEEP_TABLES]
+    with engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+
+
+def clear_caches() -> None:
+    from core import acl_cache, board_cache
+    from core.security import user_cache
+
+    for cache in (user_cache, acl_cache.workspace_roles, acl_cache.project_view_access,
+                  acl_cache.project_workspaces, board_cache.board_payloads):
+        cache.clear()
+
+
+@pytest.fixture
+def db(database):
+    """
+    Пустая база (справочники на месте) и пустые кэши процесса.
+    """
+    truncate_all(database)
+    clear_caches()
+    return database
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    from main import app
+
+    # Регистрация генерирует аватары в static/avatars: новые файлы убираем после теста
+    avatars_dir = BACKEND_DIR / "static" / "avatars"
+    existing = set(avatars_dir.iterdir()) if avatars_dir.exists() else set()
+    # Без контекстного менеджера: startup-обработчики (create_all, архивация) не нужны
+    yield TestClient(app)
+    if avatars_dir.exists():
+        for path in set(avatars_dir.iterdir()) - existing:
+            path.unlink()
+
+
+@pytest.fixture
+def make_user(client):
+    """
+    Регистрирует пользователя и возвращает заголовки авторизации.
+    У нового пользователя сразу есть своё рабочее пространство.
+    """
+    counter = iter(range(1, 1_000_000))
+
+    def make(username: str | None = None) -> dict:
+        n = next(counter)
+        username = username or f"user{n}"
+        email = f"{username}@example.com"
+        response = client.post("/api/auth/register", json={
+            "email": email, "username": username, "first_name": "Test", "last_name": str(n), "password": "secret",
+        })
+        assert response.status_code == 200, response.text
+        token = client.post("/api/auth/login", json={"email": email, "password": "secret"}).json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    return make
+
+
+@pytest.fixture
+def make_board(client):
+    """
+    Создаёт проект и доску в рабочем пространстве пользователя.
+    Возвращает {"workspace_id", "project_id", "board_id", "column_ids"}.
+    """
+    def make(headers: dict, title: str = "Board") -> dict:
+        workspace_id = client.get("/api/workspaces/my", headers=headers).json()[0]["id"]
+        project = client.post("/api/projects/create", json={"title": "Project", "workspaces_id": workspace_id}, headers=headers)
+        assert project.status_code == 200, project.text
+        board = client.post("/api/boards/create", json={"title": title, "projects_id": project.json()["id"]}, headers=headers)
+        assert board.status_code == 200, board.text
+        board_id = board.json()["id"]
+        columns = client.get(f"/api/boards/{board_id}/columns/list", headers=headers).json()
+        return {
+            "workspace_id": workspace_id,
+            "project_id": project.json()["id"],
+            "board_id": board_id,
+            "column_ids": [column["id"] for column in columns],
+        }
+
+    return make
+
+
+class StatementLog:
+    """
+    SQL-выражения, отправленные в БД синхронным и асинхронным движком.
+    """
+
+    def __init__(self):
+        self.statements: list[tuple[str, object]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+
+@pytest.fixture
+def capture_statements(database):
+    """
+    Контекстный менеджер: with capture_statements() as log — log.statements
+    и log.count по событию before_cursor_execute обоих движков.
+    """
+    from sqlalchemy import event
+    from db.database import engine, async_engine
+
+    @contextmanager
+    def capture():
+        log = StatementLog()
+        engines = (engine, async_engine.sync_engine)
+        for target in engines:
+            event.listen(target, "before_cursor_execute", log)
+        try:
+            yield log
+        finally:
+            for target in engines:
+                event.remove(target, "before_cursor_execute", log)
+
+    return capture
@@ -0,0 +1,34 @@
+"""
+Фоновое удаление доски пачками: пока строка доски ещё существует, ни ETag,
+ни кэш представления, ни счётчики не должны показывать удалённые задачи.
+"""
+from sqlalchemy import delete
+
+
+def test_chunked_delete_invalidates_board_before_root_delete(client, make_user, make_board):
+    from db.OrmQuery import OrmQuery
+    from db.dbstruct import Board, Task
+
+    headers = make_user()
+    board = make_board(headers)
+    board_id = board["board_id"]
+    for n in range(5):
+        response = client.post("/api/tasks", json={"title": f"Task {n}", "column_id": board["column_ids"][0]}, headers=headers)
+        assert response.status_code == 200, response.text
+
+    view = client.get(f"/api/boards/{board_id}/columns", headers=headers)
+    assert sum(len(column["tasks"]) for column in view.json()["columns"]) == 5
+    assert client.get(f"/api/boards/{board_id}/stats", headers=headers).json()["tasks"] == 5
+
+    # Все пачки задач, но без финального DELETE доски — состояние посреди фонового удаления
+    OrmQuery._delete_in_chunks(delete(Board).where(Board.id == -1), Board.id == board_id, Task.board_id == board_id, chunk_size=2)
+
+    response = client.get(f"/api/boards/{board_id}/columns", headers={**headers, "If-None-Match": view.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != view.headers["ETag"]
+    assert all(column["tasks"] == [] for column in response.json()["columns"])
+    stats = client.get(f"/api/boards/{board_id}/stats", headers=headers).json()
+    assert stats["tasks"] == 0 and all(column["tasks"] == 0 for column in stats["columns"])
+
+    assert OrmQuery.delete_board_in_chunks(board_id, chunk_size=2)
+    assert client.get(f"/api/boards/{board_id}/columns", headers=headers).status_code == 404
@@ -0,0 +1,216 @@
+"""
+EXPLAIN-проверка индексов: на большом синтетическом наборе данных каждый
+запрос методов OrmQuery / AsyncOrmQuery для горячих путей должен читать
+большие таблицы по индексу, а не последовательным сканированием.
+"""
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from tests.conftest import truncate_all
+
+# Таблицы, которые в рабочей базе растут без ограничений; справочники
+# (color_palettes) и служебные таблицы последовательно читать можно
+LARGE_TABLES = {
+    "users", "workspaces", "user_workspaces", "projects", "user_project_accesses", "boards", "columns",
+    "tasks", "task_assignees", "labels", "task_labels", "comments", "task_counters", "workspace_invites",
+}
+
+# Размер набора: пользователи, рабочие пространства, проекты, доски, колонки, задачи
+USERS, WORKSPACES = 20_000, 2_000
+PROJECTS_PER_WORKSPACE, BOARDS_PER_PROJECT, COLUMNS_PER_BOARD = 5, 2, 4
+TASKS = 200_000
+
+PROJECTS = WORKSPACES * PROJECTS_PER_WORKSPACE
+BOARDS = PROJECTS * BOARDS_PER_PROJECT
+COLUMNS = BOARDS * COLUMNS_PER_BOARD
+
+SEED_SQL = [
+    f"""INSERT INTO users (id, username, email, first_name, last_name, password)
+        SELECT g, 'user' || g, 'user' || g || '@example.com', 'Имя' || g, 'Фамилия' || g, 'x'
+        FROM generate_series(1, {USERS}) g""",
+    f"INSERT INTO workspaces (id, name) SELECT g, 'ws' || g FROM generate_series(1, {WORKSPACES}) g",
+    # Пользователи 1..WORKSPACES — владельцы, остальные — участники; у каждого есть второе пространство
+    f"""INSERT INTO user_workspaces (user_id, workspace_id, role)
+        SELECT g, (g - 1) % {WORKSPACES} + 1, CASE WHEN g <= {WORKSPACES} THEN 'owner' ELSE 'participant' END
+        FROM generate_series(1, {USERS}) g
+        UNION ALL
+        SELECT g, g % {WORKSPACES} + 1, 'viewer' FROM generate_series({WORKSPACES} + 1, {USERS}) g""",
+    f"""INSERT INTO projects (id, title, workspaces_id)
+        SELECT g, 'project' || g, (g - 1) / {PROJECTS_PER_WORKSPACE} + 1 FROM generate_series(1, {PROJECTS}) g""",
+    f"""INSERT INTO user_project_accesses (user_id, project_id, can_edit, can_view)
+        SELECT g, ((g - 1) % {WORKSPACES}) * {PROJECTS_PER_WORKSPACE} + 1, true, true
+        FROM generate_series({WORKSPACES} + 1, {USERS}) g""",
+    f"""INSERT INTO boards (id, title, projects_id)
+        SELECT g, 'board' || g, (g - 1) / {BOARDS_PER_PROJECT} + 1 FROM generate_series(1, {BOARDS}) g""",
+    f"""INSERT INTO columns (id, title, position, board_id, color_id)
+        SELECT g, 'column' || g, (g - 1) % {COLUMNS_PER_BOARD}, (g - 1) / {COLUMNS_PER_BOARD} + 1, 1
+        FROM generate_series(1, {COLUMNS}) g""",
+    f"""INSERT INTO tasks (id, title, description, column_id, board_id, project_id, workspace_id, rank,
+                           assigned_to, created_by, due_date, priority, archived_at, created_at)
+        SELECT t, 'Задача номер ' || t, 'Описание задачи ' || t, c, b, p, (p - 1) / {PROJECTS_PER_WORKSPACE} + 1,
+               lpad(to_hex(t), 8, '0'), t % {USERS} + 1, t % {USERS} + 1,
+               timestamp '2026-01-01' + (t % 365) * interval '1 day',
+               (ARRAY['low', 'medium', 'high'])[t % 3 + 1],
+               CASE WHEN t % 50 = 0 THEN timestamp '2026-01-01' END,
+               timestamp '2025-01-01' + t * interval '1 minute'
+        FROM (
+            SELECT t, c, (c - 1) / {COLUMNS_PER_BOARD} + 1 AS b,
+                   ((c - 1) / {COLUMNS_PER_BOARD}) / {BOARDS_PER_PROJECT} + 1 AS p
+            FROM (SELECT t, (t - 1) % {COLUMNS} + 1 AS c FROM generate_series(1, {TASKS}) t) s
+        ) s""",
+    f"INSERT INTO task_assignees (task_id, user_id) SELECT t, (t * 7) % {USERS} + 1 FROM generate_series(1, {TASKS}) t",
+    f"""INSERT INTO labels (id, name, color, workspace_id)
+        SELECT g, 'label' || g, '#4A90E2', (g - 1) / 5 + 1 FROM generate_series(1, {WORKSPACES * 5}) g""",
+    f"""INSERT INTO task_labels (task_id, label_id)
+        SELECT t.id, (t.workspace_id - 1) * 5 + t.id % 5 + 1 FROM tasks t WHERE t.id % 2 = 0""",
+    f"""INSERT INTO comments (task_id, user_id, content)
+        SELECT t, t % {USERS} + 1, 'Комментарий к задаче ' || t FROM generate_series(1, {TASKS}, 2) t""",
+    f"""INSERT INTO task_counters (board_id, kind, key_id, value)
+        SELECT g, 'board', g, 10 FROM generate_series(1, {BOARDS}) g""",
+    f"""INSERT INTO workspace_invites (workspace_id, token, created_by_id, is_active, used_count)
+        SELECT g, md5(g::text), g, true, 0 FROM generate_series(1, {WORKSPACES}) g""",
+]
+
+SEQUENCES = ["users", "workspaces", "projects", "boards", "columns", "tasks", "labels"]
+
+# Участник рабочего пространства 1 с доступом к его первому проекту
+MEMBER = WORKSPACES + 1
+OWNER, WORKSPACE, PROJECT, BOARD = 1, 1, 1, 1
+COLUMN, TASK = 1, 1 + COLUMNS  # вторая задача первой колонки
+
+
+@pytest.fixture(scope="module")
+def seeded(database):
+    truncate_all(database)
+    with database.begin() as connection:
+        for sql in SEED_SQL:
+            connection.execute(text(sql))
+        for table in SEQUENCES:
+            connection.execute(text(f"SELECT setval('{table}_id_seq', (SELECT max(id) FROM {table}))"))
+    with database.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+    yield database
+    truncate_all(database)
+
+
+def run_async(method, *args, **kwargs):
+    from db.database import async_engine
+
+    async def call():
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            # Каждый вызов — в своём event loop: соединения прошлого цикла не переиспользуем
+            await async_engine.dispose()
+
+    return asyncio.run(call())
+
+
+def _cases():
+    from db.OrmQuery import OrmQuery
+    from db.AsyncOrmQuery import AsyncOrmQuery
+
+    return {
+        "get_user_by_id": lambda: OrmQuery.get_user_by_id(MEMBER),
+        "get_user_by_email": lambda: OrmQuery.get_user_by_email(f"user{MEMBER}@example.com"),
+        "get_user_by_username": lambda: OrmQuery.get_user_by_username(f"user{MEMBER}"),
+        "get_auth_user by id": lambda: OrmQuery.get_auth_user(user_id=MEMBER),
+        "get_auth_user by email": lambda: OrmQuery.get_auth_user(email=f"user{MEMBER}@example.com"),
+        "get_board_by_id": lambda: OrmQuery.get_board_by_id(BOARD),
+        "get_workspace_by_user_id": lambda: OrmQuery.get_workspace_by_user_id(MEMBER),
+        "get_projects_by_workspace_id": lambda: OrmQuery.get_projects_by_workspace_id(WORKSPACE),
+        "get_columns_with_tasks_by_board_id": lambda: OrmQuery.get_columns_with_tasks_by_board_id(BOARD),
+        "get_columns_by_board_id": lambda: OrmQuery.get_columns_by_board_id(BOARD),
+        "get_task_by_id": lambda: OrmQuery.get_task_by_id(TASK),
+        "get_task_with_relations": lambda: OrmQuery.get_task_with_relations(TASK),
+        "get_task_assignee_ids": lambda: OrmQuery.get_task_assignee_ids([TASK, TASK + 1]),
+        "get_task_scope": lambda: OrmQuery.get_task_scope(TASK),
+        "get_task_locations": lambda: OrmQuery.get_task_locations([TASK, TASK + 1]),
+        "get_board_counters": lambda: OrmQuery.get_board_counters(BOARD),
+        "get_column_scopes": lambda: OrmQuery.get_column_scopes([COLUMN, COLUMN + 1]),
+        "get_last_task_rank": lambda: OrmQuery.get_last_task_rank(COLUMN),
+        "get_board_id_for_columns": lambda: OrmQuery.get_board_id_for_columns([COLUMN, COLUMN + 1]),
+        "get_project_by_id": lambda: OrmQuery.get_project_by_id(PROJECT),
+        "get_users_project_access": lambda: OrmQuery.get_users_project_access(PROJECT),
+        "get_user_project_accesses": lambda: OrmQuery.get_user_project_accesses(MEMBER, WORKSPACE),
+        "has_project_view_access": lambda: OrmQuery.has_project_view_access(MEMBER, PROJECT),
+        "get_user_workspace_role": lambda: OrmQuery.get_user_workspace_role(MEMBER, WORKSPACE),
+        "resolve_access task": lambda: OrmQuery.resolve_access(MEMBER, task_id=TASK),
+        "resolve_access column": lambda: OrmQuery.resolve_access(MEMBER, column_id=COLUMN),
+        "resolve_access board": lambda: OrmQuery.resolve_access(MEMBER, board_id=BOARD),
+        "get_user_tasks": lambda: OrmQuery.get_user_tasks(MEMBER, limit=100),
+        "get_user_tasks in workspace": lambda: OrmQuery.get_user_tasks(MEMBER, WORKSPACE, limit=100),
+        "get_calendar_tasks": lambda: OrmQuery.get_calendar_tasks(
+            BOARD, start_date=datetime(2026, 1, 1), end_date=datetime(2026, 12, 31), limit=100
+        ),
+        "get_calendar_tasks by label": lambda: OrmQuery.get_calendar_tasks(BOARD, label_id=1, limit=100),
+        "create_task": lambda: OrmQuery.create_task("Новая задача", COLUMN, created_by=OWNER),
+        "update_task": lambda: OrmQuery.update_task(TASK, {"column_id": COLUMN + 1, "assigned_to_ids": [OWNER]}),
+        "move_task": lambda: OrmQuery.move_task(TASK, column_id=COLUMN),
+        "create_comment": lambda: OrmQuery.create_comment(TASK, OWNER, "Комментарий"),
+        "async get_board_header": lambda: run_async(AsyncOrmQuery.get_board_header, BOARD),
+        "async get_board_view": lambda: run_async(_board_view, BOARD),
+        "async get_board_stats": lambda: run_async(AsyncOrmQuery.get_board_stats, BOARD),
+        "async get_board_archive": lambda: run_async(AsyncOrmQuery.get_board_archive, BOARD, limit=100),
+        "async get_user_workspace_links": lambda: run_async(AsyncOrmQuery.get_user_workspace_links, MEMBER),
+        "async get_workspace_owner_usernames": lambda: run_async(AsyncOrmQuery.get_workspace_owner_usernames, [1, 2]),
+        "async get_viewable_project_ids": lambda: run_async(AsyncOrmQuery.get_viewable_project_ids, MEMBER, WORKSPACE),
+        "async search": lambda: run_async(AsyncOrmQuery.search, [PROJECT], "задача", limit=20),
+        "async search_users in workspace": lambda: run_async(AsyncOrmQuery.search_users, "user", WORKSPACE),
+        "async search_users exact": lambda: run_async(AsyncOrmQuery.search_users, f"user{MEMBER}"),
+    }
+
+
+async def _board_view(board_id: int):
+    from db.AsyncOrmQuery import AsyncOrmQuery
+
+    return await AsyncOrmQuery.get_board_view(await AsyncOrmQuery.get_board_header(board_id))
+
+
+def _plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _explain(engine, statement: str, parameters) -> dict:
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        raw = cursor.fetchone()[0]
+        return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    finally:
+        connection.rollback()
+        connection.close()
+
+
+@pytest.mark.parametrize("name", list(_cases()))
+def test_queries_use_indexes(name, seeded, capture_statements):
+    with capture_statements() as log:
+        _cases()[name]()
+
+    # Запрос выполнен в любом случае; без индекса нечего проверять только в плане
+    if name == "async search_users in workspace":
+        with seeded.connect() as connection:
+            if not connection.execute(text("SELECT to_regclass('ix_users_search_trgm')")).scalar():
+                pytest.skip("нет триграммного индекса ix_users_search_trgm (pg_trgm без GIN-поддержки)")
+
+    explained = 0
+    for statement, parameters in log.statements:
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+            continue
+        if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+            continue  # executemany
+        nodes = list(_plan_nodes(_explain(seeded, statement, parameters)))
+        seq_scans = sorted({
+            node["Relation Name"] for node in nodes
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES
+        })
+        assert not seq_scans, f"{name}: последовательное чтение {seq_scans}\n{statement}"
+        explained += 1
+    assert explained, f"{name}: не выполнено ни одного запроса"
@@ -0,0 +1,136 @@
+"""
+Денормализованные board_id, project_id и workspace_id задачи совпадают
+с путём column -> board -> project -> workspace после любой записи.
+"""
+import io
+import json
+
+from sqlalchemy import text
+
+
+def stored_scope(engine, task_id: int) -> tuple:
+    with engine.connect() as connection:
+        return tuple(connection.execute(text(
+            "SELECT board_id, project_id, workspace_id FROM tasks WHERE id = :id"
+        ), {"id": task_id}).one())
+
+
+def column_scope(engine, task_id: int) -> tuple:
+    with engine.connect() as connection:
+        return tuple(connection.execute(text(
+            "SELECT c.board_id, b.projects_id, p.workspaces_id FROM tasks t "
+            "JOIN columns c ON c.id = t.column_id JOIN boards b ON b.id = c.board_id "
+            "JOIN projects p ON p.id = b.projects_id WHERE t.id = :id"
+        ), {"id": task_id}).one())
+
+
+def create_task(client, headers, column_id: int, title: str = "Task") -> int:
+    response = client.post("/api/tasks", json={"title": title, "column_id": column_id}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def join_workspace(client, owner_headers, workspace_id: int, headers) -> None:
+    token = client.post(f"/api/invites?workspace_id={workspace_id}", headers=owner_headers).json()["token"]
+    response = client.post(f"/api/invites/accept/{token}", headers=headers)
+    assert response.json()["status"] == "joined", response.text
+
+
+def test_create_sets_scope(client, db, make_user, make_board):
+    headers = make_user()
+    board = make_board(headers)
+    task_id = create_task(client, headers, board["column_ids"][0])
+
+    assert stored_scope(db, task_id) == (board["board_id"], board["project_id"], board["workspace_id"])
+
+
+def test_update_and_move_follow_column(client, db, make_user, make_board):
+    headers = make_user()
+    first, second = make_board(headers, "First"), make_board(headers, "Second")
+    task_id = create_task(client, headers, first["column_ids"][0])
+
+    response = client.put(f"/api/tasks/{task_id}", json={"column_id": second["column_ids"][1]}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert stored_scope(db, task_id) == column_scope(db, task_id) == (second["board_id"], second["project_id"], second["workspace_id"])
+
+    response = client.post(f"/api/tasks/{task_id}/move", json={"column_id": first["column_ids"][2]}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert stored_scope(db, task_id) == column_scope(db, task_id) == (first["board_id"], first["project_id"], first["workspace_id"])
+
+
+def test_batch_move_follows_column(client, db, make_user, make_board):
+    headers = make_user()
+    first, second = make_board(headers, "First"), make_board(headers, "Second")
+    task_ids = [create_task(client, headers, first["column_ids"][0], f"Task {n}") for n in range(3)]
+
+    response = client.patch("/api/tasks/batch", json=[
+        {"id": task_ids[0], "column_id": second["column_ids"][0]},
+        {"id": task_ids[1], "column_id": second["column_ids"][3]},
+        {"id": task_ids[2], "title": "Renamed"},
+    ], headers=headers)
+    assert [item["status"] for item in response.json()] == ["ok", "ok", "ok"]
+
+    for task_id in task_ids:
+        assert stored_scope(db, task_id) == column_scope(db, task_id)
+    assert stored_scope(db, task_ids[0])[0] == second["board_id"]
+    assert stored_scope(db, task_ids[2])[0] == first["board_id"]
+
+
+def test_import_sets_scope(client, db, make_user, make_board):
+    headers = make_user()
+    board = make_board(headers)
+    payload = json.dumps([{"title": "Imported 1"}, {"title": "Imported 2"}]).encode()
+
+    response = client.post(
+        f"/api/boards/{board['board_id']}/import",
+        files={"file": ("tasks.json", io.BytesIO(payload), "application/json")},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+
+    with db.connect() as connection:
+        task_ids = connection.execute(text("SELECT id FROM tasks ORDER BY id")).scalars().all()
+    assert len(task_ids) == 2
+    for task_id in task_ids:
+        assert stored_scope(db, task_id) == (board["board_id"], board["project_id"], board["workspace_id"])
+
+
+def test_user_tasks_filtered_by_workspace(client, db, make_user, make_board):
+    owner, member = make_user("owner"), make_user("member")
+    own_board = make_board(member, "Own")
+    shared_board = make_board(owner, "Shared")
+    join_workspace(client, owner, shared_board["workspace_id"], member)
+    member_id = client.get("/api/users/me", headers=member).json()["id"]
+
+    own_task = create_task(client, member, own_board["column_ids"][0], "Own")
+    shared_task = create_task(client, owner, shared_board["column_ids"][0], "Shared")
+    for task_id, headers in ((own_task, member), (shared_task, owner)):
+        response = client.put(f"/api/tasks/{task_id}", json={"assigned_to_ids": [member_id]}, headers=headers)
+        assert response.status_code == 200, response.text
+
+    def user_task_ids(workspace_id=None):
+        params = {} if workspace_id is None else {"workspace_id": workspace_id}
+        response = client.get("/api/users/me/tasks", params=params, headers=member)
+        assert response.status_code == 200, response.text
+        return sorted(task["id"] for task in response.json())
+
+    assert user_task_ids() == sorted([own_task, shared_task])
+    assert user_task_ids(own_board["workspace_id"]) == [own_task]
+    assert user_task_ids(shared_board["workspace_id"]) == [shared_task]
+
+
+def test_task_permissions_use_scope(client, db, make_user, make_board):
+    owner, outsider = make_user("owner"), make_user("outsider")
+    board = make_board(owner)
+    task_id = create_task(client, owner, board["column_ids"][0])
+
+    assert client.get(f"/api/tasks/{task_id}/details", headers=owner).status_code == 200
+    assert client.get(f"/api/tasks/{task_id}/details", headers=outsider).status_code == 403
+    assert client.put(f"/api/tasks/{task_id}", json={"title": "Hijacked"}, headers=outsider).status_code == 403
+    assert client.post(f"/api/tasks/{task_id}/move", json={}, headers=outsider).status_code == 403
+
+    # Перенос задачи в чужое рабочее пространство меняет и права на неё
+    foreign = make_board(outsider, "Foreign")
+    response = client.post(f"/api/tasks/{task_id}/move", json={"column_id": foreign["column_ids"][0]}, headers=owner)
+    assert response.status_code == 403
+    assert stored_scope(db, task_id)[2] == board["workspace_id"]
@@ -0,0 +1,38 @@
+"""
+Автодополнение пользователей GET /api/users/search: нечёткий поиск среди
+участников workspace и точное совпадение вне его.
+"""
+
+
+def search(client, headers, **params):
+    response = client.get("/api/users/search", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return sorted(user["username"] for user in response.json())
+
+
+def test_search_within_workspace(client, make_user, make_board):
+    owner, member = make_user("alice"), make_user("alina")
+    make_user("alexander")  # не участник: в выдачу workspace не попадает
+    workspace_id = make_board(owner)["workspace_id"]
+    token = client.post(f"/api/invites?workspace_id={workspace_id}", headers=owner).json()["token"]
+    assert client.post(f"/api/invites/accept/{token}", headers=member).json()["status"] == "joined"
+
+    assert search(client, owner, q="ali", workspace_id=workspace_id) == ["alice", "alina"]
+    assert search(client, owner, q="lin", workspace_id=workspace_id) == ["alina"]
+
+
+def test_search_in_foreign_workspace_forbidden(client, make_user, make_board):
+    owner, outsider = make_user("alice"), make_user("bob")
+    workspace_id = make_board(owner)["workspace_id"]
+
+    response = client.get("/api/users/search", params={"q": "ali", "workspace_id": workspace_id}, headers=outsider)
+    assert response.status_code == 403
+
+
+def test_search_outside_workspace_exact_only(client, make_user):
+    headers = make_user("alice")
+    make_user("alina")
+
+    assert search(client, headers, q="ali") == []
+    assert search(client, headers, q="alina") == ["alina"]
+    assert search(client, headers, q="alina@example.com") == ["alina"]
@@ -0,0 +1,148 @@
+"""
+Число SQL-выражений на запрос к каждому пишущему эндпоинту.
+
+Кэши процесса очищаются перед замером, поэтому в число входят и проверка
+токена, и проверки прав. Рост числа — лишний круг к БД (например, SELECT
+после commit вместо RETURNING): его нужно либо убрать, либо осознанно
+поправить ожидание здесь.
+"""
+import io
+import json
+
+import pytest
+
+from tests.conftest import clear_caches
+
+
+def _task(client, headers, board, title="Task", column=0) -> int:
+    response = client.post("/api/tasks", json={"title": title, "column_id": board["column_ids"][column]}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _label(client, headers) -> int:
+    response = client.post("/api/workspace/labels", json={"name": "Bug", "color": "#ff0000"}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+# Каждый сценарий готовит данные и возвращает аргументы замеряемого запроса
+def create_task(client, headers, board):
+    return "POST", "/api/tasks", {"json": {"title": "New", "column_id": board["column_ids"][0]}}
+
+
+def update_task_title(client, headers, board):
+    return "PUT", f"/api/tasks/{_task(client, headers, board)}", {"json": {"title": "Renamed"}}
+
+
+def update_task_column(client, headers, board):
+    return "PUT", f"/api/tasks/{_task(client, headers, board)}", {"json": {"column_id": board["column_ids"][1]}}
+
+
+def update_task_relations(client, headers, board):
+    label_id = _label(client, headers)
+    user_id = client.get("/api/users/me", headers=headers).json()["id"]
+    return "PUT", f"/api/tasks/{_task(client, headers, board)}", {
+        "json": {"assigned_to_ids": [user_id], "label_ids": [label_id]},
+    }
+
+
+def move_task(client, headers, board):
+    first, second = _task(client, headers, board, "First"), _task(client, headers, board, "Second")
+    return "POST", f"/api/tasks/{second}/move", {"json": {"before_id": first}}
+
+
+def batch_update_tasks(client, headers, board):
+    first, second = _task(client, headers, board, "First"), _task(client, headers, board, "Second")
+    return "PATCH", "/api/tasks/batch", {"json": [
+        {"id": first, "column_id": board["column_ids"][1]},
+        {"id": second, "title": "Renamed"},
+    ]}
+
+
+def delete_task(client, headers, board):
+    return "DELETE", f"/api/tasks/{_task(client, headers, board)}", {}
+
+
+def create_comment(client, headers, board):
+    return "POST", f"/api/tasks/{_task(client, headers, board)}/comments", {"json": {"content": "Comment"}}
+
+
+def import_tasks(client, headers, board):
+    payload = json.dumps([{"title": "Imported 1"}, {"title": "Imported 2"}]).encode()
+    return "POST", f"/api/boards/{board['board_id']}/import", {
+        "files": {"file": ("tasks.json", io.BytesIO(payload), "application/json")},
+    }
+
+
+def create_project(client, headers, board):
+    return "POST", "/api/projects/create", {"json": {"title": "Project", "workspaces_id": board["workspace_id"]}}
+
+
+def update_project_title(client, headers, board):
+    return "PUT", f"/api/projects/{board['project_id']}/title", {"json": {"title": "Renamed"}}
+
+
+def create_board(client, headers, board):
+    return "POST", "/api/boards/create", {"json": {"title": "Board", "projects_id": board["project_id"]}}
+
+
+def update_board_title(client, headers, board):
+    return "PUT", f"/api/boards/{board['board_id']}/title", {"json": {"title": "Renamed"}}
+
+
+def create_column(client, headers, board):
+    return "POST", "/api/columns", {"json": {"title": "Column", "position": 4, "board_id": board["board_id"]}}
+
+
+def update_column_title(client, headers, board):
+    return "PUT", f"/api/columns/{board['column_ids'][0]}/title", {"json": {"title": "Renamed"}}
+
+
+def update_column_color(client, headers, board):
+    return "PUT", f"/api/columns/color/{board['column_ids'][0]}", {"json": {"color_id": 2}}
+
+
+def create_label(client, headers, board):
+    return "POST", "/api/workspace/labels", {"json": {"name": "Feature", "color": "#00ff00"}}
+
+
+def update_user(client, headers, board):
+    return "PUT", "/api/users/me", {"data": {"first_name": "Renamed"}}
+
+
+EXPECTED = {
+    create_task: 8,
+    update_task_title: 7,
+    update_task_column: 11,
+    update_task_relations: 13,
+    move_task: 8,
+    batch_update_tasks: 17,
+    delete_task: 7,
+    create_comment: 4,
+    import_tasks: 13,
+    create_project: 3,
+    update_project_title: 6,
+    create_board: 6,
+    update_board_title: 3,
+    create_column: 7,
+    update_column_title: 2,
+    update_column_color: 5,
+    create_label: 4,
+    update_user: 4,
+}
+
+
+@pytest.mark.parametrize("scenario", list(EXPECTED), ids=lambda scenario: scenario.__name__)
+def test_write_statement_count(scenario, client, make_user, make_board, capture_statements):
+    headers = make_user()
+    board = make_board(headers)
+    method, url, kwargs = scenario(client, headers, board)
+
+    clear_caches()
+    with capture_statements() as log:
+        response = client.request(method, url, headers=headers, **kwargs)
+    assert response.status_code == 200, response.text
+
+    statements = "\n".join(statement for statement, _ in log.statements)
+    assert log.count == EXPECTED[scenario], f"{scenario.__name__}: {log.count} выражений\n{statements}"
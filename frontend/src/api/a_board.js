@@ -1,4 +1,7 @@
-import { api } from './client';
+import { api, fetchPages } from './client';
+
+// Календарь за месяц обычно умещается в эти страницы; остальное — кнопкой «Загрузить ещё»
+const CALENDAR_MAX_PAGES = 5;
 
 export const getBoardColumns = async (boardId) => {
   const response = await api.get(`/api/boards/${boardId}/columns`);
@@ -10,7 +13,7 @@ export const getBoardColumnsList = async (boardId) => {
   return response.data;
 };
 
-export const getCalendarTasks = async (boardId, filters = {}) => {
+export const getCalendarTasks = async (boardId, filters = {}, cursor = null) => {
   const params = {};
   if (filters.startDate) params.start_date = filters.startDate;
   if (filters.endDate) params.end_date = filters.endDate;
@@ -18,8 +21,7 @@ export const getCalendarTasks = async (boardId, filters = {}) => {
   if (filters.assignedTo) params.assigned_to = filters.assignedTo;
   if (filters.labelId) params.label_id = filters.labelId;
   
-  const response = await api.get(`/api/boards/${boardId}/calendar/tasks`, { params });
-  return response.data;
+  return fetchPages(`/api/boards/${boardId}/calendar/tasks`, params, { cursor, maxPages: CALENDAR_MAX_PAGES });
 };
 
 export const createBoard = async (data) => {
@@ -1,4 +1,4 @@
-import { api } from './client';
+import { api, fetchPages } from './client';
 
 export const createTaskApi = async (payload) => {
   const response = await api.post("/api/tasks", payload);
@@ -15,13 +15,19 @@ export const updateTaskApi = async (taskId, payload) => {
   return response.data;
 };
 
+export const moveTaskApi = async (taskId, payload) => {
+  const response = await api.post(`/api/tasks/${taskId}/move`, payload);
+  return response.data;
+};
+
 export const createCommentApi = async (taskId, content) => {
   const response = await api.post(`/api/tasks/${taskId}/comments`, { content });
   return response.data;
 };
 
-export const getUserTasksApi = async (workspaceId = null) => {
+// Одна страница задач пользователя: { items, nextCursor }
+export const getUserTasksApi = async (workspaceId = null, { cursor = null, limit = null } = {}) => {
   const params = workspaceId ? { workspace_id: workspaceId } : {};
-  const response = await api.get("/api/users/me/tasks", { params });
-  return response.data;
+  if (limit) params.limit = limit;
+  return fetchPages("/api/users/me/tasks", params, { cursor });
 };
\ No newline at end of file
@@ -26,3 +26,19 @@ api.interceptors.response.use(
     throw error;
   }
 );
+
+// Загружает страницы keyset-пагинации, начиная с cursor, но не больше maxPages:
+// курсор следующей страницы приходит в заголовке X-Next-Cursor.
+// Возвращает { items, nextCursor }; nextCursor === null — страниц больше нет,
+// иначе следующие страницы подгружаются по запросу пользователя
+export const fetchPages = async (url, params = {}, { cursor = null, maxPages = 1 } = {}) => {
+  const items = [];
+  let pages = 0;
+  do {
+    const response = await api.get(url, { params: cursor ? { ...params, cursor } : params });
+    items.push(...response.data);
+    cursor = response.headers["x-next-cursor"] || null;
+    pages += 1;
+  } while (cursor && pages < maxPages);
+  return { items, nextCursor: cursor };
+};
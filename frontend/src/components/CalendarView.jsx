@@ -19,6 +19,10 @@ export default function CalendarView() {
   const [currentDate, setCurrentDate] = useState(new Date());
   const [tasks, setTasks] = useState([]);
   const [loading, setLoading] = useState(false);
+  // Фильтры текущего запроса и курсор продолжения, если задач больше, чем загружено
+  const [taskQuery, setTaskQuery] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [columns, setColumns] = useState([]);
   const [members, setMembers] = useState([]);
   const [labels, setLabels] = useState([]);
@@ -117,16 +121,33 @@ export default function CalendarView() {
       if (filterAssignee) filters.assignedTo = parseInt(filterAssignee);
       if (filterLabel) filters.labelId = parseInt(filterLabel);
 
-      const data = await getCalendarTasks(boardId, filters);
-      setTasks(data || []);
+      const { items, nextCursor } = await getCalendarTasks(boardId, filters);
+      setTasks(items || []);
+      setTaskQuery(filters);
+      setNextCursor(nextCursor);
     } catch (err) {
       console.error("Ошибка загрузки задач:", err);
       setTasks([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const loadMoreTasks = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const { items, nextCursor: cursor } = await getCalendarTasks(boardId, taskQuery, nextCursor);
+      setTasks((prev) => [...prev, ...items]);
+      setNextCursor(cursor);
+    } catch (err) {
+      console.error("Ошибка загрузки задач:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handlePrev = () => {
     if (viewMode === "month") {
       setCurrentDate(
@@ -316,6 +337,12 @@ export default function CalendarView() {
             <option value="week">Неделя</option>
           </select>
 
+          {nextCursor && !loading && (
+            <button className="calendar-load-more" onClick={loadMoreTasks} disabled={loadingMore}>
+              {loadingMore ? "Загружаем..." : "Загрузить ещё задачи"}
+            </button>
+          )}
+
           <div className="month-switcher">
             <button onClick={handlePrev}>
               <ChevronLeft size={18} />
@@ -22,7 +22,7 @@ const html5Backend = HTML5Backend;
 export default function KanbanBoard() {
   const { boardId } = useParams();
   const { columns, setColumns, projectData, loading, error, saveColumnPositions, saveColumnTitle, onAddTask, refetch } = useBoard(boardId);
-  const { updateTask } = useTasks();
+  const { moveTask } = useTasks();
   const { canManageColumns } = useUserRole();
 
   const [isSidebarCollapsed, setIsSidebarCollapsed] = useState(false);
@@ -127,7 +127,7 @@ export default function KanbanBoard() {
   if (error) return <div className="error">Ошибка: {error.message}</div>;
   if (!projectData) return <div className="empty">Нет данных по доске</div>;
 
-  // Функция для перемещения задачи между колонками
+  // Функция для перемещения задачи между колонками (только UI, сохранение — в persistTaskPosition)
   const moveTaskBetweenColumns = async (taskId, fromColumnId, toColumnId) => {
     // Оптимистичное обновление UI
     setColumns(prevColumns => {
@@ -169,47 +169,25 @@ export default function KanbanBoard() {
         return col;
       });
     });
+  };
+
+  // Сохраняет итоговое положение задачи после drop: колонку и соседей в ней
+  const persistTaskPosition = async (taskId, columnId) => {
+    const column = columns.find(col => col.id === columnId);
+    const tasks = (column?.tasks || []).filter(task => task && task.id);
+    const taskIndex = tasks.findIndex(task => task.id === taskId);
+    if (taskIndex === -1) return;
 
-    // Сохраняем на сервере
     try {
-      await updateTask(taskId, { column_id: toColumnId });
+      await moveTask(taskId, {
+        column_id: columnId,
+        after_id: taskIndex > 0 ? tasks[taskIndex - 1].id : null,
+        before_id: taskIndex < tasks.length - 1 ? tasks[taskIndex + 1].id : null,
+      });
     } catch (err) {
       console.error("Ошибка при сохранении перемещения задачи:", err);
-      // Откатываем изменения при ошибке
-      setColumns(prevColumns => {
-        const newColumns = prevColumns.map(col => ({
-          ...col,
-          tasks: col.tasks ? col.tasks.filter(task => task && task.id) : []
-        }));
-        
-        const fromColumn = newColumns.find(col => col.id === fromColumnId);
-        const toColumn = newColumns.find(col => col.id === toColumnId);
-        
-        if (!fromColumn || !toColumn) return prevColumns;
-        
-        const taskIndex = toColumn.tasks.findIndex(task => task && task.id === taskId);
-        if (taskIndex === -1) return prevColumns;
-        
-        const task = toColumn.tasks[taskIndex];
-        
-        // Проверяем, что задача существует
-        if (!task || !task.id) return prevColumns;
-        
-        // Создаем новые массивы задач
-        const newToTasks = toColumn.tasks.filter((_, idx) => idx !== taskIndex);
-        const newFromTasks = [...fromColumn.tasks, task];
-        
-        // Обновляем колонки с новыми массивами задач
-        return newColumns.map(col => {
-          if (col.id === fromColumnId) {
-            return { ...col, tasks: newFromTasks };
-          }
-          if (col.id === toColumnId) {
-            return { ...col, tasks: newToTasks };
-          }
-          return col;
-        });
-      });
+      // Возвращаем порядок с сервера
+      refetch();
     }
   };
 
@@ -329,6 +307,7 @@ export default function KanbanBoard() {
                 moveColumn={moveColumn}
                 moveTaskBetweenColumns={moveTaskBetweenColumns}
                 moveTaskInColumn={moveTaskInColumn}
+                onTaskDrop={persistTaskPosition}
                 onTaskClick={handleTaskClick}
                 onAddTask={onAddTask}
                 onUpdateColumns={setColumns}
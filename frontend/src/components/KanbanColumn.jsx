@@ -13,6 +13,7 @@ const KanbanColumn = ({
   moveColumn, 
   moveTaskInColumn, 
   moveTaskBetweenColumns, 
+  onTaskDrop,
   onAddTask,
   onDeleteColumn,
   saveColumnTitle }) => {
@@ -95,6 +96,12 @@ const KanbanColumn = ({
         }
       }
     },
+    drop: (item, monitor) => {
+      // --- задачу отпустили: сохраняем её колонку и соседей ---
+      if (monitor.getItemType() === 'task' && item.taskId && onTaskDrop) {
+        onTaskDrop(item.taskId, item.columnId);
+      }
+    },
     collect: (monitor) => ({
       isOver: monitor.isOver(),
     }),
@@ -9,16 +9,20 @@ export default function MyTaskView() {
   const [tasks, setTasks] = useState([]);
   const [tasksLoading, setTasksLoading] = useState(true);
   const [tasksError, setTasksError] = useState("");
+  // Курсор следующей страницы; null — все задачи уже загружены
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
-    // Запрос к API для получения задач пользователя из активного рабочего пространства
+    // Запрос к API для получения первой страницы задач пользователя из активного рабочего пространства
     const fetchTasks = async () => {
       try {
         setTasksLoading(true);
         setTasksError("");
         // Передаем workspace_id для фильтрации задач по активному рабочему пространству
-        const data = await getUserTasksApi(workspaceId);
-        setTasks(data);
+        const { items, nextCursor } = await getUserTasksApi(workspaceId);
+        setTasks(items);
+        setNextCursor(nextCursor);
       } catch (error) {
         console.error("Ошибка при загрузке задач:", error);
         setTasksError("Не удалось загрузить задачи");
@@ -29,6 +33,20 @@ export default function MyTaskView() {
     fetchTasks();
   }, [workspaceId]);
 
+  // Следующая страница — только по кнопке «Загрузить ещё»
+  const loadMoreTasks = async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      const { items, nextCursor: cursor } = await getUserTasksApi(workspaceId, { cursor: nextCursor });
+      setTasks((prev) => [...prev, ...items]);
+      setNextCursor(cursor);
+    } catch (error) {
+      console.error("Ошибка при загрузке задач:", error);
+    }
+    setLoadingMore(false);
+  };
+
   const formatDate = (dateStr) => {
     if (!dateStr) return "-";
     const date = new Date(dateStr);
@@ -160,6 +178,11 @@ export default function MyTaskView() {
             </tbody>
           </table>
         )}
+        {!tasksLoading && !tasksError && nextCursor && (
+          <button className="load-more-tasks" onClick={loadMoreTasks} disabled={loadingMore}>
+            {loadingMore ? "Загружаем..." : "Загрузить ещё"}
+          </button>
+        )}
       </section>
     </div>
   );
@@ -9,6 +9,9 @@ import { useWorkspaceContext } from "../contexts/WorkspaceContext";
 import WorkspaceLoaderWrapper from "./WorkspaceLoaderWrapper";
 import ErrorPage from "./ErrorPage";
 
+// Сколько своих задач показывать на главной workspace
+const HOME_TASKS_LIMIT = 7;
+
 export default function WorkspaceHome() {
   const { username: urlUsername } = useParams();
   const { user } = useAuth();
@@ -109,8 +112,9 @@ export default function WorkspaceHome() {
       try {
         setTasksLoading(true);
         setTasksError("");
-        const data = await getUserTasksApi(activeWorkspace.id);
-        setTasks(data);
+        // На главной видны только первые задачи — одной короткой страницы достаточно
+        const { items } = await getUserTasksApi(activeWorkspace.id, { limit: HOME_TASKS_LIMIT });
+        setTasks(items);
       } catch (error) {
         console.error("Ошибка при загрузке задач:", error);
         setTasksError("Не удалось загрузить задачи");
@@ -250,7 +254,7 @@ export default function WorkspaceHome() {
                 </thead>
                 <tbody>
                   {tasks.length > 0 ? (
-                    tasks.slice(0, 7).map((task) => {
+                    tasks.slice(0, HOME_TASKS_LIMIT).map((task) => {
                       const formatDate = (dateStr) => {
                         if (!dateStr) return "-";
                         const date = new Date(dateStr);
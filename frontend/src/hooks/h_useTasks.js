@@ -1,6 +1,6 @@
 // src/hooks/useTasks.js
 import { useState } from "react";
-import { createTaskApi, updateTaskApi } from "../api/a_tasks";
+import { createTaskApi, updateTaskApi, moveTaskApi } from "../api/a_tasks";
 
 export const useTasks = () => {
   const [loading, setLoading] = useState(false);
@@ -34,9 +34,22 @@ export const useTasks = () => {
     }
   };
 
+  // payload: { column_id, after_id, before_id } — соседи задачи после перемещения
+  const moveTask = async (taskId, payload) => {
+    try {
+      const moved = await moveTaskApi(taskId, payload);
+      return moved; // TaskMoveOut
+    } catch (err) {
+      console.error("Ошибка при перемещении задачи:", err);
+      setError(err);
+      throw err;
+    }
+  };
+
   return {
     createTask,
     updateTask,
+    moveTask,
     loading,
     error,
   };